@@ -8,4 +8,4 @@ from ai_classroom_suite.BasicInteraction import *
 from ai_classroom_suite.BasicInteraction import BasicInteractionDemo
 
 # Launch the relevant component
-BasicInteractionDemo.queue().launch(server_name='0.0.0.0', server_port=7860, show_error=True)
+BasicInteractionDemo.queue(concurrency_count=QUEUE_CONCURRENCY_COUNT).launch(server_name='0.0.0.0', server_port=7860, show_error=True)
@@ -5,7 +5,9 @@
 #  default folder path
 folder_path = "context_files"
 #  default output file name
-out_file_name = "vector_store.txt"
+out_file_name = "vector_store.snapshot"
+#  segmentation of the reading materials
+snapshot_params = {'chunk_size': 100, 'chunk_overlap': 20}
 
 # Check if vector store file already exist on disk
 def vector_store_file_exist():
@@ -15,7 +17,7 @@ def vector_store_file_exist():
     return (out_file_name in files)
 #| to_script
 # Helper function to get all files' paths from a folder
-# Return a list of file paths except for README.txt and vector_store.txt (if exist)
+# Return a list of file paths except for README.txt and the vector store files (if exist)
 def get_filepaths_from_folder(folder_path):
     # Store the paths of files
     filepath_list = []
@@ -29,8 +31,8 @@ def get_filepaths_from_folder(folder_path):
     files = os.listdir(folder_path)
     
     for file_name in files:
-        # Excluding README.txt and vector_store.txt
-        if file_name != "README.txt" and file_name != "vector_store.txt":
+        # Excluding README.txt and vector store files (including the old vector_store.txt)
+        if file_name not in ["README.txt", "vector_store.txt", out_file_name]:
             # Get the file path for each item
             file_path = os.path.join(folder_path, file_name)
             # Check if the item is a file and not a subdirectory
@@ -39,24 +41,22 @@ def get_filepaths_from_folder(folder_path):
     
     return filepath_list
 #| to_script
-# Helper function to write content of files in a folder to output file
+# Helper function to write the vector store of files in a folder to the output snapshot file
 def write_vector_store_to_file(out_file_name):
-    # If vector_store.txt already exist, return nothing
-    if vector_store_file_exist():
-        return gr.File(value=out_file_name, visible=False)
+    # Call the function to read files (excluding README.txt and vector store files) pathes
+    filepath_list = get_filepaths_from_folder(folder_path)
+    corpus_hash = compute_corpus_hash(filepath_list, **snapshot_params)
+    snapshot_path = os.path.join(folder_path, out_file_name)
+
+    # If the snapshot already exists and matches the files, return it without showing anything
+    if vector_store_file_exist() and is_snapshot_current(snapshot_path, corpus_hash):
+        return gr.File(value=snapshot_path, visible=False)
  
-    # Only try to create the vector store if vector_store.txt doesn't exist
+    # Only embed the files if the snapshot doesn't exist or the files have changed
     else:
-        # Call the function to read files (excluding README.txt and vector_store.txt) pathes
-        filepath_list = get_filepaths_from_folder(folder_path)
-        # Extract the text out from files
-        files_content = files_to_text(filepath_list, chunk_size=100, chunk_overlap=20)
-        
-        # Write the vector_store onto the output file
-        with open(out_file_name, "w") as f:
-            for i in range(len(files_content)):
-                item = str(files_content[i]) + "\n"
-                f.write(item)
+        _, load_errors = create_vector_snapshot(filepath_list, out_file_name, return_errors=True, **snapshot_params)
+        for file_error in load_errors:
+            gr.Warning(f"Could not load {os.path.basename(file_error[0])}: {file_error[1]}")
         
         # Show the downlodable vector store file and give instruction on upload the vector store file to disk (on HuggingFace)
         return gr.File(title="Download your vector store file and upload it into the context_files folder under Files", 
@@ -70,16 +70,19 @@ def initializing_tutor_button(obj_in):
     return gr.update(interactive=False, value='Initializing Tutor...')
 #| to_script
 # overwrites the original method since we don't deal with any vector stores display here
-def get_tutor_reply(chat_tutor):
-    chat_tutor.get_tutor_reply()
-    return gr.update(value="", interactive=True), chat_tutor.conversation_memory, chat_tutor
+async def get_tutor_reply(chat_tutor):
+    # stream the reply into the chatbot as it arrives
+    async for _ in chat_tutor.astream_tutor_reply():
+        yield gr.update(value="", interactive=False), chat_tutor.conversation_memory, chat_tutor
+    yield gr.update(value="", interactive=True), chat_tutor.conversation_memory, chat_tutor
 
 def get_conversation_history(chat_tutor):
     return chat_tutor.conversation_memory, chat_tutor
 #| to_script
 with gr.Blocks() as ReadingQuiz:
     #initialize tutor (with state)
-    study_tutor = gr.State(SlightlyDelusionalTutor())
+    # quizzes can run for many turns, so keep the history given to the model small
+    study_tutor = gr.State(SlightlyDelusionalTutor(memory_settings={'max_tokens': 1500, 'summary_max_tokens': 300}))
 
     # Student chatbot interface
     gr.Markdown("""
@@ -115,8 +118,8 @@ with gr.Blocks() as ReadingQuiz:
     ).then(
         fn=initializing_tutor_button, inputs=[vs_build_button], outputs=[vs_build_button]
     ).then(
-        fn=create_reference_store, 
-        inputs=[study_tutor, vs_build_button, instructor_prompt, file_output, instructor_input_none, api_input, learning_objectives_none],
+        fn=create_reference_store_from_snapshot, 
+        inputs=[study_tutor, vs_build_button, instructor_prompt, file_output, api_input, learning_objectives_none],
         outputs=[study_tutor, vs_build_button]
     )
 
@@ -158,4 +161,4 @@ with gr.Blocks() as ReadingQuiz:
     export_dialogue_button_txt.click(save_txt, study_tutor, file_download, show_progress=True)
     export_dialogue_button_csv.click(save_csv, study_tutor, file_download, show_progress=True)
 #| to_script
-ReadingQuiz.queue().launch(server_name='0.0.0.0', server_port=7860)
+ReadingQuiz.queue(concurrency_count=QUEUE_CONCURRENCY_COUNT).launch(server_name='0.0.0.0', server_port=7860)
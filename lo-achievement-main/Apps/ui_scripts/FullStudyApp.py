@@ -7,4 +7,4 @@ from ai_classroom_suite.UIBaseComponents import *
 from ai_classroom_suite.UIBaseComponents import FullStudyApp
 
 # Launch the relevant component
-FullStudyApp.queue().launch(server_name='0.0.0.0', server_port=7860)
+FullStudyApp.queue(concurrency_count=QUEUE_CONCURRENCY_COUNT).launch(server_name='0.0.0.0', server_port=7860)
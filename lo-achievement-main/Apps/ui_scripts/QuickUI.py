@@ -11,6 +11,8 @@ import pandas as pd
 
 # The OpenAI API key provided by the instructor
 openai.api_key = os.environ.get("OPENAI_API_KEY")
+# An async client, so students waiting on a reply don't each hold a worker thread
+async_client = openai.AsyncOpenAI(api_key=openai.api_key)
 
 # Instructor's prompt (invisible to students)
 instructor_prompt = os.environ.get("SECRET_PROMPT")
@@ -21,19 +23,25 @@ def add_user_message(msg, history, messages):
     messages.append({"role": "user", "content": msg})
     return "", history + [[msg, None]], messages
 
-# Generate a response from the chatbot
-def get_tutor_reply(history, messages):
-    completion = openai.chat.completions.create( 
+# Generate a response from the chatbot, streaming it into the conversation as it arrives
+async def get_tutor_reply(history, messages):
+    stream = await async_client.chat.completions.create(
         model="gpt-3.5-turbo",
         messages=messages,
-        max_tokens=150 # Change this 
-    ) 
-    # Extract the model's reply
-    reply = completion.choices[0].message.content 
-    # Updates the conversation history with the chatbot's response
-    history[-1][1] = reply
-    messages.append({"role": "assistant", "content": reply})
-    return history, messages
+        max_tokens=150, # Change this
+        stream=True
+    )
+    history[-1][1] = ""
+    try:
+        async for chunk in stream:
+            # Updates the conversation history with each piece of the chatbot's response
+            if chunk.choices and chunk.choices[0].delta.content:
+                history[-1][1] += chunk.choices[0].delta.content
+                yield history, messages
+    finally:
+        # Keep the reply, even if it was stopped before it finished
+        messages.append({"role": "assistant", "content": history[-1][1]})
+    yield history, messages
 #| to_script
 
 # Saves the conversation history to a JSON file.
@@ -53,28 +61,32 @@ with gr.Blocks() as SimpleChat:
     
     # Initialize the model with system message given by the instructor prompt
     system_msg = [{"role": "system", "content":  instructor_prompt}]
-    messages = gr.JSON(visible=False, value = system_msg)
+    # (kept on the server, so a reply which is stopped early is still recorded)
+    messages = gr.State(system_msg)
     
     with gr.Group():
         chatbot = gr.Chatbot(label="Simple Tutor")
         with gr.Row(equal_height=True):
             user_chat_input = gr.Textbox(show_label=False, scale=9)
             submit_btn = gr.Button("Enter", scale=1)
+            stop_btn = gr.Button("Stop", scale=1)
     with gr.Group():
         export_dialogue_button_json = gr.Button("Export your chat history as a .json file")
         file_download = gr.Files(label="Download here", file_types=['.json'], visible=False)
     
     # User submits a message by either click the submit button or press enter on keyboard
-    submit_btn.click(
+    submit_event = submit_btn.click(
         fn=add_user_message, inputs=[user_chat_input, chatbot, messages], outputs=[user_chat_input, chatbot, messages], queue=False
     ).then(
         fn=get_tutor_reply, inputs=[chatbot, messages], outputs=[chatbot, messages], queue=True
     )
-    user_chat_input.submit(
+    enter_event = user_chat_input.submit(
         fn=add_user_message, inputs=[user_chat_input, chatbot, messages], outputs=[user_chat_input, chatbot, messages], queue=False
     ).then(
         fn=get_tutor_reply, inputs=[chatbot, messages], outputs=[chatbot, messages], queue=True
     )
+    # Stops the reply being streamed
+    stop_btn.click(fn=None, inputs=None, outputs=None, cancels=[submit_event, enter_event], queue=False)
     export_dialogue_button_json.click(save_chat_to_json, chatbot, file_download, show_progress=True)
 #| to_script
-SimpleChat.queue().launch(server_name='0.0.0.0', server_port=7860)
+SimpleChat.queue(concurrency_count=200).launch(server_name='0.0.0.0', server_port=7860)
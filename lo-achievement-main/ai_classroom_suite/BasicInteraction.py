@@ -9,9 +9,11 @@ import gradio as gr
 from .UIBaseComponents import *
 
 # %% ../nbs/blocher_basic_interaction.ipynb 10
-def get_tutor_reply(chat_tutor): 
-  chat_tutor.get_direct_tutor_reply()
-  return gr.update(value="", interactive=True), chat_tutor.conversation_memory, chat_tutor
+async def get_tutor_reply(chat_tutor):
+  # stream the reply into the chatbot as it arrives
+  async for _ in chat_tutor.astream_direct_tutor_reply():
+    yield gr.update(value="", interactive=False), chat_tutor.conversation_memory, chat_tutor
+  yield gr.update(value="", interactive=True), chat_tutor.conversation_memory, chat_tutor
 
 def get_conversation_history(chat_tutor):
     return chat_tutor.conversation_memory, chat_tutor
@@ -0,0 +1,179 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/conversation_memory.ipynb.
+
+# %% auto 0
+__all__ = ['DEFAULT_SUMMARY_PROMPT_TEMPLATE', 'estimate_tokens', 'ConversationMemory']
+
+# %% ../nbs/conversation_memory.ipynb 3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain.schema.messages import SystemMessage
+
+# %% ../nbs/conversation_memory.ipynb 6
+DEFAULT_SUMMARY_PROMPT_TEMPLATE = ("Progressively summarize the conversation between a student (Human) and their tutor (Assistant), adding onto the " +
+    "current summary and returning a new summary of at most {max_words} words. The summary should always contain the overarching task and " +
+    "characteristics of the interaction. For example, if the student asked for a 5 question quiz, the summary should say so, along with " +
+    "which questions have been asked and how the student answered them, until the quiz is completed. Details which are no longer relevant " +
+    "can be left out." +
+    "\n\nCurrent summary:\n{summary}\n\nNew lines of conversation:\n{new_lines}\n\nNew summary:")
+
+def estimate_tokens(text):
+    # about 4 characters per token for English text
+    return len(text) // 4 + 1
+
+def _turn_text(turn):
+    return 'Human: ' + turn[0] + '\nAssistant: ' + turn[1]
+
+_summary_executor = None
+
+def _get_summary_executor():
+    # lazily create one small pool shared by every memory in this process
+    global _summary_executor
+    if _summary_executor is None:
+        _summary_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='conversation-summary')
+    return _summary_executor
+
+class ConversationMemory:
+    def __init__(self, max_tokens=2000, summary_max_tokens=400, min_recent_turns=2, summary_mdl=None,
+                 count_tokens=estimate_tokens, summary_template=DEFAULT_SUMMARY_PROMPT_TEMPLATE, background=True):
+        if summary_max_tokens >= max_tokens:
+            raise ValueError('summary_max_tokens must be less than max_tokens, to leave room for the recent turns.')
+
+        self.max_tokens = max_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.min_recent_turns = min_recent_turns
+        self.summary_mdl = summary_mdl
+        self.count_tokens = count_tokens
+        self.summary_template = summary_template
+        self.background = background
+
+        self.summary = ''
+        self.summary_tokens = 0
+        self.recent_turns = deque()
+        self.recent_tokens = 0
+        self.pending_turns = []
+        self.n_turns = 0
+        self.n_summarized = 0
+        self.n_dropped = 0
+        self.n_summary_errors = 0
+
+        self._lock = threading.Lock()
+        self._summarizing = False
+        self._summary_future = None
+        self._generation = 0
+
+    @property
+    def n_tokens(self):
+        return self.summary_tokens + self.recent_tokens
+
+    def add_turn(self, question, answer):
+        turn = (question or '', answer or '')
+        n_tokens = self.count_tokens(_turn_text(turn))
+
+        with self._lock:
+            self.recent_turns.append((turn, n_tokens))
+            self.recent_tokens += n_tokens
+            self.n_turns += 1
+
+            # move the oldest turns out of the verbatim window until it fits
+            evicted = []
+            while self.recent_tokens > self.max_tokens - self.summary_max_tokens and len(self.recent_turns) > self.min_recent_turns:
+                old_turn, old_tokens = self.recent_turns.popleft()
+                self.recent_tokens -= old_tokens
+                evicted.append(old_turn)
+
+            if self.summary_mdl is None:
+                self.n_dropped += len(evicted)
+                return
+            self.pending_turns.extend(evicted)
+
+        if evicted:
+            self._schedule_summary()
+
+    def _schedule_summary(self):
+        with self._lock:
+            if self._summarizing:
+                # the summary being written picks up the new turns when it's done
+                return
+            self._summarizing = True
+
+        if self.background:
+            self._summary_future = _get_summary_executor().submit(self._fold_pending_turns)
+        else:
+            self._fold_pending_turns()
+
+    def _fold_pending_turns(self):
+        while True:
+            with self._lock:
+                turns = list(self.pending_turns)
+                summary = self.summary
+                generation = self._generation
+                if not turns:
+                    self._summarizing = False
+                    return
+
+            try:
+                new_summary = self._summarize(summary, turns)
+            except Exception as e:
+                # the turns stay pending (and in the history verbatim), and are tried again when more turns are evicted
+                print(f"Error summarizing earlier turns of the conversation, keeping them verbatim: {e}")
+                with self._lock:
+                    self.n_summary_errors += 1
+                    self._summarizing = False
+                return
+
+            with self._lock:
+                if generation != self._generation:
+                    # the conversation was cleared while this summary was being written
+                    continue
+                self.summary = new_summary
+                self.summary_tokens = self.count_tokens(new_summary)
+                del self.pending_turns[:len(turns)]
+                self.n_summarized += len(turns)
+
+    def _summarize(self, summary, turns):
+        prompt = self.summary_template.format(summary=summary or '(none yet)',
+                                              new_lines='\n'.join(_turn_text(turn) for turn in turns),
+                                              max_words=int(self.summary_max_tokens * 0.75))
+        new_summary = self.summary_mdl.predict(prompt).strip()
+
+        # models don't always stick to the length they're asked for
+        while self.count_tokens(new_summary) > self.summary_max_tokens:
+            new_summary = new_summary[:int(len(new_summary) * 0.9)]
+        return new_summary
+
+    def _history_turns(self):
+        # turns which aren't in the summary yet are kept verbatim, so nothing is lost while it's written (or if it fails)
+        return list(self.pending_turns) + [turn for turn, n_tokens in self.recent_turns]
+
+    def chat_history(self):
+        with self._lock:
+            history = [SystemMessage(content='Summary of the earlier conversation: ' + self.summary)] if self.summary else []
+            return history + self._history_turns()
+
+    def as_text(self):
+        with self._lock:
+            lines = ['Summary of the earlier conversation: ' + self.summary] if self.summary else []
+            return '\n'.join(lines + [_turn_text(turn) for turn in self._history_turns()])
+
+    def wait(self, timeout=None):
+        future = self._summary_future
+        if future is not None:
+            future.result(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {'n_turns': self.n_turns, 'n_recent_turns': len(self.recent_turns), 'n_pending_turns': len(self.pending_turns),
+                    'n_summarized_turns': self.n_summarized, 'n_dropped_turns': self.n_dropped, 'n_summary_errors': self.n_summary_errors,
+                    'summary_tokens': self.summary_tokens, 'recent_tokens': self.recent_tokens, 'n_tokens': self.n_tokens}
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self.summary = ''
+            self.summary_tokens = 0
+            self.recent_turns.clear()
+            self.recent_tokens = 0
+            self.pending_turns = []
+            self.n_turns = self.n_summarized = self.n_dropped = self.n_summary_errors = 0
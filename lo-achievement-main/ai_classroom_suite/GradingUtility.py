@@ -2,9 +2,11 @@
 
 # %% auto 0
 __all__ = ['grade_settings', 'default_ai_assisted_setup', 'output_setup', 'default_ai_assisted_grading_instructions',
-           'bloom_assisted_output_setup', 'bloom_assistedgrading_instructions', 'InstructorGradingConfig', 'set_css',
-           'clean_keys', 'file_upload_json_to_df', 'load_json_as_df', 'pretty_print', 'save_as_csv',
-           'show_json_loading_errors']
+           'bloom_assisted_output_setup', 'bloom_assistedgrading_instructions', 'DEFAULT_GRADE_REPORT_INSTRUCTIONS',
+           'DEFAULT_GRADING_SYSTEM_PROMPT', 'InstructorGradingConfig', 'set_css', 'clean_keys',
+           'file_upload_json_to_df', 'load_json_as_df', 'pretty_print', 'save_as_csv', 'show_json_loading_errors',
+           'load_json_files_as_df', 'load_zip_as_df', 'create_grading_prompt', 'parse_grade_report',
+           'agrade_transcripts', 'grade_transcripts', 'pregrade_transcripts']
 
 # %% ../nbs/GradingUtility.ipynb 3
 import ipywidgets as widgets
@@ -14,13 +16,23 @@ import zipfile
 import os
 import json
 import pandas as pd
+import numpy as np
 import glob
+import re
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .PromptInteractionBase import *
+from .ModelClients import *
 
 # %% ../nbs/GradingUtility.ipynb 4
 # "global" variables modified by mutability
 grade_settings = {'learning_objectives':None,
                   'json_file_path':None,
-                  'json_files':None }
+                  'json_files':None,
+                  'transcripts':None,
+                  'json_loading_errors':None }
 
 # %% ../nbs/GradingUtility.ipynb 5
 class InstructorGradingConfig:
@@ -80,25 +92,16 @@ class InstructorGradingConfig:
         if self.file_upload.value:
             try:
                 input_file = list(self.file_upload.value.values())[0]
-                extracted_zip_dir = list(grade_settings['json_file_path'].keys())[0][:-4]
             except:
                 input_file = self.file_upload.value[0]
-                extracted_zip_dir = self.file_upload.value[0]['name'][:-4]
 
             self.status_output.clear_output()
             self.status_output.append_stdout('Loading zip file...\n')
 
-            with zipfile.ZipFile(io.BytesIO(input_file['content']), "r") as z:
-                z.extractall()
-                extracted_files = z.namelist()
-
-            self.status_output.append_stdout('Extracted files and directories: {0}\n'.format(', '.join(extracted_files)))
+            # load all json files straight from the upload, without extracting it
+            grade_settings['transcripts'], grade_settings['json_loading_errors'], grade_settings['json_files'] = _load_zip_in_chunks(input_file['content'])
 
-            # load all json files
-            grade_settings['json_files'] = glob.glob(''.join([extracted_zip_dir, '/**/*.json']), recursive=True)
-
-            #status_output.clear_output()
-            self.status_output.append_stdout('Loading successful!\nLearning Objectives: {0}\nExtracted JSON files: {1}'.format(grade_settings['learning_objectives'],
+            self.status_output.append_stdout('Loading successful!\nLearning Objectives: {0}\nJSON files in the zip: {1}\n'.format(grade_settings['learning_objectives'],
                                                                                                         ', '.join(grade_settings['json_files'])))
 
         else:
@@ -111,9 +114,6 @@ class InstructorGradingConfig:
         self.run_ui_container()
 
         with self.status_output:
-            print('Extracted files and directories: {0}\n'.format(', '.join(extracted_files)))
-            print('Loading successful!\nLearning Objectives: {0}\nExtracted JSON files: {1}'.format(grade_settings['learning_objectives'],
-                                                                                                        ', '.join(grade_settings['json_files'])))
             print('Submitted and Reset all values.')
 
 
@@ -129,7 +129,11 @@ def set_css():
     }
   </style>
   '''))
-get_ipython().events.register('pre_run_cell', set_css)
+try:
+  get_ipython().events.register('pre_run_cell', set_css)
+except NameError:
+  # outside of IPython (e.g. in the worker processes loading transcripts) there are no cells to style
+  pass
 
 # %% ../nbs/GradingUtility.ipynb 12
 def clean_keys(data):
@@ -222,7 +226,157 @@ def show_json_loading_errors(err_list):
   else:
     print("No errors found in uploaded zip JSON files.")
 
-# %% ../nbs/GradingUtility.ipynb 35
+# %% ../nbs/GradingUtility.ipynb 36
+_TRANSCRIPT_KEYS = ["timestamp", "author", "message"]
+
+def _merge_duplicate_columns(df):
+    # keys which only differed by whitespace become one column, taking whichever value is present
+    for col in df.columns[df.columns.duplicated()].unique():
+        merged = df.loc[:, col].bfill(axis=1).iloc[:, 0]
+        df = df.drop(columns=col)
+        df[col] = merged
+    return df
+
+def _strip_values(df):
+    # string values are stripped, like clean_keys does
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].map(lambda value: value.strip() if isinstance(value, str) else value)
+        elif pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].str.strip()
+    return df
+
+def _load_json_files(json_files, contents=None):
+    records, file_names, n_records, first_keys, has_keys, errors = [], [], [], [], [], []
+
+    for ind, fpath in enumerate(json_files):
+        # check if file is .json
+        if not fpath.endswith('.json'):
+            continue
+
+        try:
+            if contents is None:
+                with open(fpath, "r") as f:
+                    data = json.loads(f.read(), strict=False)
+            else:
+                data = json.loads(contents[ind], strict=False)
+        except Exception as e:
+            errors.append([fpath, "Fatal System Error: "+str(e)])
+            continue
+
+        # JSON responses wrapped in enclosing dictionary
+        if isinstance(data, dict):
+            data = data[list(data.keys())[0]] if len(data.keys()) == 1 else [data]
+
+        # We only operate on lists of dictionaries
+        if not isinstance(data, list) or not all(isinstance(d, dict) for d in data):
+            errors.append([fpath, "Error: Something is wrong with the structure of the JSON."])
+            continue
+
+        records.extend(data)
+        file_names.append(fpath)
+        n_records.append(len(data))
+        first_keys.append([str(key).strip() for key in data[0]] if data else [])
+        # every record needs every key, although its value can be null
+        has_keys.append(all(set(_TRANSCRIPT_KEYS).issubset(str(key).strip() for key in d) for d in data))
+
+    # one dataframe for the whole chunk, with the keys and values cleaned per column
+    df_out = pd.DataFrame(records)
+    if any(df_out[col].map(lambda value: isinstance(value, dict)).any() for col in df_out.columns[df_out.dtypes == object]):
+        # nested records are flattened like load_json_as_df does (e.g. "meta.model")
+        df_out = pd.json_normalize(records)
+    df_out.columns = df_out.columns.astype(str).str.strip()
+    df_out = _strip_values(_merge_duplicate_columns(df_out))
+    df_out['filename'] = np.repeat(np.array(file_names, dtype=object), n_records)
+    for col in _TRANSCRIPT_KEYS:
+        if col not in df_out:
+            df_out[col] = None
+
+    # files where any record is missing a key
+    bad_files = {fpath for fpath, file_has_keys in zip(file_names, has_keys) if not file_has_keys}
+
+    for fpath, n_file_records, file_keys in zip(file_names, n_records, first_keys):
+        if fpath in bad_files:
+            errors.append([fpath, "Error: JSON Keys are incorrect. Found keys: " + str(file_keys)])
+        # files with too few records
+        elif n_file_records <= 1:
+            bad_files.add(fpath)
+            errors.append([fpath, "Warning: JSON keys correct, but something wrong with the overall structure of the JSON when converting to dataframe. The dataframe only has one row. Skipping."])
+
+    # leave out the skipped files, along with any keys only they had
+    if bad_files:
+        df_out = df_out[~df_out['filename'].isin(bad_files)]
+        df_out = df_out[[col for col in df_out.columns if col in _TRANSCRIPT_KEYS + ['filename'] or df_out[col].notna().any()]]
+
+    # errors in the order of the files
+    file_order = {fpath: ind for ind, fpath in enumerate(json_files)}
+    return df_out, sorted(errors, key=lambda file_error: file_order[file_error[0]])
+
+def _load_json_files_in_chunks(json_files, n_workers=None, chunk_size=500):
+    chunks = [json_files[start:start + chunk_size] for start in range(0, len(json_files), chunk_size)]
+
+    # executor.map returns chunks in order, so rows stay in the order of json_files
+    n_workers = min(n_workers or os.cpu_count(), len(chunks))
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_load_json_files, chunks))
+    else:
+        results = [_load_json_files(chunk) for chunk in chunks]
+
+    return _combine_loaded_chunks(results)
+
+def _combine_loaded_chunks(results):
+    frames = [df for df, _ in results if len(df)]
+    df_out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=_TRANSCRIPT_KEYS + ['filename'])
+    df_out = df_out[_TRANSCRIPT_KEYS + [col for col in df_out.columns if col not in _TRANSCRIPT_KEYS + ['filename']] + ['filename']]
+
+    errors = [file_error for _, chunk_errors in results for file_error in chunk_errors]
+    return df_out, errors
+
+def load_json_files_as_df(json_files=None, n_workers=None, chunk_size=500):
+    # transcripts uploaded through InstructorGradingConfig are already loaded
+    if json_files is None and grade_settings['transcripts'] is not None:
+        return grade_settings['transcripts'], [' '.join(file_error) for file_error in grade_settings['json_loading_errors']]
+
+    json_files = grade_settings['json_files'] if json_files is None else json_files
+    df_out, errors = _load_json_files_in_chunks(list(json_files), n_workers, chunk_size)
+
+    return df_out, [' '.join(file_error) for file_error in errors]
+
+# %% ../nbs/GradingUtility.ipynb 42
+def _zip_json_members(names):
+    return [name for name in names if name.endswith('.json') and not name.startswith('__MACOSX/')]
+
+def _read_zip_chunks(zip_content, chunk_size=500):
+    # decompress one chunk of members at a time
+    with zipfile.ZipFile(io.BytesIO(zip_content) if not isinstance(zip_content, str) else zip_content, "r") as z:
+        names = _zip_json_members(info.filename for info in z.infolist() if not info.is_dir())
+        for start in range(0, len(names), chunk_size):
+            chunk = names[start:start + chunk_size]
+            yield chunk, [z.read(name) for name in chunk]
+
+def _load_zip_in_chunks(zip_content, n_workers=None, chunk_size=500):
+    n_workers = n_workers or os.cpu_count()
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else ThreadPoolExecutor(max_workers=1)
+
+    # parse each chunk while decompressing the next, waiting on the oldest chunk when too many are queued
+    results, pending, json_files = [], deque(), []
+    with executor:
+        for names, contents in _read_zip_chunks(zip_content, chunk_size):
+            json_files.extend(names)
+            if len(pending) >= 2*n_workers:
+                results.append(pending.popleft().result())
+            pending.append(executor.submit(_load_json_files, names, contents))
+        results.extend(future.result() for future in pending)
+
+    return (*_combine_loaded_chunks(results), json_files)
+
+def load_zip_as_df(zip_content, n_workers=None, chunk_size=500):
+    df_out, errors, _ = _load_zip_in_chunks(zip_content, n_workers, chunk_size)
+
+    return df_out, [' '.join(file_error) for file_error in errors]
+
+# %% ../nbs/GradingUtility.ipynb 47
 default_ai_assisted_setup = output_setup = ("Given the following chat log, create a table with the question number, the question content, answer, "
                   "whether or not the student answered correctly on the first try, and the number of attempts it took to get the right answer. ")
 
@@ -238,3 +392,220 @@ Bloom's taxonomy is rated on a 1-6 point system, with 1 being remember (recall f
 and 6 being create (produce new or original work). Assign the interaction a score from 1-6, where 1 = remember, 2 = understand, 3 = apply, 4 = analyze,
 5 = evaluate, and 6 = create."""
 
+
+# %% ../nbs/GradingUtility.ipynb 49
+DEFAULT_GRADE_REPORT_INSTRUCTIONS = ("Finally, on the last line of your response, report the results as JSON with the keys \"n_questions\" (the number of assessment questions), "
+                  "\"n_correct_first_try\" (the number of questions answered correctly on the first try), \"grade\" (the quiz grade as a fraction from 0 to 1) "
+                  "and \"bloom_level\" (the Bloom's taxonomy score from 1 to 6), for example: "
+                  "{\"n_questions\": 5, \"n_correct_first_try\": 4, \"grade\": 0.8, \"bloom_level\": 3}")
+
+DEFAULT_GRADING_SYSTEM_PROMPT = "You are a helpful assistant."
+
+_GRADE_COLUMNS = ['n_questions', 'n_correct_first_try', 'grade', 'bloom_level']
+_GRADE_REPORT_PATTERN = re.compile(r'\{[^{}]*\}')
+
+def create_grading_prompt(df, learning_objectives=None, output_setup=default_ai_assisted_setup,
+                          grading_instructions=default_ai_assisted_grading_instructions,
+                          bloom_instructions=bloom_assistedgrading_instructions,
+                          report_instructions=DEFAULT_GRADE_REPORT_INSTRUCTIONS):
+    # Assemble prompt the same way as the instructor notebook
+    prompt = output_setup if output_setup is not None else ""
+    prompt = (prompt + grading_instructions + "\n") if grading_instructions is not None else prompt
+    prompt = (prompt + bloom_instructions + "\n") if bloom_instructions is not None else prompt
+    prompt = (prompt + "The learning objectives being assessed are: " + learning_objectives + "\n") if learning_objectives else prompt
+    prompt = (prompt + report_instructions + "\n") if report_instructions is not None else prompt
+
+    # Keep the authors so the model can tell the student's answers from the tutor's feedback
+    chat_log = '\n'.join(df['author'].astype(str) + ': ' + df['message'].astype(str))
+    return prompt + "Here is the chat log: \n\n" + chat_log + "\n"
+
+def _to_number(value):
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except ValueError:
+        return None
+
+def parse_grade_report(response):
+    # the scores are in the last JSON object of the response
+    for report in reversed(_GRADE_REPORT_PATTERN.findall(response)):
+        try:
+            report = json.loads(report)
+        except json.JSONDecodeError:
+            continue
+        if any(col in report for col in _GRADE_COLUMNS):
+            return {col: _to_number(report[col]) if report.get(col) is not None else None for col in _GRADE_COLUMNS}
+
+    return {col: None for col in _GRADE_COLUMNS}
+
+def _load_grading_checkpoint(checkpoint_path):
+    # transcripts graded successfully by an earlier run, by filename
+    results = {}
+    if checkpoint_path is None or not os.path.exists(checkpoint_path):
+        return results
+
+    with open(checkpoint_path, "r") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                # the last line is cut short if the run was stopped while writing it
+                continue
+            if result.get('error') is None:
+                results[result['filename']] = result
+
+    return results
+
+async def _agrade_transcript(fpath, df, load_error, mdl, learning_objectives=None, **prompt_kwargs):
+    result = {'filename': fpath, **{col: None for col in _GRADE_COLUMNS}, 'response': None, 'error': None, 'graded_by': 'model'}
+
+    if load_error is not None or df is None:
+        result['error'] = load_error if load_error is not None else "Error: Not a JSON file."
+        return result
+
+    try:
+        response = await aget_direct_answer(mdl, create_grading_prompt(df, learning_objectives, **prompt_kwargs), DEFAULT_GRADING_SYSTEM_PROMPT)
+    except Exception as e:
+        result['error'] = "Fatal System Error: " + str(e)
+        return result
+
+    result.update(parse_grade_report(response), response=response)
+    if result['grade'] is None:
+        result['error'] = "Warning: No grade found in the response of the model."
+
+    return result
+
+async def agrade_transcripts(json_files=None, learning_objectives=None, mdl=None, max_concurrency=8, checkpoint_path=None, n_workers=1, pregrade=False, **prompt_kwargs):
+    from_upload = json_files is None and grade_settings['transcripts'] is not None
+    json_files = grade_settings['json_files'] if json_files is None else json_files
+    learning_objectives = grade_settings['learning_objectives'] if learning_objectives is None else learning_objectives
+    if mdl is None:
+        mdl = create_model(client_pool=get_client_pool())
+
+    results = _load_grading_checkpoint(checkpoint_path)
+    to_grade = list(dict.fromkeys(fpath for fpath in json_files if fpath not in results))
+    next_ind = 0
+
+    # load everything left to grade at once, in a separate thread so the event loop isn't blocked
+    if from_upload:
+        all_dfs, load_errors = grade_settings['transcripts'], grade_settings['json_loading_errors']
+    else:
+        all_dfs, load_errors = await asyncio.get_running_loop().run_in_executor(None, _load_json_files_in_chunks, to_grade, n_workers)
+    transcripts = dict(tuple(all_dfs.groupby('filename', sort=False)))
+    load_errors = {fpath: msg for fpath, msg in load_errors}
+
+    def _save(checkpoint, result):
+        results[result['filename']] = result
+        if checkpoint is not None:
+            checkpoint.write(json.dumps(result) + '\n')
+            checkpoint.flush()
+
+    # each worker grades the next transcript until all of them are graded
+    async def _worker(checkpoint):
+        nonlocal next_ind
+        while next_ind < len(to_grade):
+            fpath = to_grade[next_ind]
+            next_ind += 1
+            _save(checkpoint, await _agrade_transcript(fpath, transcripts.get(fpath), load_errors.get(fpath), mdl, learning_objectives, **prompt_kwargs))
+
+    checkpoint = open(checkpoint_path, "a") if checkpoint_path is not None else None
+    try:
+        # transcripts the rules can grade don't need the model
+        if pregrade:
+            _, rule_grades = pregrade_transcripts(all_dfs[all_dfs['filename'].isin(to_grade)])
+            for grade in rule_grades[~rule_grades['ambiguous']].itertuples():
+                _save(checkpoint, {'filename': grade.filename, 'n_questions': float(grade.n_questions), 'n_correct_first_try': float(grade.n_correct_first_try),
+                                   'grade': float(grade.grade), 'bloom_level': None, 'response': None, 'error': None, 'graded_by': 'rules'})
+            to_grade = [fpath for fpath in to_grade if fpath not in results]
+
+        await asyncio.gather(*[_worker(checkpoint) for _ in range(max(1, min(max_concurrency, len(to_grade))))])
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    return pd.DataFrame([results[fpath] for fpath in json_files if fpath in results],
+                        columns=['filename'] + _GRADE_COLUMNS + ['response', 'error', 'graded_by'])
+
+def grade_transcripts(json_files=None, learning_objectives=None, mdl=None, max_concurrency=8, checkpoint_path=None, n_workers=1, pregrade=False, **prompt_kwargs):
+    coro = agrade_transcripts(json_files, learning_objectives, mdl, max_concurrency, checkpoint_path, n_workers, pregrade, **prompt_kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # we're already inside an event loop (e.g., Jupyter), so run in a separate thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+# %% ../nbs/GradingUtility.ipynb 55
+_CORRECT_PATTERN = r"\b(?:correct!|that's correct|that is correct|you're correct|you are correct|well done|great job|exactly right)"
+_INCORRECT_PATTERN = r"\b(?:incorrect|not correct|not quite|wrong|i'm sorry|sorry, but)"
+
+def _segment_attempts(all_dfs):
+    df = pd.DataFrame({'filename': all_dfs['filename'].to_numpy(),
+                       'message': all_dfs['message'].astype(str).to_numpy(),
+                       'is_user': (all_dfs['author'].astype(str).str.strip().str.lower() == 'user').to_numpy()})
+    is_tutor = ~df['is_user']
+
+    # questions asked by the tutor, and any feedback written before the question in the same message
+    df['question'] = df['message'].str.extract(r'(?i)\bquestion\s+(\d+)', expand=False).astype(float).where(is_tutor)
+    feedback_text = df['message'].str.replace(r'(?is)\bquestion\s+\d+.*', '', regex=True).str.lower()
+    df['says_correct'] = is_tutor & feedback_text.str.contains(_CORRECT_PATTERN, regex=True)
+    df['says_incorrect'] = is_tutor & feedback_text.str.contains(_INCORRECT_PATTERN, regex=True)
+
+    # every user message after a question is an attempt at it
+    df['current_question'] = df.groupby('filename', sort=False)['question'].ffill()
+    df['is_attempt'] = df['is_user'] & df['current_question'].notna()
+    df['attempt'] = df.groupby(['filename', 'current_question'], sort=False)['is_attempt'].cumsum().where(df['is_attempt'])
+    df['current_attempt'] = df.groupby(['filename', 'current_question'], sort=False)['attempt'].ffill()
+
+    # feedback is about the attempt before it
+    previous = df.groupby('filename', sort=False)[['current_question', 'current_attempt']].shift()
+    is_feedback = is_tutor & (df['says_correct'] | df['says_incorrect']) & previous['current_attempt'].notna()
+    feedback = (pd.DataFrame({'filename': df['filename'], 'question': previous['current_question'], 'attempt': previous['current_attempt'],
+                              'says_correct': df['says_correct'], 'says_incorrect': df['says_incorrect']})[is_feedback]
+                .groupby(['filename', 'question', 'attempt'], sort=False).any())
+
+    attempts = df.loc[df['is_attempt'], ['filename', 'current_question', 'attempt']].rename(columns={'current_question': 'question'})
+    attempts = attempts.join(feedback, on=['filename', 'question', 'attempt'])
+    attempts['says_correct'] = attempts['says_correct'].fillna(False).astype(bool)
+    attempts['says_incorrect'] = attempts['says_incorrect'].fillna(False).astype(bool)
+
+    return df, attempts
+
+def pregrade_transcripts(all_dfs):
+    df, attempts = _segment_attempts(all_dfs)
+    attempts['correct'] = attempts['says_correct'] & ~attempts['says_incorrect']
+    attempts['resolved'] = attempts['says_correct'] != attempts['says_incorrect']
+
+    # a question ends at its first correct attempt
+    attempts['correct_attempt'] = attempts['attempt'].where(attempts['correct'])
+    first_correct = attempts.groupby(['filename', 'question'], sort=False)['correct_attempt'].transform('min')
+    attempts = attempts[first_correct.isna() | (attempts['attempt'] <= first_correct)]
+    question_grades = attempts.groupby(['filename', 'question'], sort=False).agg(n_attempts=('attempt', 'max'),
+                                                                                  first_try_correct=('correct', 'first'),
+                                                                                  attempts_to_correct=('correct_attempt', 'min'),
+                                                                                  resolved=('resolved', 'all'))
+
+    # every question asked, answered or not
+    asked = df.loc[df['question'].notna(), ['filename', 'question']].drop_duplicates()
+    question_grades = asked.join(question_grades, on=['filename', 'question']).reset_index(drop=True)
+    question_grades['question'] = question_grades['question'].astype(int)
+    question_grades['n_attempts'] = question_grades['n_attempts'].fillna(0).astype(int)
+    question_grades['first_try_correct'] = question_grades['first_try_correct'].fillna(False).astype(bool)
+    question_grades['ambiguous'] = ~question_grades.pop('resolved').fillna(True).astype(bool)
+
+    # transcripts where a question number goes backwards
+    out_of_order = df['question'] < df.groupby('filename', sort=False)['question'].cummax()
+    out_of_order = out_of_order.groupby(df['filename'], sort=False).any()
+
+    transcript_grades = question_grades.groupby('filename', sort=False).agg(n_questions=('question', 'size'),
+                                                                            n_correct_first_try=('first_try_correct', 'sum'),
+                                                                            ambiguous=('ambiguous', 'any'))
+    transcript_grades = transcript_grades.reindex(df['filename'].unique())
+    transcript_grades['n_questions'] = transcript_grades['n_questions'].fillna(0).astype(int)
+    transcript_grades['n_correct_first_try'] = transcript_grades['n_correct_first_try'].fillna(0).astype(int)
+    transcript_grades['grade'] = transcript_grades['n_correct_first_try'] / transcript_grades['n_questions'].where(transcript_grades['n_questions'] > 0)
+    transcript_grades['ambiguous'] = transcript_grades['ambiguous'].fillna(True).astype(bool) | out_of_order.reindex(transcript_grades.index).to_numpy()
+    transcript_grades = transcript_grades.rename_axis('filename').reset_index()
+
+    return question_grades, transcript_grades[['filename', 'n_questions', 'n_correct_first_try', 'grade', 'ambiguous']]
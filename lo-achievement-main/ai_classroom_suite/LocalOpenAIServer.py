@@ -0,0 +1,194 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/local_openai_server.ipynb.
+
+# %% auto 0
+__all__ = ['LocalOpenAIServer']
+
+# %% ../nbs/local_openai_server.ipynb 3
+import json
+import time
+import socket
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+# %% ../nbs/local_openai_server.ipynb 5
+class LocalOpenAIServer:
+    def __init__(self, host='127.0.0.1', port=0, embedding_dim=1536, latency=0.0, latency_per_input=0.0,
+                 max_batch_size=None, rate_limit_every=None, reply_fcn=None, latency_per_token=0.0, latency_per_connection=0.0):
+        self.host = host
+        self.port = port
+        self.embedding_dim = embedding_dim
+        self.latency = latency
+        self.latency_per_input = latency_per_input
+        self.max_batch_size = max_batch_size
+        self.rate_limit_every = rate_limit_every
+        self.reply_fcn = reply_fcn
+        self.latency_per_token = latency_per_token
+        self.latency_per_connection = latency_per_connection
+
+        self.request_log = []
+        self.n_connections = 0
+        self._n_requests = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/v1'
+
+    def start(self):
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            # keep connections open between requests
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                # send each response as soon as it's written, like a real server
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server._lock:
+                    server.n_connections += 1
+                time.sleep(server.latency_per_connection)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                status, response = server.handle_request(self.path, body)
+                if isinstance(response, list):
+                    self._send_stream(status, response)
+                    return
+                payload = json.dumps(response).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_stream(self, status, chunks):
+                # streamed chat completions are sent as server-sent events, one per chunk
+                # the stream has no length, so it ends when the connection closes
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    for chunk in chunks:
+                        time.sleep(server.latency_per_token)
+                        self.wfile.write(b'data: ' + json.dumps(chunk).encode('utf-8') + b'\n\n')
+                        self.wfile.flush()
+                    self.wfile.write(b'data: [DONE]\n\n')
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client stopped reading the stream
+                    pass
+
+            def log_message(self, *args):
+                # keep notebook output clean
+                pass
+
+        class _Server(ThreadingHTTPServer):
+            # accept many simultaneous connections, like the real API
+            request_queue_size = 1024
+
+        self._httpd = _Server((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def embed(self, text_or_tokens):
+        # deterministic unit vector for any input, so identical inputs get identical embeddings
+        seed_text = text_or_tokens if isinstance(text_or_tokens, str) else json.dumps(text_or_tokens)
+        seed = int.from_bytes(hashlib.sha256(seed_text.encode('utf-8')).digest()[:8], 'little')
+        vector = np.random.default_rng(seed).standard_normal(self.embedding_dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def handle_request(self, path, body):
+        with self._lock:
+            self._n_requests += 1
+            n_request = self._n_requests
+
+        if path.rstrip('/').endswith('/embeddings'):
+            return self._handle_embeddings(body, n_request)
+        if path.rstrip('/').endswith('/chat/completions'):
+            return self._handle_chat(body, n_request)
+
+        return 404, _error_response(f'Unknown endpoint {path}', 'invalid_request_error')
+
+    def _handle_embeddings(self, body, n_request):
+        inputs = body.get('input', [])
+        # a single string or a single list of tokens is one input
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+
+        self.request_log.append({'endpoint': 'embeddings', 'n_inputs': len(inputs), 'time': time.time()})
+
+        if self.rate_limit_every and n_request % self.rate_limit_every == 0:
+            return 429, _error_response('Rate limit reached for requests. Please try again later.', 'rate_limit_exceeded')
+        if self.max_batch_size and len(inputs) > self.max_batch_size:
+            return 400, _error_response(f'Too many inputs. The max number of inputs is {self.max_batch_size}. '
+                                        'Please reduce the request size.', 'invalid_request_error')
+
+        time.sleep(self.latency + self.latency_per_input*len(inputs))
+
+        n_tokens = sum(len(text.split()) if isinstance(text, str) else len(text) for text in inputs)
+        return 200, {'object': 'list',
+                     'data': [{'object': 'embedding', 'index': ind, 'embedding': self.embed(text)} for ind, text in enumerate(inputs)],
+                     'model': body.get('model', 'local-embedding'),
+                     'usage': {'prompt_tokens': n_tokens, 'total_tokens': n_tokens}}
+
+    def reply(self, messages):
+        # deterministic reply to the last message, unless the test gave its own
+        if self.reply_fcn is not None:
+            return self.reply_fcn(messages)
+        return 'This is a local reply to: ' + (messages[-1]['content'] if messages else '')
+
+    def _handle_chat(self, body, n_request):
+        messages = body.get('messages', [])
+        self.request_log.append({'endpoint': 'chat', 'n_messages': len(messages), 'stream': bool(body.get('stream')), 'time': time.time()})
+
+        if self.rate_limit_every and n_request % self.rate_limit_every == 0:
+            return 429, _error_response('Rate limit reached for requests. Please try again later.', 'rate_limit_exceeded')
+
+        time.sleep(self.latency)
+
+        reply = self.reply(messages)
+        if body.get('stream'):
+            return 200, self._chat_chunks(reply, body.get('model', 'local-chat'), n_request)
+
+        n_prompt_tokens = sum(len(str(msg.get('content', '')).split()) for msg in messages)
+        n_completion_tokens = len(reply.split())
+        return 200, {'id': f'chatcmpl-local-{n_request}',
+                     'object': 'chat.completion',
+                     'created': int(time.time()),
+                     'model': body.get('model', 'local-chat'),
+                     'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}],
+                     'usage': {'prompt_tokens': n_prompt_tokens, 'completion_tokens': n_completion_tokens,
+                               'total_tokens': n_prompt_tokens + n_completion_tokens}}
+
+    def _chat_chunks(self, reply, model, n_request):
+        # one chunk per word, then an empty chunk with the finish reason, like the real API
+        words = reply.split(' ')
+        deltas = [{'role': 'assistant', 'content': ''}] + [{'content': word if ind == 0 else ' ' + word} for ind, word in enumerate(words)]
+        chunks = [{'index': 0, 'delta': delta, 'finish_reason': None} for delta in deltas] + [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]
+        return [{'id': f'chatcmpl-local-{n_request}', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                 'model': model, 'choices': [choice]} for choice in chunks]
+
+def _error_response(message, error_type):
+    return {'error': {'message': message, 'type': error_type, 'param': None, 'code': None}}
@@ -1,17 +1,37 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/media_stores.ipynb.
 
 # %% auto 0
-__all__ = ['rawtext_to_doc_split', 'files_to_text', 'youtube_to_text', 'save_text', 'get_youtube_transcript',
-           'website_to_text_web', 'website_to_text_unstructured', 'get_document_segments', 'create_local_vector_store']
+__all__ = ['DEFAULT_EMBEDDING_CACHE_PATH', 'LinearTextChunker', 'get_text_chunker', 'rawtext_to_doc_split', 'files_to_text',
+           'youtube_to_text', 'save_text', 'get_youtube_transcript', 'website_to_text_web',
+           'website_to_text_unstructured', 'get_document_segments', 'MinHashDeduplicator', 'deduplicate_segments',
+           'EmbeddingCache', 'CachedEmbeddings', 'get_embedding_cache', 'BatchedEmbeddings',
+           'create_local_vector_store', 'iter_document_segments', 'add_segment_batches',
+           'create_local_vector_store_from_batches', 'compute_corpus_hash', 'create_vector_snapshot',
+           'IncrementalReferenceStore']
 
 # %% ../nbs/media_stores.ipynb 3
 # import libraries here
 import os
+import re
+import copy
+import json
+import zlib
 import itertools
+import hashlib
+import sqlite3
+import threading
+import time
+import asyncio
+from functools import partial, lru_cache
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
 
 from langchain.embeddings import OpenAIEmbeddings
+from langchain.embeddings.base import Embeddings
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.text_splitter import RecursiveCharacterTextSplitter, TextSplitter
 from langchain.document_loaders.unstructured import UnstructuredFileLoader
 from langchain.document_loaders.generic import GenericLoader
 from langchain.document_loaders.parsers import OpenAIWhisperParser
@@ -22,17 +42,114 @@ from langchain.docstore.document import Document
 from langchain.vectorstores import Chroma
 from langchain.chains import RetrievalQAWithSourcesChain, ConversationalRetrievalChain
 
+from .VectorIndexes import *
+
 # %% ../nbs/media_stores.ipynb 8
+class LinearTextChunker(TextSplitter):
+    def __init__(self, chunk_size=4000, chunk_overlap=200, separators=None, add_start_index=False, strip_whitespace=True):
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, keep_separator=True,
+                         add_start_index=add_start_index, strip_whitespace=strip_whitespace)
+        self._separators = separators or ["\n\n", "\n", " ", ""]
+
+    def _add_chunk(self, chunk, chunks, offset):
+        chunk = self._join_docs([chunk], '')
+        if chunk is not None:
+            chunks.append((chunk, offset))
+
+    def _merge_run(self, piece, piece_offset, ends, first, last, chunks):
+        # ends[i] is the end offset of split i-1 in piece (ends[0] = 0); merge splits first..last-1
+        chunk_size, chunk_overlap = self._chunk_size, self._chunk_overlap
+        start = first
+        while True:
+            # the first split which doesn't fit in a chunk beginning at split `start`
+            overflow = bisect_right(ends, ends[start] + chunk_size, start + 1, last + 1) - 1
+            if overflow >= last:
+                self._add_chunk(piece[ends[start]:ends[last]], chunks, piece_offset + ends[start])
+                return
+            self._add_chunk(piece[ends[start]:ends[overflow]], chunks, piece_offset + ends[start])
+
+            # start the next chunk so that it overlaps by at most chunk_overlap and has room for the overflowing split
+            start = max(bisect_left(ends, ends[overflow] - chunk_overlap, start, overflow),
+                        bisect_left(ends, ends[overflow + 1] - chunk_size, start, overflow))
+
+    def _split_piece(self, piece, piece_offset, separators, chunks):
+        # use the first separator which appears in this piece
+        separator, new_separators = separators[-1], []
+        for ind, sep in enumerate(separators):
+            if sep == "":
+                separator = sep
+                break
+            if sep in piece:
+                separator, new_separators = sep, separators[ind + 1:]
+                break
+
+        # lengths of the splits (each keeps the separator before it), without empty splits
+        parts = piece.split(separator) if separator else piece
+        if len(parts) > 1024:
+            # numpy is faster for the long lists of words or characters in transcripts and books
+            split_lens = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts)) + len(separator)
+            split_lens[0] -= len(separator)
+            split_lens = split_lens[1:] if split_lens[0] == 0 else split_lens
+            ends = [0] + np.cumsum(split_lens).tolist()
+            large_splits = np.flatnonzero(split_lens >= self._chunk_size).tolist()
+        else:
+            split_lens = [len(part) + len(separator) for part in parts]
+            if split_lens:
+                split_lens[0] -= len(separator)
+            split_lens = [split_len for split_len in split_lens if split_len]
+            ends = [0] + list(itertools.accumulate(split_lens))
+            large_splits = [ind for ind, split_len in enumerate(split_lens) if split_len >= self._chunk_size]
+
+        # merge runs of small splits into chunks, and split the large ones further
+        first = 0
+        for ind in large_splits:
+            if ind > first:
+                self._merge_run(piece, piece_offset, ends, first, ind, chunks)
+            large_split = piece[ends[ind]:ends[ind + 1]]
+            if new_separators:
+                self._split_piece(large_split, piece_offset + ends[ind], new_separators, chunks)
+            else:
+                chunks.append((large_split, piece_offset + ends[ind]))
+            first = ind + 1
+        if len(split_lens) > first:
+            self._merge_run(piece, piece_offset, ends, first, len(split_lens), chunks)
+
+    def _split_with_offsets(self, text):
+        chunks = []
+        self._split_piece(text, 0, self._separators, chunks)
+        return chunks
+
+    def split_text(self, text):
+        return [chunk for chunk, _ in self._split_with_offsets(text)]
+
+    def create_documents(self, texts, metadatas=None):
+        metadatas = metadatas or [{}] * len(texts)
+        documents = []
+        for text, metadata in zip(texts, metadatas):
+            index = -1
+            for chunk, offset in self._split_with_offsets(text):
+                chunk_metadata = copy.deepcopy(metadata) if metadata else {}
+                if self._add_start_index:
+                    # same as searching from the previous start like TextSplitter, but we know roughly where to look
+                    found = text.find(chunk, index + 1, max(offset, index + 1) + 2*len(chunk))
+                    index = found if found != -1 else text.find(chunk, index + 1)
+                    chunk_metadata['start_index'] = index
+                documents.append(Document(page_content=chunk, metadata=chunk_metadata))
+        return documents
+
+@lru_cache(maxsize=None)
+def get_text_chunker(chunk_size, chunk_overlap, add_start_index=True):
+    return LinearTextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, add_start_index=add_start_index)
+
+# %% ../nbs/media_stores.ipynb 9
 def rawtext_to_doc_split(text, chunk_size=1500, chunk_overlap=150):
   
   # Quick type checking
   if not isinstance(text, list):
     text = [text]
 
-  # Create splitter
-  text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size,
-                                                 chunk_overlap=chunk_overlap,
-                                                 add_start_index = True)
+  # Get splitter
+  text_splitter = get_text_chunker(chunk_size, chunk_overlap)
   
   #Split into docs segments
   if isinstance(text[0], Document):
@@ -45,32 +162,54 @@ def rawtext_to_doc_split(text, chunk_size=1500, chunk_overlap=150):
 
   return doc_segments
 
-# %% ../nbs/media_stores.ipynb 16
+# %% ../nbs/media_stores.ipynb 21
 ## A single File
 def _file_to_text(single_file, chunk_size = 1000, chunk_overlap=150):
 
   # Create loader and get segments
   loader = UnstructuredFileLoader(single_file)
-  doc_segments = loader.load_and_split(RecursiveCharacterTextSplitter(chunk_size=chunk_size,
-                                                                      chunk_overlap=chunk_overlap,
-                                                                      add_start_index=True))
+  doc_segments = loader.load_and_split(get_text_chunker(chunk_size, chunk_overlap))
   return doc_segments
 
+def _safe_file_to_text(single_file, chunk_size = 1000, chunk_overlap=150):
+  # Catch errors per file so that one bad file doesn't stop the rest of the batch
+  try:
+    return _file_to_text(single_file, chunk_size=chunk_size, chunk_overlap=chunk_overlap), None
+  except Exception as e:
+    return [], [single_file, "Error: " + str(e)]
+
 
 ## Multiple files
-def files_to_text(files_list, chunk_size=1000, chunk_overlap=150):
+def files_to_text(files_list, chunk_size=1000, chunk_overlap=150, n_workers=1, return_errors=False):
   
   # Quick type checking
   if not isinstance(files_list, list):
     files_list = [files_list]
 
+  load_fcn = partial(_safe_file_to_text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+  # Load files in separate processes if requested (n_workers=None uses all cores) and there's more than one file.
+  # executor.map returns results in the order of files_list, so segment order doesn't depend on the number of workers
+  if len(files_list) > 1 and (n_workers is None or n_workers > 1):
+    n_workers = min(n_workers or os.cpu_count(), len(files_list))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+      results = list(executor.map(load_fcn, files_list))
+  else:
+    results = [load_fcn(single_file) for single_file in files_list]
+
   # This is currently a fix because the UnstructuredFileLoader expects a list of files yet can't split them correctly yet
-  all_segments = [_file_to_text(single_file, chunk_size=chunk_size, chunk_overlap=chunk_overlap) for single_file in files_list]
-  all_segments = list(itertools.chain(*all_segments)) if isinstance(all_segments[0], list) else all_segments
+  all_segments = list(itertools.chain(*[file_segments for file_segments, _ in results]))
+  load_errors = [file_error for _, file_error in results if file_error is not None]
+
+  for file_error in load_errors:
+    print(f"Error processing file {file_error[0]}: {file_error[1]}")
+
+  if return_errors:
+    return all_segments, load_errors
 
   return all_segments
 
-# %% ../nbs/media_stores.ipynb 20
+# %% ../nbs/media_stores.ipynb 29
 def youtube_to_text(urls, save_dir = "content"):
   # Transcribe the videos to text
   # save_dir: directory to save audio files
@@ -83,7 +222,7 @@ def youtube_to_text(urls, save_dir = "content"):
   
   return youtube_docs
 
-# %% ../nbs/media_stores.ipynb 24
+# %% ../nbs/media_stores.ipynb 33
 def save_text(text, text_name = None):
   if not text_name:
     text_name = text[:20]
@@ -94,7 +233,7 @@ def save_text(text, text_name = None):
   # Return the location at which the transcript is saved
   return text_path
 
-# %% ../nbs/media_stores.ipynb 25
+# %% ../nbs/media_stores.ipynb 34
 def get_youtube_transcript(yt_url, save_transcript = False, temp_audio_dir = "sample_data"):
   # Transcribe the videos to text and save to file in /content
   # save_dir: directory to save audio files
@@ -115,7 +254,7 @@ def get_youtube_transcript(yt_url, save_transcript = False, temp_audio_dir = "sa
   
   return youtube_docs, save_path
 
-# %% ../nbs/media_stores.ipynb 27
+# %% ../nbs/media_stores.ipynb 36
 def website_to_text_web(url, chunk_size = 1500, chunk_overlap=100):
   
     # Url can be a single string or list
@@ -127,7 +266,7 @@ def website_to_text_web(url, chunk_size = 1500, chunk_overlap=100):
     # Combine doc
     return website_data
 
-# %% ../nbs/media_stores.ipynb 33
+# %% ../nbs/media_stores.ipynb 42
 def website_to_text_unstructured(web_urls, chunk_size = 1500, chunk_overlap=100):
 
     # Make sure it's a list
@@ -143,11 +282,11 @@ def website_to_text_unstructured(web_urls, chunk_size = 1500, chunk_overlap=100)
     # Return individual docs or list
     return website_data
 
-# %% ../nbs/media_stores.ipynb 45
-def get_document_segments(context_info, data_type, chunk_size = 1500, chunk_overlap=100):
+# %% ../nbs/media_stores.ipynb 54
+def get_document_segments(context_info, data_type, chunk_size = 1500, chunk_overlap=100, dedup_threshold=None, **loader_kwargs):
 
     load_fcn = None
-    addtnl_params = {'chunk_size': chunk_size, 'chunk_overlap': chunk_overlap}
+    addtnl_params = {'chunk_size': chunk_size, 'chunk_overlap': chunk_overlap, **loader_kwargs}
 
     # Define function use to do the loading
     if data_type == 'text':
@@ -162,12 +301,618 @@ def get_document_segments(context_info, data_type, chunk_size = 1500, chunk_over
     # Get the document segments
     doc_segments = load_fcn(context_info, **addtnl_params)
 
+    # Drop near-duplicate segments if requested
+    if dedup_threshold is not None:
+        doc_segments = deduplicate_segments(doc_segments, threshold=dedup_threshold)
+
     return doc_segments
 
-# %% ../nbs/media_stores.ipynb 47
-def create_local_vector_store(document_segments, **retriever_kwargs):
-    embeddings = OpenAIEmbeddings()
-    db = Chroma.from_documents(document_segments, embeddings)
-    retriever = db.as_retriever(**retriever_kwargs)
+# %% ../nbs/media_stores.ipynb 56
+_MINHASH_PRIME = (1 << 31) - 1
+
+def _duplicate_provenance(duplicates):
+    # duplicates is a list of (dropped document, similarity)
+    return {'n_duplicates': len(duplicates),
+            'duplicates': json.dumps([{'source': doc.metadata.get('source'),
+                                       'start_index': doc.metadata.get('start_index'),
+                                       'similarity': round(float(similarity), 3)} for doc, similarity in duplicates])}
+
+class MinHashDeduplicator:
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=3, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+        # random hash functions (a*x + b) mod p
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MINHASH_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MINHASH_PRIME, size=num_perm).astype(np.uint64)
+
+        # use the most rows per band for which pairs well under the threshold still become candidates
+        self.rows = 1
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows == 0 and (rows / num_perm) ** (1 / rows) <= threshold - 0.1:
+                self.rows = rows
+        self.bands = num_perm // self.rows
+
+        self.reset()
+
+    def reset(self):
+        self._buckets = {}
+        self._signatures = {}
+        self.n_dropped = 0
+
+    def signature(self, text):
+        tokens = re.findall(r'\w+', text.lower())
+        if len(tokens) > self.shingle_size:
+            shingles = {' '.join(tokens[ind:ind + self.shingle_size]) for ind in range(len(tokens) - self.shingle_size + 1)}
+        else:
+            shingles = {' '.join(tokens)}
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64, count=len(shingles)) % _MINHASH_PRIME
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MINHASH_PRIME).min(axis=1)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band*self.rows:(band + 1)*self.rows].tobytes()) for band in range(self.bands)]
+
+    def _best_match(self, signature):
+        # only compare against kept segments which share at least one band
+        candidates = list(dict.fromkeys(itertools.chain.from_iterable(self._buckets.get(band_key, ()) for band_key in self._band_keys(signature))))
+        if not candidates:
+            return None, 0.0
+        similarities = np.mean(np.stack([self._signatures[key] for key in candidates]) == signature, axis=1)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return candidates[best], float(similarities[best])
+        return None, float(similarities[best])
+
+    def deduplicate(self, keys, signatures):
+        kept_keys = []
+        duplicate_of = {}
+        for key, signature in zip(keys, signatures):
+            match, similarity = self._best_match(signature)
+            if match is None:
+                kept_keys.append(key)
+                self._signatures[key] = signature
+                for band_key in self._band_keys(signature):
+                    self._buckets.setdefault(band_key, []).append(key)
+            else:
+                duplicate_of[key] = (match, similarity)
+        self.n_dropped += len(duplicate_of)
+
+        return kept_keys, duplicate_of
+
+    def filter(self, segments):
+        # keys carry on from previous calls, so we can keep deduplicating across batches
+        first_key = len(self._signatures) + self.n_dropped
+        keys = list(range(first_key, first_key + len(segments)))
+        kept_keys, duplicate_of = self.deduplicate(keys, [self.signature(doc.page_content) for doc in segments])
+
+        # keep track of the dropped segments in the metadata of the segments they duplicate
+        duplicates = {}
+        for key, (match, similarity) in duplicate_of.items():
+            duplicates.setdefault(match, []).append((segments[key - first_key], similarity))
+        for match, match_duplicates in duplicates.items():
+            if match >= first_key:
+                segments[match - first_key].metadata.update(_duplicate_provenance(match_duplicates))
+
+        return [segments[key - first_key] for key in kept_keys]
+
+def deduplicate_segments(segments, threshold=0.8, **dedup_kwargs):
+    return MinHashDeduplicator(threshold, **dedup_kwargs).filter(segments)
+
+# %% ../nbs/media_stores.ipynb 60
+DEFAULT_EMBEDDING_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ai_classroom_suite', 'embeddings.sqlite')
+
+class EmbeddingCache:
+    def __init__(self, db_path=DEFAULT_EMBEDDING_CACHE_PATH, max_size_mb=512):
+        self.db_path = db_path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # create the database (and its folder) if needed
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS embeddings (
+                                  model TEXT NOT NULL,
+                                  text_hash TEXT NOT NULL,
+                                  vector BLOB NOT NULL,
+                                  last_used REAL NOT NULL,
+                                  PRIMARY KEY (model, text_hash))""")
+        self._conn.execute('CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)')
+        self._conn.commit()
+
+        self._size_bytes = self._conn.execute('SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings').fetchone()[0]
+
+    @staticmethod
+    def hash_text(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, model, texts):
+        text_hashes = [self.hash_text(text) for text in texts]
+        unique_hashes = list(dict.fromkeys(text_hashes))
+        found = {}
+
+        with self._lock:
+            # query in batches to stay under SQLite's limit on the number of parameters
+            for start in range(0, len(unique_hashes), 500):
+                batch = unique_hashes[start:start+500]
+                rows = self._conn.execute('SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({0})'.format(','.join('?'*len(batch))),
+                                          [model] + batch).fetchall()
+                found.update(rows)
+
+            # mark the embeddings we found as recently used
+            now = time.time()
+            self._conn.executemany('UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?',
+                                   [(now, model, text_hash) for text_hash in found])
+            self._conn.commit()
+
+            vectors = [np.frombuffer(found[text_hash], dtype=np.float32).tolist() if text_hash in found else None
+                       for text_hash in text_hashes]
+            n_hits = sum(vector is not None for vector in vectors)
+            self.hits += n_hits
+            self.misses += len(vectors) - n_hits
+
+        return vectors
+
+    def set_many(self, model, texts, vectors):
+        now = time.time()
+        rows = [(model, self.hash_text(text), np.asarray(vector, dtype=np.float32).tobytes(), now)
+                for text, vector in zip(texts, vectors)]
+
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)', rows)
+            self._size_bytes += sum(len(row[2]) for row in rows)
+            if self._size_bytes > self.max_size_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # recount, since replaced rows were counted twice above
+        n_entries, self._size_bytes = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings').fetchone()
+        if self._size_bytes <= self.max_size_bytes or not n_entries:
+            return
+
+        # drop the least recently used entries until we're back at 90% of the allowed size
+        bytes_per_entry = self._size_bytes / n_entries
+        n_evict = int(np.ceil((self._size_bytes - 0.9*self.max_size_bytes) / bytes_per_entry))
+        self._conn.execute('DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)', (n_evict,))
+        self._size_bytes = self._conn.execute('SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings').fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            n_entries = self._conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+            n_lookups = self.hits + self.misses
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'hit_rate': self.hits / n_lookups if n_lookups else 0.0,
+                    'entries': n_entries,
+                    'size_mb': self._size_bytes / (1024 * 1024)}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM embeddings')
+            self._conn.commit()
+            self._size_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+# %% ../nbs/media_stores.ipynb 62
+class CachedEmbeddings(Embeddings):
+    def __init__(self, embeddings, cache=None, model_name=None):
+        self.embeddings = embeddings
+        self.cache = cache if cache is not None else get_embedding_cache()
+        self.model_name = model_name or getattr(embeddings, 'model', None) or type(embeddings).__name__
+
+    def _embed_with_cache(self, texts, model_key, embed_fcn):
+        vectors = self.cache.get_many(model_key, texts)
+        missing = [ind for ind, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            # only embed each missing text once, even if it's repeated
+            missing_texts = list(dict.fromkeys(texts[ind] for ind in missing))
+            new_vectors = embed_fcn(missing_texts)
+            self.cache.set_many(model_key, missing_texts, new_vectors)
+
+            new_lookup = dict(zip(missing_texts, new_vectors))
+            for ind in missing:
+                vectors[ind] = new_lookup[texts[ind]]
+
+        return vectors
+
+    def embed_documents(self, texts):
+        return self._embed_with_cache(list(texts), self.model_name, self.embeddings.embed_documents)
+
+    def embed_query(self, text):
+        return self._embed_with_cache([text], self.model_name + '::query',
+                                      lambda texts: [self.embeddings.embed_query(texts[0])])[0]
+
+_default_embedding_cache = None
+
+def get_embedding_cache():
+    # lazily create one cache shared by everything in this process
+    global _default_embedding_cache
+    if _default_embedding_cache is None:
+        _default_embedding_cache = EmbeddingCache()
+    return _default_embedding_cache
+
+# %% ../nbs/media_stores.ipynb 66
+def _embedding_error_kind(error):
+    # classify errors by status and message so this works with the openai errors as well as other clients
+    http_status = getattr(error, 'http_status', None) or getattr(error, 'status_code', None)
+    error_name = type(error).__name__.lower()
+    error_msg = str(error).lower()
+
+    if http_status == 429 or 'ratelimit' in error_name or 'rate limit' in error_msg:
+        return 'rate_limit'
+    if http_status == 413 or any(msg in error_msg for msg in ['too many inputs', 'too large', 'maximum context length', 'reduce the request size']):
+        return 'too_large'
+    return None
+
+class BatchedEmbeddings(Embeddings):
+    def __init__(self, embeddings, batch_size=256, max_concurrency=4, min_batch_size=1, max_retries=6, retry_wait=1.0, grow_after=10):
+        self.embeddings = embeddings
+        self.max_batch_size = batch_size
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.min_batch_size = min_batch_size
+        self.max_retries = max_retries
+        self.retry_wait = retry_wait
+        self.grow_after = grow_after
+        self.model = getattr(embeddings, 'model', None)
+
+        # counters to see how the batching behaved
+        self.n_requests = 0
+        self.n_splits = 0
+        self.n_rate_limits = 0
+        self._n_successes = 0
+
+    def _shrink(self, n_texts):
+        self.batch_size = max(self.min_batch_size, min(self.batch_size, n_texts // 2))
+        self._n_successes = 0
+
+    async def _aembed_batch(self, texts):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.n_requests += 1
+                vectors = await self.embeddings.aembed_documents(texts)
+            except Exception as e:
+                error_kind = _embedding_error_kind(e)
+
+                # request was too large: split it and use the smaller size from now on
+                if error_kind == 'too_large' and len(texts) > self.min_batch_size:
+                    self.n_splits += 1
+                    self._shrink(len(texts))
+                    half = len(texts) // 2
+                    return await self._aembed_batch(texts[:half]) + await self._aembed_batch(texts[half:])
+
+                # rate limited: back off and send less per request
+                if error_kind == 'rate_limit' and attempt < self.max_retries:
+                    self.n_rate_limits += 1
+                    self._shrink(len(texts))
+                    await asyncio.sleep(self.retry_wait * 2**attempt)
+                    continue
+                raise
+
+            # slowly grow back to the requested batch size
+            self._n_successes += 1
+            if self._n_successes >= self.grow_after and self.batch_size < self.max_batch_size:
+                self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+                self._n_successes = 0
+            return vectors
+
+    async def aembed_documents(self, texts):
+        texts = list(texts)
+        vectors = [None] * len(texts)
+        next_start = 0
+
+        # each worker takes the next batch (at the current batch size) until everything is embedded
+        async def _worker():
+            nonlocal next_start
+            while next_start < len(texts):
+                start = next_start
+                end = min(start + self.batch_size, len(texts))
+                next_start = end
+                vectors[start:end] = await self._aembed_batch(texts[start:end])
+
+        await asyncio.gather(*[_worker() for _ in range(max(1, self.max_concurrency))])
+        return vectors
+
+    def embed_documents(self, texts):
+        coro = self.aembed_documents(texts)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        # we're already inside an event loop (e.g., Jupyter or Gradio), so run in a separate thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text):
+        return await self.embeddings.aembed_query(text)
+
+# %% ../nbs/media_stores.ipynb 73
+def _get_embeddings(embeddings=None, embedding_cache=None):
+    if embeddings is None:
+        embeddings = OpenAIEmbeddings()
+    if embedding_cache is not None:
+        embeddings = CachedEmbeddings(embeddings, embedding_cache)
+
+    return embeddings
+
+def _create_empty_vector_store(embeddings, backend='chroma', **index_kwargs):
+    if backend == 'chroma':
+        return Chroma(embedding_function=embeddings)
+    elif backend == 'numpy':
+        return NumpyVectorStore(embeddings)
+    elif backend == 'hnsw':
+        return HNSWVectorStore(embeddings, **index_kwargs)
+    else:
+        raise NotImplementedError(f"Vector store backend {backend} not implemented")
+
+def create_local_vector_store(document_segments, embeddings=None, embedding_cache=None, backend='chroma', hybrid=False, index_kwargs=None, **retriever_kwargs):
+    embeddings = _get_embeddings(embeddings, embedding_cache)
+    db = _create_empty_vector_store(embeddings, backend, **(index_kwargs or {}))
+    ids = db.add_documents(document_segments)
+
+    # optionally combine the vector store with a lexical index over the same segments, with the same ids
+    if hybrid:
+        retriever = HybridRetriever(vector_store=db, lexical_index=BM25Index.from_documents(document_segments, ids=ids), **retriever_kwargs)
+    else:
+        retriever = db.as_retriever(**retriever_kwargs)
     
     return db, retriever
+
+# %% ../nbs/media_stores.ipynb 75
+def iter_document_segments(context_info, data_type, chunk_size = 1500, chunk_overlap=100, batch_size=64, dedup_threshold=None, n_workers=1, load_errors=None, **loader_kwargs):
+
+    # Make sure it's a list so we can load one source at a time
+    if not isinstance(context_info, list):
+        context_info = [context_info]
+
+    addtnl_params = {'chunk_size': chunk_size, 'chunk_overlap': chunk_overlap, **loader_kwargs}
+
+    # Define function use to do the loading
+    if data_type == 'text':
+        load_fcn = rawtext_to_doc_split
+    elif data_type == 'web_page':
+        load_fcn = website_to_text_unstructured
+    elif data_type == 'youtube_video':
+        # transcripts come back whole, so split them like any other text
+        load_fcn = lambda url, **params: rawtext_to_doc_split(youtube_to_text(url, **loader_kwargs), chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    else:
+        # load n_workers files at a time in parallel, so memory is bounded by that many files; failed files go to load_errors
+        n_workers = n_workers or os.cpu_count()
+        def load_fcn(file_paths, **params):
+            file_segments, file_errors = files_to_text(file_paths, n_workers=n_workers, return_errors=True, **params)
+            if load_errors is not None:
+                load_errors.extend(file_errors)
+            return file_segments
+        context_info = [context_info[ind:ind + n_workers] for ind in range(0, len(context_info), n_workers)]
+
+    # Lazily load each source and regroup its segments into bounded batches
+    segment_iter = itertools.chain.from_iterable(load_fcn(source, **addtnl_params) for source in context_info)
+    deduplicator = MinHashDeduplicator(dedup_threshold) if dedup_threshold is not None else None
+    while True:
+        segment_batch = list(itertools.islice(segment_iter, batch_size))
+        if not segment_batch:
+            return
+        if deduplicator is not None:
+            segment_batch = deduplicator.filter(segment_batch)
+        if segment_batch:
+            yield segment_batch
+
+def add_segment_batches(vector_store, segment_batches, lexical_index=None):
+    n_segments = 0
+    for n_batches, segment_batch in enumerate(segment_batches, start=1):
+        ids = vector_store.add_documents(segment_batch)
+        if lexical_index is not None:
+            lexical_index.add_documents(segment_batch, ids=ids)
+        n_segments += len(segment_batch)
+        yield n_batches, n_segments
+
+def create_local_vector_store_from_batches(segment_batches, embeddings=None, embedding_cache=None, backend='chroma', hybrid=False, index_kwargs=None,
+                                           progress_fcn=None, **retriever_kwargs):
+    embeddings = _get_embeddings(embeddings, embedding_cache)
+    db = _create_empty_vector_store(embeddings, backend, **(index_kwargs or {}))
+    lexical_index = BM25Index() if hybrid else None
+
+    for n_batches, n_segments in add_segment_batches(db, segment_batches, lexical_index):
+        if progress_fcn is not None:
+            progress_fcn(n_batches, n_segments)
+
+    # same retriever as create_local_vector_store
+    if hybrid:
+        retriever = HybridRetriever(vector_store=db, lexical_index=lexical_index, **retriever_kwargs)
+    else:
+        retriever = db.as_retriever(**retriever_kwargs)
+
+    return db, retriever
+
+# %% ../nbs/media_stores.ipynb 79
+def compute_corpus_hash(file_paths, **params):
+    corpus_hash = hashlib.sha256()
+    for file_path in sorted(file_paths, key=os.path.basename):
+        corpus_hash.update(os.path.basename(file_path).encode('utf-8') + b'\x00')
+        with open(file_path, 'rb') as f:
+            for block in iter(partial(f.read, 1 << 20), b''):
+                corpus_hash.update(block)
+        corpus_hash.update(b'\x00')
+    corpus_hash.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+
+    return corpus_hash.hexdigest()
+
+def create_vector_snapshot(file_paths, snapshot_path, chunk_size=1000, chunk_overlap=150, embeddings=None, embedding_cache=None,
+                           backend='numpy', index_kwargs=None, return_errors=False):
+    if embeddings is None:
+        embeddings = OpenAIEmbeddings()
+    embedding_model = getattr(embeddings, 'model', None)
+    corpus_hash = compute_corpus_hash(file_paths, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    segments, load_errors = files_to_text(file_paths, chunk_size=chunk_size, chunk_overlap=chunk_overlap, return_errors=True)
+    db, _ = create_local_vector_store(segments, embeddings, embedding_cache, backend=backend, index_kwargs=index_kwargs)
+    save_vector_snapshot(db, snapshot_path, corpus_hash=corpus_hash, embedding_model=embedding_model)
+
+    if return_errors:
+        return corpus_hash, load_errors
+
+    return corpus_hash
+
+# %% ../nbs/media_stores.ipynb 83
+class IncrementalReferenceStore:
+    def __init__(self, embeddings=None, embedding_cache=None, backend='chroma', chunk_size=1000, chunk_overlap=150, dedup_threshold=None):
+        self.vector_store = _create_empty_vector_store(_get_embeddings(embeddings, embedding_cache), backend)
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        # source -> (content hash, ids of the source's segments)
+        self.sources = {}
+        # segment id -> segment, for all segments of all sources, and the ids of those in the vector store
+        self.segments = {}
+        self.stored_ids = set()
+        # lexical index over the same segments, for hybrid retrieval
+        self.lexical_index = BM25Index()
+
+        # near-duplicate removal: dropped segment id -> (id of the segment it duplicates, similarity)
+        self.deduplicator = MinHashDeduplicator(dedup_threshold) if dedup_threshold is not None else None
+        self.duplicates = {}
+        self._signatures = {}
+
+    @property
+    def n_segments(self):
+        return len(self.stored_ids)
+
+    def _segment_params(self):
+        return {'chunk_size': self.chunk_size, 'chunk_overlap': self.chunk_overlap}
+
+    def _text_hash(self, text):
+        return EmbeddingCache.hash_text(text + '\x00' + json.dumps(self._segment_params(), sort_keys=True))
+
+    def _segment_ids(self, source, segments):
+        # ids only depend on the source and the segment text (and repeats of it), so unchanged segments keep their ids
+        n_seen = {}
+        segment_ids = []
+        for doc in segments:
+            text_hash = EmbeddingCache.hash_text(doc.page_content)
+            n_seen[text_hash] = n_seen.get(text_hash, 0) + 1
+            segment_ids.append(EmbeddingCache.hash_text(f'{source}\x00{text_hash}\x00{n_seen[text_hash]}'))
+        return segment_ids
+
+    def _load_texts(self, texts):
+        segments = {}
+        for source, text in texts.items():
+            segments[source] = rawtext_to_doc_split(text, **self._segment_params()) if text.strip() else []
+            [doc.metadata.update({'source': source}) for doc in segments[source]];
+        return segments
+
+    def _load_files(self, file_paths, n_workers=1):
+        if not file_paths:
+            return {}, []
+        file_segments, load_errors = files_to_text(file_paths, n_workers=n_workers, return_errors=True, **self._segment_params())
+
+        # group the segments back by the file they came from
+        failed_files = {file_error[0] for file_error in load_errors}
+        segments = {file_path: [] for file_path in file_paths if file_path not in failed_files}
+        for doc in file_segments:
+            if doc.metadata.get('source') in segments:
+                segments[doc.metadata['source']].append(doc)
+
+        return segments, load_errors
+
+    def sync(self, texts=None, files=None, n_workers=1):
+        texts = texts or {}
+        files = files or []
+
+        # hash everything first; only new or changed sources are loaded and segmented
+        source_hashes = {source: self._text_hash(text) for source, text in texts.items()}
+        source_hashes.update({file_path: compute_corpus_hash([file_path], **self._segment_params()) for file_path in files})
+
+        changes = {'added': [], 'updated': [], 'removed': [], 'unchanged': [], 'errors': [],
+                   'n_segments_added': 0, 'n_segments_removed': 0}
+        changes['removed'] = [source for source in self.sources if source not in source_hashes]
+        for source, content_hash in source_hashes.items():
+            if source not in self.sources:
+                changes['added'].append(source)
+            elif self.sources[source][0] != content_hash:
+                changes['updated'].append(source)
+            else:
+                changes['unchanged'].append(source)
+
+        to_load = set(changes['added'] + changes['updated'])
+        segments = self._load_texts({source: text for source, text in texts.items() if source in to_load})
+        file_segments, changes['errors'] = self._load_files([file_path for file_path in files if file_path in to_load], n_workers)
+        segments.update(file_segments)
+        changes['added'] = [source for source in changes['added'] if source in segments]
+        changes['updated'] = [source for source in changes['updated'] if source in segments]
+
+        # update the segments of each source; segments which survive an edit keep their documents
+        for source in changes['removed']:
+            for segment_id in self.sources.pop(source)[1]:
+                self.segments.pop(segment_id, None)
+
+        for source, source_segments in segments.items():
+            segment_ids = self._segment_ids(source, source_segments)
+            if source in self.sources:
+                for segment_id in set(self.sources[source][1]).difference(segment_ids):
+                    self.segments.pop(segment_id, None)
+            for doc, segment_id in zip(source_segments, segment_ids):
+                self.segments.setdefault(segment_id, doc)
+            self.sources[source] = (source_hashes[source], segment_ids)
+
+        # work out which segments should be in the vector store, and what to delete and add to get there
+        keep_ids = [segment_id for _, segment_ids in self.sources.values() for segment_id in segment_ids]
+        if self.deduplicator is not None:
+            keep_ids = self._deduplicate(keep_ids)
+        keep_set = set(keep_ids)
+        ids_to_delete = [segment_id for segment_id in self.stored_ids if segment_id not in keep_set]
+        ids_to_add = [segment_id for segment_id in keep_ids if segment_id not in self.stored_ids]
+
+        # apply the changes to the vector store
+        if ids_to_delete:
+            self.vector_store.delete(ids_to_delete)
+            self.lexical_index.delete(ids_to_delete)
+        if ids_to_add:
+            docs_to_add = self._documents_to_add(ids_to_add)
+            self.vector_store.add_documents(docs_to_add, ids=ids_to_add)
+            self.lexical_index.add_documents(docs_to_add, ids=ids_to_add)
+        self.stored_ids = keep_set
+        changes['n_segments_added'] = len(ids_to_add)
+        changes['n_segments_removed'] = len(ids_to_delete)
+        changes['n_duplicates'] = len(self.duplicates)
+
+        return changes
+
+    def as_retriever(self, hybrid=True, **retriever_kwargs):
+        if hybrid:
+            return HybridRetriever(vector_store=self.vector_store, lexical_index=self.lexical_index, **retriever_kwargs)
+        return self.vector_store.as_retriever(**retriever_kwargs)
+
+    def _deduplicate(self, segment_ids):
+        # signatures are kept between syncs, so only new segments are hashed
+        self._signatures = {segment_id: self._signatures[segment_id] if segment_id in self._signatures
+                            else self.deduplicator.signature(self.segments[segment_id].page_content)
+                            for segment_id in segment_ids}
+        self.deduplicator.reset()
+        keep_ids, self.duplicates = self.deduplicator.deduplicate(segment_ids, [self._signatures[segment_id] for segment_id in segment_ids])
+
+        return keep_ids
+
+    def _documents_to_add(self, segment_ids):
+        # record the provenance of dropped duplicates on the segments we add; segments already stored keep their metadata
+        duplicates = {}
+        for segment_id, (match, similarity) in self.duplicates.items():
+            duplicates.setdefault(match, []).append((self.segments[segment_id], similarity))
+
+        documents = []
+        for segment_id in segment_ids:
+            doc = self.segments[segment_id]
+            if segment_id in duplicates:
+                doc = Document(page_content=doc.page_content, metadata={**doc.metadata, **_duplicate_provenance(duplicates[segment_id])})
+            documents.append(doc)
+
+        return documents
@@ -0,0 +1,268 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/model_clients.ipynb.
+
+# %% auto 0
+__all__ = ['DEFAULT_MAX_CONCURRENCY', 'CallLimiter', 'PooledChatClient', 'ModelClientPool', 'get_client_pool']
+
+# %% ../nbs/model_clients.ipynb 3
+import time
+import asyncio
+import threading
+import weakref
+from collections import deque
+from contextlib import contextmanager
+
+import aiohttp
+import openai
+import requests
+from openai import api_requestor
+from requests.adapters import HTTPAdapter
+
+# %% ../nbs/model_clients.ipynb 6
+DEFAULT_MAX_CONCURRENCY = 32
+
+class CallLimiter:
+    # a semaphore shared by threads and by the tasks of any event loop; freed slots go to waiters in order
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self.n_active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._waiters = deque()
+
+    def _try_acquire(self):
+        if self.n_active < self.max_concurrency and not self._waiters:
+            self.n_active += 1
+            self.max_active = max(self.max_active, self.n_active)
+            return True
+        return False
+
+    def acquire(self):
+        # returns whether the call had to wait
+        with self._lock:
+            if self._try_acquire():
+                return False
+            event = threading.Event()
+            self._waiters.append(event.set)
+        event.wait()
+        return True
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def hand_over():
+            # runs on the waiter's loop; a cancelled waiter passes its slot on
+            if future.cancelled():
+                self.release()
+            else:
+                future.set_result(None)
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(hand_over)
+            except RuntimeError:
+                # the waiter's loop is closed
+                self.release()
+
+        with self._lock:
+            if self._try_acquire():
+                return False
+            self._waiters.append(wake)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if wake in self._waiters:
+                    self._waiters.remove(wake)
+                    raise
+            # the slot was already handed to us; hand_over releases it if the future was cancelled first
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        return True
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self.n_active -= 1
+                return
+            # the slot goes straight to the next waiter, so n_active doesn't change
+            wake = self._waiters.popleft()
+        wake()
+
+    def stats(self):
+        with self._lock:
+            return {'n_active': self.n_active, 'max_active': self.max_active, 'n_waiting': len(self._waiters)}
+
+class PooledChatClient:
+    def __init__(self, api_key, model, api_base=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, keepalive_timeout=60, limiter=None):
+        self.api_key = api_key
+        self.model = model
+        self.api_base = api_base
+        self.max_concurrency = max_concurrency
+        self.keepalive_timeout = keepalive_timeout
+
+        self.n_calls = 0
+        self.n_waits = 0
+        self.n_active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        # shared by every client for the same API key when they come from a pool
+        self.limiter = limiter or CallLimiter(max_concurrency)
+
+        # one requests session for every thread
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        # async sessions belong to an event loop
+        self._async_sessions = weakref.WeakKeyDictionary()
+
+    def _start_call(self, waited):
+        with self._lock:
+            self.n_calls += 1
+            self.n_waits += waited
+            self.n_active += 1
+            self.max_active = max(self.max_active, self.n_active)
+
+    def _end_call(self, release):
+        with self._lock:
+            self.n_active -= 1
+        release()
+
+    @contextmanager
+    def _thread_session(self):
+        # openai (0.x) keeps one requests session per thread in a private attribute; swap in ours for this call,
+        # or fall back to openai's own sessions if it isn't there
+        context = getattr(api_requestor, '_thread_context', None)
+        if context is None:
+            yield
+            return
+        previous = context.__dict__.copy()
+        context.session, context.session_create_time = self._session, time.time()
+        try:
+            yield
+        finally:
+            context.__dict__.clear()
+            context.__dict__.update(previous)
+
+    def _release_after(self, chunks, release):
+        try:
+            yield from chunks
+        finally:
+            self._end_call(release)
+
+    async def _arelease_after(self, chunks, release):
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            self._end_call(release)
+
+    def create(self, **kwargs):
+        waited = self.limiter.acquire()
+        self._start_call(waited)
+
+        try:
+            with self._thread_session():
+                result = openai.ChatCompletion.create(**kwargs)
+        except BaseException:
+            self._end_call(self.limiter.release)
+            raise
+
+        if kwargs.get('stream'):
+            return self._release_after(result, self.limiter.release)
+        self._end_call(self.limiter.release)
+        return result
+
+    def _get_async_session(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._async_sessions:
+                connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=self.keepalive_timeout)
+                self._async_sessions[loop] = aiohttp.ClientSession(connector=connector)
+            return self._async_sessions[loop]
+
+    async def acreate(self, **kwargs):
+        session = self._get_async_session()
+        waited = await self.limiter.aacquire()
+        self._start_call(waited)
+
+        # openai uses the session set for this task, and leaves it open
+        token = openai.aiosession.set(session)
+        try:
+            result = await openai.ChatCompletion.acreate(**kwargs)
+        except BaseException:
+            self._end_call(self.limiter.release)
+            raise
+        finally:
+            openai.aiosession.reset(token)
+
+        if kwargs.get('stream'):
+            return self._arelease_after(result, self.limiter.release)
+        self._end_call(self.limiter.release)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {'n_calls': self.n_calls, 'n_waits': self.n_waits, 'n_active': self.n_active, 'max_active': self.max_active}
+
+    def close(self):
+        self._session.close()
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._async_sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+
+class ModelClientPool:
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, keepalive_timeout=60):
+        self.max_concurrency = max_concurrency
+        self.keepalive_timeout = keepalive_timeout
+        self._clients = {}
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, api_key, model, api_base=None):
+        api_base = api_base or openai.api_base
+        key = (api_key, model, api_base)
+        with self._lock:
+            if key not in self._clients:
+                # the rate limits belong to the key, so every model called with it shares one limit
+                limiter = self._limiters.setdefault((api_key, api_base), CallLimiter(self.max_concurrency))
+                self._clients[key] = PooledChatClient(api_key, model, api_base, max_concurrency=self.max_concurrency,
+                                                      keepalive_timeout=self.keepalive_timeout, limiter=limiter)
+            return self._clients[key]
+
+    def get_limiter(self, api_key, api_base=None):
+        with self._lock:
+            return self._limiters.get((api_key, api_base or openai.api_base))
+
+    def stats(self):
+        with self._lock:
+            clients = list(self._clients.values())
+        return {'n_clients': len(clients), **{name: sum(client.stats()[name] for client in clients) for name in ['n_calls', 'n_waits', 'n_active']}}
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.close()
+
+    async def aclose(self):
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            await client.aclose()
+
+_default_client_pool = None
+
+def get_client_pool():
+    # lazily create one pool shared by everything in this process
+    global _default_client_pool
+    if _default_client_pool is None:
+        _default_client_pool = ModelClientPool()
+    return _default_client_pool
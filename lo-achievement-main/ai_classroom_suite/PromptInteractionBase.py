@@ -3,9 +3,12 @@
 # %% auto 0
 __all__ = ['SYSTEM_TUTOR_TEMPLATE', 'HUMAN_RESPONSE_TEMPLATE', 'HUMAN_RETRIEVER_RESPONSE_TEMPLATE', 'DEFAULT_ASSESSMENT_MSG',
            'DEFAULT_LEARNING_OBJS_MSG', 'DEFAULT_CONDENSE_PROMPT_TEMPLATE', 'DEFAULT_QUESTION_PROMPT_TEMPLATE',
-           'DEFAULT_COMBINE_PROMPT_TEMPLATE', 'create_model', 'set_openai_key', 'create_base_tutoring_prompt',
-           'get_tutoring_prompt', 'get_tutoring_answer', 'create_tutor_mdl_chain', 'get_direct_answer',
-           'update_conversation_history']
+           'DEFAULT_COMBINE_PROMPT_TEMPLATE', 'DEFAULT_RESPONSE_CACHE_PATH', 'DEFAULT_SINGLE_CALL_PROMPT_TEMPLATE',
+           'create_model', 'set_openai_key', 'create_base_tutoring_prompt', 'get_tutoring_prompt',
+           'get_tutoring_answer', 'create_tutor_mdl_chain', 'get_direct_answer', 'ResponseCache', 'CachedChatOpenAI',
+           'with_response_cache', 'get_response_cache', 'stream_tutoring_answer', 'stream_direct_answer',
+           'aget_tutoring_answer', 'aget_direct_answer', 'astream_tutoring_answer', 'astream_direct_answer',
+           'build_retrieval_query', 'SingleCallConversationalChain', 'update_conversation_history']
 
 # %% ../nbs/prompt_interaction_base.ipynb 3
 from langchain.chat_models import ChatOpenAI
@@ -16,16 +19,41 @@ from langchain.prompts import ChatPromptTemplate, PromptTemplate
 from langchain.prompts import SystemMessagePromptTemplate, HumanMessagePromptTemplate
 from langchain.chains import LLMChain, ConversationalRetrievalChain, RetrievalQAWithSourcesChain
 from langchain.chains.base import Chain
-from langchain.schema.messages import SystemMessage, HumanMessage
+from langchain.chains.combine_documents.stuff import StuffDocumentsChain
+from langchain.chains.conversational_retrieval.base import _get_chat_history
+from langchain.callbacks.manager import CallbackManagerForChainRun, AsyncCallbackManagerForChainRun
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.schema.messages import SystemMessage, HumanMessage, AIMessage
+from langchain.schema.messages import AIMessageChunk
+from langchain.schema.output import ChatGeneration, ChatGenerationChunk, ChatResult
 from langchain.prompts.chat import ChatPromptValue
 
 from getpass import getpass
+from collections import OrderedDict
+from typing import Any, Optional
 
 import os
+import re
+import json
+import queue
+import asyncio
+import time
+import sqlite3
+import hashlib
+import threading
+
+import numpy as np
 
 # %% ../nbs/prompt_interaction_base.ipynb 6
-def create_model(openai_mdl='gpt-3.5-turbo-16k', temperature=0.1, **chatopenai_kwargs):
-    llm = ChatOpenAI(model_name = openai_mdl, temperature=temperature, **chatopenai_kwargs)
+def create_model(openai_mdl='gpt-3.5-turbo-16k', temperature=0.1, response_cache=None, client_pool=None, **chatopenai_kwargs):
+    if response_cache is not None:
+        llm = CachedChatOpenAI(model_name = openai_mdl, temperature=temperature, response_cache=response_cache, **chatopenai_kwargs)
+    else:
+        llm = ChatOpenAI(model_name = openai_mdl, temperature=temperature, **chatopenai_kwargs)
+
+    # share connections with every model using the same key, model and base URL
+    if client_pool is not None:
+        llm.client = client_pool.get_client(llm.openai_api_key, llm.model_name, llm.openai_api_base)
 
     return llm
 
@@ -57,7 +85,66 @@ HUMAN_RETRIEVER_RESPONSE_TEMPLATE = ("I want to master the topics based on the e
                            "chances to respond until I get the correct choice. Explain why the correct choice is right. " +
                            "The extracted text from long documents are as follows: {summaries}.")
 
+class _SharedObjects:
+    # a small LRU of objects which are shared between sessions, e.g. prompts and chains
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, create_fcn):
+        # objects without a key can't be shared
+        if key is None:
+            return create_fcn()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = create_fcn()
+        with self._lock:
+            self.misses += 1
+            value = self._entries.setdefault(key, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def _prompt_key(prompt):
+    # prompts with the same templates are interchangeable; None if we can't tell
+    if isinstance(prompt, PromptTemplate):
+        if prompt.partial_variables:
+            return None
+        return ('prompt', prompt.template, prompt.template_format, tuple(sorted(prompt.input_variables)))
+    if isinstance(prompt, ChatPromptTemplate):
+        message_keys = tuple((type(msg).__name__, _prompt_key(getattr(msg, 'prompt', None))) for msg in prompt.messages)
+        if prompt.partial_variables or any(key is None for msg_type, key in message_keys):
+            return None
+        return ('chat', message_keys)
+    return None
+
+_shared_prompts = _SharedObjects()
+
 def create_base_tutoring_prompt(system_prompt=None, human_prompt=None):
+    key = ('tutoring', _prompt_key(system_prompt) if system_prompt is not None else 'default',
+           _prompt_key(human_prompt) if human_prompt is not None else 'default')
+    if None in key:
+        return _build_tutoring_prompt(system_prompt, human_prompt)
+    return _shared_prompts.get_or_create(key, lambda: _build_tutoring_prompt(system_prompt, human_prompt))
+
+def _build_tutoring_prompt(system_prompt=None, human_prompt=None):
 
     #setup defaults using defined values
     if system_prompt == None:
@@ -83,7 +170,7 @@ DEFAULT_LEARNING_OBJS_MSG = 'Identify and comprehend the important topics and un
 
 def get_tutoring_prompt(context, chat_template=None, assessment_request = None, learning_objectives = None, **kwargs):
 
-    # set defaults
+    # set defaults (the default template is built once and shared, see create_base_tutoring_prompt)
     if chat_template is None:
         chat_template = create_base_tutoring_prompt()
     else:
@@ -106,42 +193,37 @@ def get_tutoring_prompt(context, chat_template=None, assessment_request = None,
     
     return tutoring_prompt
 
-
 # %% ../nbs/prompt_interaction_base.ipynb 19
-def get_tutoring_answer(context, tutor_mdl, chat_template=None,
-                        assessment_request=None,
-                        learning_objectives=None,
-                        return_dict=False,
-                        call_kwargs=None,
-                        input_kwargs=None):
-    
-    if call_kwargs is None:
-        call_kwargs = {}
+def _get_tutoring_call(context, tutor_mdl, chat_template=None,
+                       assessment_request=None,
+                       learning_objectives=None,
+                       input_kwargs=None,
+                       response_cache=None):
+    # the model to call and its input, shared by get_tutoring_answer and its streaming and async versions
     if input_kwargs is None:
         input_kwargs = {}
-    
+
     # set defaults
     if assessment_request is None:
             assessment_request = DEFAULT_ASSESSMENT_MSG
     if learning_objectives is None:
         learning_objectives = DEFAULT_LEARNING_OBJS_MSG
-    
+
     common_inputs = {'assessment_request':assessment_request, 'learning_objectives':learning_objectives}
-    
-    # get answer based on interaction type
+
+    # get input based on interaction type
     if isinstance(tutor_mdl, ChatOpenAI):
+        if response_cache is not None:
+            tutor_mdl = with_response_cache(tutor_mdl, response_cache)
         human_ask_prompt = get_tutoring_prompt(context, chat_template, assessment_request, learning_objectives)
-        tutor_answer = tutor_mdl(human_ask_prompt.to_messages())
+        return tutor_mdl, human_ask_prompt.to_messages()
 
-        if not return_dict:
-            final_answer = tutor_answer.content
-    
     elif isinstance(tutor_mdl, Chain):
         if isinstance(tutor_mdl, RetrievalQAWithSourcesChain):
             if 'question' not in input_kwargs.keys():
                 common_inputs['question'] = assessment_request
             final_inputs = {**common_inputs, **input_kwargs}
-            
+
         elif isinstance(tutor_mdl, ConversationalRetrievalChain):
             if 'question' not in input_kwargs.keys() or not input_kwargs['question']:
                 system_human_question = get_tutoring_prompt(context, chat_template, assessment_request, learning_objectives)
@@ -155,18 +237,33 @@ def get_tutoring_answer(context, tutor_mdl, chat_template=None,
         else:
             common_inputs['context'] = context
             final_inputs = {**common_inputs, **input_kwargs}
-         
-        # get answer
-        tutor_answer = tutor_mdl(final_inputs, **call_kwargs)
-        final_answer = tutor_answer
 
-        if not return_dict:
-            final_answer = final_answer['answer']
-    
+        return tutor_mdl, final_inputs
+
     else:
         raise NotImplementedError(f"tutor_mdl of type {type(tutor_mdl)} is not supported.")
 
-    return final_answer
+def get_tutoring_answer(context, tutor_mdl, chat_template=None,
+                        assessment_request=None,
+                        learning_objectives=None,
+                        return_dict=False,
+                        call_kwargs=None,
+                        input_kwargs=None,
+                        response_cache=None):
+
+    if call_kwargs is None:
+        call_kwargs = {}
+
+    tutor_mdl, tutor_inputs = _get_tutoring_call(context, tutor_mdl, chat_template, assessment_request,
+                                                 learning_objectives, input_kwargs, response_cache)
+
+    # get answer
+    if isinstance(tutor_mdl, ChatOpenAI):
+        tutor_answer = tutor_mdl(tutor_inputs)
+        return tutor_answer if return_dict else tutor_answer.content
+
+    tutor_answer = tutor_mdl(tutor_inputs, **call_kwargs)
+    return tutor_answer if return_dict else tutor_answer['answer']
 
 # %% ../nbs/prompt_interaction_base.ipynb 20
 DEFAULT_CONDENSE_PROMPT_TEMPLATE = ("Given the following conversation and a follow up message, combine the chat history and follow up message into " +
@@ -185,13 +282,64 @@ DEFAULT_COMBINE_PROMPT_TEMPLATE = ("Given the following extracted parts of a lon
                                    "If you don't have a response, just say that you are unable to come up with a response. "+
                                    "\nSOURCES:\n\nQUESTION: {question}\n=========\n{summaries}\n=========\nFINAL ANSWER:'")
 
-def create_tutor_mdl_chain(kind='llm', mdl=None, prompt_template = None, **kwargs):
-    
+_shared_chains = _SharedObjects()
+
+def _model_key(mdl):
+    # models with the same settings are interchangeable; None if we can't tell
+    if not isinstance(mdl, ChatOpenAI) or mdl.callbacks is not None or mdl.callback_manager is not None:
+        return None
+
+    settings = []
+    for name in sorted(mdl.__fields__):
+        if name in ['client', 'callbacks', 'callback_manager']:
+            continue
+        value = getattr(mdl, name)
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, sort_keys=True, default=str)
+        elif not isinstance(value, (str, int, float, bool, type(None))):
+            # e.g., a response cache, which is the same object for every session that shares it
+            value = ('object', id(value))
+        settings.append((name, value))
+    return (type(mdl).__name__, tuple(settings))
+
+def _chain_key(kind, mdl, prompt_template, kwargs):
+    settings = []
+    for name, value in sorted(kwargs.items()):
+        if name == 'retriever':
+            continue
+        if not isinstance(value, (str, int, float, bool, type(None))):
+            return None
+        settings.append((name, value))
+
+    prompt_key = _prompt_key(prompt_template) if prompt_template is not None else 'default'
+    model_key = _model_key(mdl)
+    if prompt_key is None or model_key is None:
+        return None
+    return (kind, prompt_key, model_key, tuple(settings))
+
+def create_tutor_mdl_chain(kind='llm', mdl=None, prompt_template = None, share=True, **kwargs):
+
     #Validate parameters
     if mdl is None:
         mdl = create_model()
     kind = kind.lower()
-    
+
+    if not share:
+        return _build_tutor_mdl_chain(kind, mdl, prompt_template, **kwargs)
+
+    # chains are shared between sessions with the same settings, without their retriever,
+    # which is bound to a shallow copy of the chain for each session
+    key = _chain_key(kind, mdl, prompt_template, kwargs)
+    if 'retriever' not in kwargs:
+        return _shared_chains.get_or_create(key, lambda: _build_tutor_mdl_chain(kind, mdl, prompt_template, **kwargs))
+    skeleton = _shared_chains.get_or_create(key, lambda: _with_retriever(_build_tutor_mdl_chain(kind, mdl, prompt_template, **kwargs), None))
+    return _with_retriever(skeleton, kwargs['retriever'])
+
+def _with_retriever(chain, retriever):
+    # a shallow copy of the chain with another retriever (copy() would leave out fields like callbacks)
+    return type(chain).construct(chain.__fields_set__, **{**chain.__dict__, 'retriever': retriever})
+
+def _build_tutor_mdl_chain(kind, mdl, prompt_template = None, **kwargs):
     #Create model chain
     if kind == 'llm':
         if prompt_template is None:
@@ -203,6 +351,8 @@ def create_tutor_mdl_chain(kind='llm', mdl=None, prompt_template = None, **kwarg
             prompt_template = create_base_tutoring_prompt(human_prompt=prompt_template)
         mdl_chain = ConversationalRetrievalChain.from_llm(mdl, condense_question_prompt = prompt_template, **kwargs)
         #mdl_chain = ConversationalRetrievalChain.from_llm(mdl, **kwargs)
+    elif kind == 'conversational_single_call':
+        mdl_chain = SingleCallConversationalChain.from_llm(mdl, prompt=prompt_template, **kwargs)
     elif kind == 'retrieval_qa':
         if prompt_template is None:
 
@@ -221,23 +371,528 @@ def create_tutor_mdl_chain(kind='llm', mdl=None, prompt_template = None, **kwarg
     return mdl_chain
 
 # %% ../nbs/prompt_interaction_base.ipynb 24
-def get_direct_answer(mdl, human_prompt=' ', system_prompt=' ', return_dict=False):
+def _get_direct_call(mdl, human_prompt=' ', system_prompt=' ', response_cache=None):
+    # the model to call and its messages, shared by get_direct_answer and its streaming and async versions
+    if not isinstance(mdl, ChatOpenAI):
+        raise NotImplementedError(f"mdl of type {type(mdl)} is not supported.")
+
+    if response_cache is not None:
+        mdl = with_response_cache(mdl, response_cache)
+    human_ask_prompt = ChatPromptValue(messages=[HumanMessage(content=human_prompt),
+                                                   SystemMessage(content=system_prompt)])
+    return mdl, human_ask_prompt.to_messages()
+
+def get_direct_answer(mdl, human_prompt=' ', system_prompt=' ', return_dict=False, response_cache=None):
+
+    mdl, messages = _get_direct_call(mdl, human_prompt, system_prompt, response_cache)
+    mdl_answer = mdl(messages)
+
+    return mdl_answer if return_dict else mdl_answer.content
+
+# %% ../nbs/prompt_interaction_base.ipynb 28
+DEFAULT_RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ai_classroom_suite', 'responses.sqlite')
+
+def _messages_key(messages):
+    return json.dumps([[msg.type, msg.content] for msg in messages])
+
+class ResponseCache:
+    def __init__(self, db_path=DEFAULT_RESPONSE_CACHE_PATH, max_size_mb=64, ttl=7*24*3600, max_temperature=0.2,
+                 embedding=None, similarity_threshold=0.97):
+        self.db_path = db_path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.embedding = embedding
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.saved_latency = 0.0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+
+        # create the database (and its folder) if needed
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+                                  key TEXT PRIMARY KEY,
+                                  model TEXT NOT NULL,
+                                  temperature REAL NOT NULL,
+                                  prefix_hash TEXT NOT NULL,
+                                  response TEXT NOT NULL,
+                                  vector BLOB,
+                                  latency REAL NOT NULL,
+                                  n_tokens INTEGER NOT NULL,
+                                  created REAL NOT NULL,
+                                  last_used REAL NOT NULL)""")
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_prefix ON responses (model, temperature, prefix_hash)')
+        self._conn.commit()
+
+    @staticmethod
+    def hash_key(model_name, temperature, messages):
+        return hashlib.sha256(json.dumps([model_name, temperature, _messages_key(messages)]).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _prefix_hash(messages):
+        # semantic matches need everything but the last message to be identical
+        return hashlib.sha256(_messages_key(messages[:-1]).encode('utf-8')).hexdigest()
+
+    def is_cacheable(self, temperature):
+        # reusing a response only makes sense if the model would (nearly) always give the same one
+        return temperature is not None and temperature <= self.max_temperature
+
+    def _embed_last(self, messages):
+        vector = np.asarray(self.embedding.embed_query(messages[-1].content), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _use_row(self, key, latency, n_tokens, now):
+        self._conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+        self._conn.commit()
+        self.saved_latency += latency
+        self.saved_tokens += n_tokens
+
+    def lookup(self, model_name, temperature, messages):
+        key = self.hash_key(model_name, temperature, messages)
+        now = time.time()
+        min_created = now - self.ttl if self.ttl is not None else float('-inf')
+
+        with self._lock:
+            row = self._conn.execute('SELECT response, latency, n_tokens FROM responses WHERE key = ? AND created >= ?',
+                                     (key, min_created)).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._use_row(key, row[1], row[2], now)
+                return row[0]
+            if self.embedding is None or not messages:
+                self.misses += 1
+                return None
+
+        # otherwise look for a response to a question which means the same thing, embedding outside the lock
+        query_vector = self._embed_last(messages)
+        with self._lock:
+            rows = self._conn.execute('SELECT key, response, vector, latency, n_tokens FROM responses '
+                                      'WHERE model = ? AND temperature = ? AND prefix_hash = ? AND created >= ? AND vector IS NOT NULL',
+                                      (model_name, temperature, self._prefix_hash(messages), min_created)).fetchall()
+            if rows:
+                scores = np.stack([np.frombuffer(row[2], dtype=np.float32) for row in rows]) @ query_vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    self.semantic_hits += 1
+                    self._use_row(rows[best][0], rows[best][3], rows[best][4], now)
+                    return rows[best][1]
+            self.misses += 1
+            return None
+
+    def add(self, model_name, temperature, messages, response, latency=0.0, n_tokens=0):
+        vector = self._embed_last(messages).tobytes() if self.embedding is not None and messages else None
+        now = time.time()
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO responses (key, model, temperature, prefix_hash, response, vector, latency, n_tokens, created, last_used) '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               (self.hash_key(model_name, temperature, messages), model_name, temperature, self._prefix_hash(messages),
+                                response, vector, latency, n_tokens, now, now))
+            self._evict(now)
+            self._conn.commit()
+
+    def _size_bytes(self):
+        return self._conn.execute('SELECT COALESCE(SUM(LENGTH(response) + COALESCE(LENGTH(vector), 0)), 0) FROM responses').fetchone()[0]
+
+    def _evict(self, now):
+        if self.ttl is not None:
+            self._conn.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl,))
+
+        # drop the least recently used entries until we're back at 90% of the allowed size
+        size_bytes = self._size_bytes()
+        if size_bytes > self.max_size_bytes:
+            n_entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            n_evict = int(np.ceil((size_bytes - 0.9*self.max_size_bytes) / (size_bytes / n_entries)))
+            self._conn.execute('DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses ORDER BY last_used LIMIT ?)', (n_evict,))
+
+    def stats(self):
+        with self._lock:
+            n_entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            n_lookups = self.hits + self.semantic_hits + self.misses
+            return {'hits': self.hits,
+                    'semantic_hits': self.semantic_hits,
+                    'misses': self.misses,
+                    'skipped': self.skipped,
+                    'hit_rate': (self.hits + self.semantic_hits) / n_lookups if n_lookups else 0.0,
+                    'entries': n_entries,
+                    'size_mb': self._size_bytes() / (1024 * 1024),
+                    'saved_latency_s': self.saved_latency,
+                    'saved_tokens': self.saved_tokens}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self.hits = self.semantic_hits = self.misses = self.skipped = 0
+            self.saved_latency = 0.0
+            self.saved_tokens = 0
+
+class CachedChatOpenAI(ChatOpenAI):
+    response_cache: Any = None
+
+    def _use_cache(self, stop):
+        cache = self.response_cache
+        if cache is None:
+            return False
+        if stop or self.n != 1 or not cache.is_cacheable(self.temperature):
+            with cache._lock:
+                cache.skipped += 1
+            return False
+        return True
+
+    def _cached_result(self, response):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))],
+                          llm_output={'token_usage': {}, 'model_name': self.model_name, 'cached': True})
+
+    def _add_response(self, messages, response, start, n_tokens=None):
+        # the API doesn't report usage when streaming, so then estimate 4 characters per token
+        if n_tokens is None:
+            n_tokens = (sum(len(str(msg.content)) for msg in messages) + len(response)) // 4
+        self.response_cache.add(self.model_name, self.temperature, messages, response,
+                                latency=time.perf_counter() - start, n_tokens=n_tokens)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        # streamed calls are cached by _stream
+        if kwargs.get('stream', self.streaming) or not self._use_cache(stop):
+            return super()._generate(messages, stop, run_manager, **kwargs)
+
+        response = self.response_cache.lookup(self.model_name, self.temperature, messages)
+        if response is not None:
+            return self._cached_result(response)
+
+        start = time.perf_counter()
+        result = super()._generate(messages, stop, run_manager, **kwargs)
+        token_usage = (result.llm_output or {}).get('token_usage', {})
+        self._add_response(messages, result.generations[0].message.content, start, token_usage.get('total_tokens', 0))
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        # streamed calls are cached by _astream
+        if kwargs.get('stream', self.streaming) or not self._use_cache(stop):
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+        response = self.response_cache.lookup(self.model_name, self.temperature, messages)
+        if response is not None:
+            return self._cached_result(response)
+
+        start = time.perf_counter()
+        result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        token_usage = (result.llm_output or {}).get('token_usage', {})
+        self._add_response(messages, result.generations[0].message.content, start, token_usage.get('total_tokens', 0))
+        return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._use_cache(stop):
+            yield from super()._stream(messages, stop, run_manager, **kwargs)
+            return
+
+        # a cached response arrives as a single chunk
+        response = self.response_cache.lookup(self.model_name, self.temperature, messages)
+        if response is not None:
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=response))
+            yield chunk
+            if run_manager:
+                run_manager.on_llm_new_token(response, chunk=chunk)
+            return
+
+        start = time.perf_counter()
+        response = ''
+        for chunk in super()._stream(messages, stop, run_manager, **kwargs):
+            response += chunk.message.content
+            yield chunk
+
+        # only complete responses get here
+        self._add_response(messages, response, start)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._use_cache(stop):
+            async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+                yield chunk
+            return
+
+        response = self.response_cache.lookup(self.model_name, self.temperature, messages)
+        if response is not None:
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=response))
+            yield chunk
+            if run_manager:
+                await run_manager.on_llm_new_token(response, chunk=chunk)
+            return
+
+        start = time.perf_counter()
+        response = ''
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            response += chunk.message.content
+            yield chunk
+
+        self._add_response(messages, response, start)
+
+def with_response_cache(mdl, response_cache):
+    # the same chat model, answering from the cache when it can
+    if isinstance(mdl, CachedChatOpenAI) and mdl.response_cache is response_cache:
+        return mdl
+    return CachedChatOpenAI.construct(**{**mdl.__dict__, 'response_cache': response_cache})
+
+_default_response_cache = None
+
+def get_response_cache():
+    # lazily create one cache shared by everything in this process
+    global _default_response_cache
+    if _default_response_cache is None:
+        _default_response_cache = ResponseCache()
+    return _default_response_cache
+
+# %% ../nbs/prompt_interaction_base.ipynb 34
+class _StreamCancelled(Exception):
+    pass
+
+class _StreamingHandler(BaseCallbackHandler):
+    # passes a chain's retrieved documents and answer tokens back to the stream
+    raise_error = True
+    # async chains call it on their event loop, which owns the queue
+    run_inline = True
+
+    def __init__(self, events, wait_for_retrieval):
+        self.events = events
+        self.stream_tokens = not wait_for_retrieval
+        self.cancelled = False
+
+    def on_retriever_end(self, documents, **kwargs):
+        self.events.put_nowait(('sources', list(documents)))
+        # anything generated before retrieval is the condensed question, not the answer
+        self.stream_tokens = True
+
+    def on_llm_new_token(self, token, **kwargs):
+        if self.cancelled:
+            raise _StreamCancelled()
+        if self.stream_tokens and token:
+            self.events.put_nowait(('token', token))
+
+def _stream_chat_model(mdl, messages):
+    answer = ''
+    for chunk in mdl.stream(messages):
+        answer += chunk.content
+        if chunk.content:
+            yield 'token', chunk.content
+    yield 'answer', answer
+
+def stream_tutoring_answer(context, tutor_mdl, chat_template=None,
+                           assessment_request=None,
+                           learning_objectives=None,
+                           input_kwargs=None,
+                           response_cache=None):
+
+    tutor_mdl, tutor_inputs = _get_tutoring_call(context, tutor_mdl, chat_template, assessment_request,
+                                                 learning_objectives, input_kwargs, response_cache)
+    if isinstance(tutor_mdl, ChatOpenAI):
+        yield from _stream_chat_model(tutor_mdl, tutor_inputs)
+        return
+
+    # run the chain in the background, passing its events back through a queue
+    events = queue.Queue()
+    handler = _StreamingHandler(events, wait_for_retrieval=hasattr(tutor_mdl, 'retriever'))
+
+    def run_chain():
+        try:
+            answer = tutor_mdl(tutor_inputs, callbacks=[handler])['answer']
+            events.put(('answer', answer))
+        except Exception as e:
+            events.put(('error', e))
+
+    threading.Thread(target=run_chain, daemon=True).start()
+    try:
+        while True:
+            kind, value = events.get()
+            if kind == 'error':
+                raise value
+            yield kind, value
+            if kind == 'answer':
+                return
+    finally:
+        # if the caller stopped listening, stop the chain at its next token
+        handler.cancelled = True
+
+def stream_direct_answer(mdl, human_prompt=' ', system_prompt=' ', response_cache=None):
+
+    mdl, messages = _get_direct_call(mdl, human_prompt, system_prompt, response_cache)
+    yield from _stream_chat_model(mdl, messages)
+
+# %% ../nbs/prompt_interaction_base.ipynb 38
+async def aget_tutoring_answer(context, tutor_mdl, chat_template=None,
+                               assessment_request=None,
+                               learning_objectives=None,
+                               return_dict=False,
+                               call_kwargs=None,
+                               input_kwargs=None,
+                               response_cache=None):
+
+    if call_kwargs is None:
+        call_kwargs = {}
 
-    # get answer based on interaction type
-    if isinstance(mdl, ChatOpenAI):
-        human_ask_prompt = ChatPromptValue(messages=[HumanMessage(content=human_prompt),
-                                                       SystemMessage(content=system_prompt)])
-        mdl_answer = mdl(human_ask_prompt.to_messages())
+    tutor_mdl, tutor_inputs = _get_tutoring_call(context, tutor_mdl, chat_template, assessment_request,
+                                                 learning_objectives, input_kwargs, response_cache)
 
-        if not return_dict:
-            final_answer = mdl_answer.content
+    # get answer without blocking the event loop
+    if isinstance(tutor_mdl, ChatOpenAI):
+        tutor_answer = await tutor_mdl.apredict_messages(tutor_inputs)
+        return tutor_answer if return_dict else tutor_answer.content
 
-    else:
-        raise NotImplementedError(f"mdl of type {type(mdl)} is not supported.")
+    tutor_answer = await tutor_mdl.acall(tutor_inputs, **call_kwargs)
+    return tutor_answer if return_dict else tutor_answer['answer']
+
+async def aget_direct_answer(mdl, human_prompt=' ', system_prompt=' ', return_dict=False, response_cache=None):
+
+    mdl, messages = _get_direct_call(mdl, human_prompt, system_prompt, response_cache)
+    mdl_answer = await mdl.apredict_messages(messages)
+
+    return mdl_answer if return_dict else mdl_answer.content
 
-    return final_answer
+async def _astream_chat_model(mdl, messages):
+    answer = ''
+    async for chunk in mdl.astream(messages):
+        answer += chunk.content
+        if chunk.content:
+            yield 'token', chunk.content
+    yield 'answer', answer
+
+async def astream_tutoring_answer(context, tutor_mdl, chat_template=None,
+                                  assessment_request=None,
+                                  learning_objectives=None,
+                                  input_kwargs=None,
+                                  response_cache=None):
+
+    tutor_mdl, tutor_inputs = _get_tutoring_call(context, tutor_mdl, chat_template, assessment_request,
+                                                 learning_objectives, input_kwargs, response_cache)
+    if isinstance(tutor_mdl, ChatOpenAI):
+        async for event in _astream_chat_model(tutor_mdl, tutor_inputs):
+            yield event
+        return
+
+    # run the chain as a task, passing its events back through a queue
+    events = asyncio.Queue()
+    handler = _StreamingHandler(events, wait_for_retrieval=hasattr(tutor_mdl, 'retriever'))
+
+    async def run_chain():
+        try:
+            answer = await tutor_mdl.acall(tutor_inputs, callbacks=[handler])
+            events.put_nowait(('answer', answer['answer']))
+        except Exception as e:
+            events.put_nowait(('error', e))
+
+    chain_task = asyncio.ensure_future(run_chain())
+    try:
+        while True:
+            kind, value = await events.get()
+            if kind == 'error':
+                raise value
+            yield kind, value
+            if kind == 'answer':
+                return
+    finally:
+        # if the caller stopped listening, stop the chain
+        chain_task.cancel()
+
+async def astream_direct_answer(mdl, human_prompt=' ', system_prompt=' ', response_cache=None):
+
+    mdl, messages = _get_direct_call(mdl, human_prompt, system_prompt, response_cache)
+    async for event in _astream_chat_model(mdl, messages):
+        yield event
+
+# %% ../nbs/prompt_interaction_base.ipynb 44
+DEFAULT_SINGLE_CALL_PROMPT_TEMPLATE = ("Continue the conversation below as the tutor, responding to the follow up message. Always keep in mind " +
+    "any overarching tasks (e.g., that 5 questions should be asked, until they have all been asked) and characteristics of the interaction. " +
+    "Base your response on the following extracted text from long documents: {context}" +
+    "\n\nChat History:\n{chat_history}\nFollow Up message: {question}\nResponse:")
+
+_QUERY_TOKEN_PATTERN = re.compile(r"[a-z][a-z'-]+")
+
+# common words which don't say anything about what to retrieve
+_QUERY_STOPWORDS = frozenset('''about above after again against all also and any are aren't because been before being below between both but
+can can't could did didn't does doesn't doing don't down during each few for from further had has have having her here hers herself him
+himself his how i'm i've into isn't it's its itself just let's more most mustn't myself nor not now off once only other our ours ourselves
+out over own same she should so some such than that that's the their theirs them themselves then there there's these they they're this
+those through too under until very was wasn't were what what's when where which while who whom why will with won't would you you're your
+yours yourself yourselves yes okay please thanks thank sure well think know really answer question questions right wrong correct'''.split())
+
+def _history_messages(chat_history):
+    # the text of each message of the conversation, oldest first
+    messages = []
+    for turn in chat_history:
+        if isinstance(turn, (tuple, list)):
+            messages.extend(turn)
+        else:
+            messages.append(turn.content)
+    return [message for message in messages if message]
+
+def build_retrieval_query(question, chat_history, n_recent_messages=4, n_key_terms=8):
+    question_terms = set(_QUERY_TOKEN_PATTERN.findall(question.lower()))
+    recent_messages = _history_messages(chat_history)[-n_recent_messages:] if n_recent_messages else []
+
+    # score terms by how often they appear, with more recent messages counting for more
+    term_scores = {}
+    for age, message in enumerate(reversed(recent_messages)):
+        for term in _QUERY_TOKEN_PATTERN.findall(message.lower()):
+            if len(term) > 2 and term not in _QUERY_STOPWORDS and term not in question_terms:
+                term_scores[term] = term_scores.get(term, 0) + 1 / (age + 1)
+
+    # sorting is stable, so ties keep the most recent term first
+    key_terms = sorted(term_scores, key=lambda term: -term_scores[term])[:n_key_terms]
+    return ' '.join([question] + key_terms)
+
+class SingleCallConversationalChain(ConversationalRetrievalChain):
+    question_generator: Optional[LLMChain] = None
+    n_recent_messages: int = 4
+    n_key_terms: int = 8
+
+    @classmethod
+    def from_llm(cls, llm, retriever, prompt=None, **kwargs):
+        if prompt is None:
+            prompt = create_base_tutoring_prompt(human_prompt=PromptTemplate.from_template(DEFAULT_SINGLE_CALL_PROMPT_TEMPLATE))
+        combine_docs_chain = StuffDocumentsChain(llm_chain=LLMChain(llm=llm, prompt=prompt), document_variable_name='context')
+        return cls(retriever=retriever, combine_docs_chain=combine_docs_chain, **kwargs)
+
+    def _prepare_inputs(self, inputs):
+        # the retrieval query, and the inputs of the answer prompt (with the chat history as text)
+        get_chat_history = self.get_chat_history or _get_chat_history
+        query = build_retrieval_query(inputs['question'], inputs['chat_history'], self.n_recent_messages, self.n_key_terms)
+        return query, {**inputs, 'chat_history': get_chat_history(inputs['chat_history'])}
+
+    def _prepare_output(self, query, docs, answer):
+        output = {self.output_key: answer}
+        if self.return_source_documents:
+            output['source_documents'] = docs
+        if self.return_generated_question:
+            output['generated_question'] = query
+        return output
+
+    def _call(self, inputs, run_manager=None):
+        _run_manager = run_manager or CallbackManagerForChainRun.get_noop_manager()
+        query, answer_inputs = self._prepare_inputs(inputs)
+        docs = self._get_docs(query, inputs, run_manager=_run_manager)
+
+        if self.response_if_no_docs_found is not None and len(docs) == 0:
+            answer = self.response_if_no_docs_found
+        else:
+            answer = self.combine_docs_chain.run(input_documents=docs, callbacks=_run_manager.get_child(), **answer_inputs)
+        return self._prepare_output(query, docs, answer)
+
+    async def _acall(self, inputs, run_manager=None):
+        _run_manager = run_manager or AsyncCallbackManagerForChainRun.get_noop_manager()
+        query, answer_inputs = self._prepare_inputs(inputs)
+        docs = await self._aget_docs(query, inputs, run_manager=_run_manager)
+
+        if self.response_if_no_docs_found is not None and len(docs) == 0:
+            answer = self.response_if_no_docs_found
+        else:
+            answer = await self.combine_docs_chain.arun(input_documents=docs, callbacks=_run_manager.get_child(), **answer_inputs)
+        return self._prepare_output(query, docs, answer)
 
-# %% ../nbs/prompt_interaction_base.ipynb 45
+# %% ../nbs/prompt_interaction_base.ipynb 72
 def update_conversation_history(chat_history, question, answer):
     chat_history.append((question, answer))
 
@@ -0,0 +1,71 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/result_storage.ipynb.
+
+# %% auto 0
+__all__ = ['DEFAULT_PARTITION_COLS', 'compact_dtypes', 'student_from_filename', 'conversation_to_df', 'save_as_parquet',
+           'save_to_parquet_dataset', 'load_parquet_dataset_as_df']
+
+# %% ../nbs/result_storage.ipynb 3
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# %% ../nbs/result_storage.ipynb 6
+_CATEGORICAL_COLS = ['author', 'filename', 'graded_by', 'course', 'assignment', 'student']
+
+def compact_dtypes(df):
+    df = df.copy()
+    if 'timestamp' in df:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', utc=True, format='mixed')
+    for col in _CATEGORICAL_COLS:
+        if col in df:
+            df[col] = df[col].astype('category')
+    return df
+
+def student_from_filename(filenames):
+    # the name of the file without its directories or extension
+    return filenames.astype(str).str.replace(r'^.*[/\\]', '', regex=True).str.replace(r'\.json$', '', regex=True)
+
+def conversation_to_df(conversation_memory):
+    # one row per message; replies still being written are left out
+    turns = pd.DataFrame([list(turn) for turn in conversation_memory], columns=['user', 'assistant'])
+    df = turns.melt(ignore_index=False, var_name='author', value_name='message').dropna(subset=['message'])
+    df = df.rename_axis('turn').reset_index().sort_values(['turn', 'author'], ascending=[True, False], kind='stable')
+    return df.reset_index(drop=True)
+
+def save_as_parquet(df, file_name):
+    compact_dtypes(df).to_parquet(file_name, index=False)
+
+# %% ../nbs/result_storage.ipynb 10
+DEFAULT_PARTITION_COLS = ['course', 'assignment']
+
+def _partitioning(partition_cols):
+    return ds.partitioning(pa.schema([(col, pa.string()) for col in partition_cols]), flavor='hive')
+
+def save_to_parquet_dataset(df, root_path, course, assignment, partition_cols=DEFAULT_PARTITION_COLS):
+    df = df.assign(course=course, assignment=assignment)
+    if 'student' not in df:
+        df['student'] = student_from_filename(df['filename'])
+    df = compact_dtypes(df.sort_values('student', kind='stable'))
+
+    # directory names are written as text
+    for col in partition_cols:
+        df[col] = df[col].astype(str)
+
+    # replace whatever was saved for the same partitions before
+    ds.write_dataset(pa.Table.from_pandas(df, preserve_index=False), root_path, format='parquet',
+                     partitioning=_partitioning(partition_cols), existing_data_behavior='delete_matching',
+                     basename_template='part-' + uuid.uuid4().hex + '-{i}.parquet')
+
+def load_parquet_dataset_as_df(root_path, filters=None, columns=None, partition_cols=DEFAULT_PARTITION_COLS):
+    dataset = ds.dataset(root_path, format='parquet', partitioning=_partitioning(partition_cols))
+    if isinstance(filters, list):
+        filters = pq.filters_to_expression(filters)
+
+    df_out = dataset.to_table(columns=columns, filter=filters).to_pandas()
+    for col in partition_cols:
+        if col in df_out:
+            df_out[col] = df_out[col].astype('category')
+    return df_out
@@ -1,9 +1,10 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/base_gradio_selfstudy.ipynb.
 
 # %% auto 0
-__all__ = ['save_pdf', 'save_json', 'save_txt', 'save_csv', 'num_sources', 'gr_study_tutor_theme', 'css', 'save_chatbot_dialogue',
-           'SlightlyDelusionalTutor', 'embed_key', 'initialize_basic_model', 'create_reference_store', 'prompt_select',
-           'add_user_message', 'get_tutor_reply', 'disable_until_done']
+__all__ = ['save_pdf', 'save_json', 'save_txt', 'save_csv', 'save_parquet', 'QUEUE_CONCURRENCY_COUNT', 'num_sources',
+           'gr_study_tutor_theme', 'css', 'save_chatbot_dialogue', 'SlightlyDelusionalTutor', 'embed_key',
+           'initialize_basic_model', 'create_reference_store', 'create_reference_store_from_snapshot', 'prompt_select',
+           'add_user_message', 'get_tutor_reply', 'stop_tutor_reply', 'disable_until_done']
 
 # %% ../nbs/base_gradio_selfstudy.ipynb 9
 import gradio as gr
@@ -12,8 +13,14 @@ import pandas as pd
 import os
 
 from .PromptInteractionBase import *
+from .ConversationMemory import *
+from .ModelClients import *
 from .SelfStudyPrompts import *
 from .MediaVectorStores import *
+from .VectorIndexes import *
+from .ResultStorage import *
+from langchain.embeddings import OpenAIEmbeddings
+from langchain.retrievers import EnsembleRetriever
 
 # %% ../nbs/base_gradio_selfstudy.ipynb 13
 def save_chatbot_dialogue(chat_tutor, save_type):
@@ -26,6 +33,8 @@ def save_chatbot_dialogue(chat_tutor, save_type):
         formatted_convo.to_csv(output_fname, index=False)
     elif save_type == 'json':
         formatted_convo.to_json(output_fname, orient='records')
+    elif save_type == 'parquet':
+        save_as_parquet(conversation_to_df(chat_tutor.conversation_memory), output_fname)
     elif save_type == 'txt':
         temp = formatted_convo.apply(lambda x: 'User: {0}\nAI: {1}'.format(x[0], x[1]), axis=1)
         temp = '\n\n'.join(temp.tolist())
@@ -40,12 +49,12 @@ save_pdf = partial(save_chatbot_dialogue, save_type='pdf')
 save_json = partial(save_chatbot_dialogue, save_type='json')
 save_txt = partial(save_chatbot_dialogue, save_type='txt')
 save_csv = partial(save_chatbot_dialogue, save_type='csv')
-
+save_parquet = partial(save_chatbot_dialogue, save_type='parquet')
 
 # %% ../nbs/base_gradio_selfstudy.ipynb 16
 class SlightlyDelusionalTutor:
     # create basic initialization function
-    def __init__(self, model_name = None):
+    def __init__(self, model_name = None, memory_settings = None, chain_kind = 'conversational'):
 
         # create default model name
         if model_name is None:
@@ -55,14 +64,32 @@ class SlightlyDelusionalTutor:
         self.tutor_chain = None
         self.vector_store = None
         self.vs_retriever = None
+        self.reference_store = None
+        self.shared_index_key = None
+        self.shared_text_key = None
         self.conversation_memory = []
         self.sources_memory = []
-        self.flattened_conversation = ''
+        self.flattened_parts = []
+        self.memory_settings = memory_settings if memory_settings is not None else {}
+        self.chat_memory = None
+        self.chain_kind = chain_kind
+        self.streaming_reply = None
+        self.streaming_sources = None
         self.api_key_valid = False
         self.learning_objectives = None
         self.openai_auth = ''
         self.system_message = ''
     
+    @property
+    def flattened_conversation(self):
+        return ''.join(self.flattened_parts)
+
+    def get_chat_memory(self):
+        # created on first use, since each session's tutor is a copy of the app's initial one
+        if self.chat_memory is None:
+            self.chat_memory = ConversationMemory(**{'summary_mdl': self.chat_llm, **self.memory_settings})
+        return self.chat_memory
+
     def set_system_message(self, message):
         self.system_message = message
     
@@ -70,10 +97,7 @@ class SlightlyDelusionalTutor:
         if not openai_api_key:
             return None
         
-        # Otherwise, update key
-        os.environ["OPENAI_API_KEY"] = openai_api_key
-        
-        #update tutor
+        # Otherwise, update key (only for this tutor, since each session can have its own)
         self.openai_auth = openai_api_key
 
         if not self.api_key_valid:
@@ -83,7 +107,8 @@ class SlightlyDelusionalTutor:
 
         if self.openai_auth:
             try:
-                self.chat_llm = create_model(self.model_name, openai_api_key = self.openai_auth)
+                self.chat_llm = create_model(self.model_name, openai_api_key = self.openai_auth, response_cache=get_response_cache(), streaming=True,
+                                             client_pool=get_client_pool())
                 self.api_key_valid = True
             except Exception as e:
                 print(e)
@@ -110,57 +135,156 @@ class SlightlyDelusionalTutor:
             self.tutor_chain = self.chat_llm
         
     def add_user_message(self, user_message):
+        # a reply which was stopped before it finished is kept as it was
+        self.finish_reply()
         self.conversation_memory.append([user_message, None])
-        self.flattened_conversation = self.flattened_conversation + '\n\n' + 'User: ' + user_message
+        self.flattened_parts.append('\n\n' + 'User: ' + user_message)
     
     def _update_chat_history(self, tutor_message):
         self.conversation_memory[-1] = (self.conversation_memory[-1][0], tutor_message['answer'])
-        self.flattened_conversation = self.flattened_conversation + '\nAI: ' + tutor_message['answer']
+        self.flattened_parts.append('\nAI: ' + tutor_message['answer'])
         self.sources_memory.append(tutor_message['source_documents'])
+        self.get_chat_memory().add_turn(self.conversation_memory[-1][0], tutor_message['answer'])
+
+    def _update_direct_history(self, tutor_message):
+        self.conversation_memory[-1][1] = tutor_message
+        self.flattened_parts.append('\nAI: ' + tutor_message)
+        self.get_chat_memory().add_turn(self.conversation_memory[-1][0], tutor_message)
+
+    def _start_reply(self, with_sources):
+        self.streaming_reply = ''
+        self.streaming_sources = [] if with_sources else None
+        return self.conversation_memory[-1]
+
+    def _add_reply_event(self, entry, kind, value):
+        # show the reply in the conversation as it arrives
+        if kind == 'sources':
+            self.streaming_sources = value
+        elif kind == 'token':
+            self.streaming_reply += value
+        else:
+            self.streaming_reply = value
+        entry[1] = self.streaming_reply
+
+    def _end_reply(self, entry):
+        # record the reply, complete or not, unless the student has already moved on
+        if self.conversation_memory and self.conversation_memory[-1] is entry:
+            self.finish_reply()
+
+    def _stream_reply(self, events, with_sources):
+        entry = self._start_reply(with_sources)
+        try:
+            for kind, value in events:
+                self._add_reply_event(entry, kind, value)
+                yield kind
+        finally:
+            events.close()
+            self._end_reply(entry)
+
+    async def _astream_reply(self, events, with_sources):
+        entry = self._start_reply(with_sources)
+        try:
+            async for kind, value in events:
+                self._add_reply_event(entry, kind, value)
+                yield kind
+        finally:
+            await events.aclose()
+            self._end_reply(entry)
+
+    def finish_reply(self):
+        if self.streaming_reply is None:
+            return
+
+        tutor_message = {'answer': self.streaming_reply, 'source_documents': self.streaming_sources}
+        with_sources = self.streaming_sources is not None
+        self.streaming_reply = None
+        self.streaming_sources = None
+        if with_sources:
+            self._update_chat_history(tutor_message)
+        else:
+            self._update_direct_history(tutor_message['answer'])
 
-    def get_direct_tutor_reply(self):
+    def _direct_request(self):
+        message_with_history = self.conversation_memory[-1][0] + '\n\n\n So far, our conversation has been: \n' + self.get_chat_memory().as_text()
+        request = {'mdl': self.tutor_chain, 'human_prompt': message_with_history}
+        if self.system_message:
+            request['system_prompt'] = self.system_message
+        return request
+
+    def get_direct_tutor_reply(self, stream=False):
         if not self.conversation_memory:
-            return "Please type something to start the conversation."
-        
+            return iter(()) if stream else "Please type something to start the conversation."
+
         # get answer
-        message_with_history = self.conversation_memory[-1][0] + '\n\n\n So far, our conversation has been: \n'
-        if self.system_message:
-            tutor_message = get_direct_answer(self.tutor_chain, human_prompt=message_with_history, system_prompt = self.system_message)
-        else:
-            tutor_message = get_direct_answer(self.tutor_chain, human_prompt=message_with_history)
+        if stream:
+            return self._stream_reply(stream_direct_answer(**self._direct_request()), with_sources=False)
+        tutor_message = get_direct_answer(**self._direct_request())
 
         # add tutor message to conversation memory
-        self.conversation_memory[-1][1] = tutor_message
-        self.flattened_conversation = self.flattened_conversation + '\nAI: ' + tutor_message
-
-    def get_tutor_reply(self, **input_kwargs):
+        self._update_direct_history(tutor_message)
 
+    async def aget_direct_tutor_reply(self):
         if not self.conversation_memory:
             return "Please type something to start the conversation."
 
+        tutor_message = await aget_direct_answer(**self._direct_request())
+        self._update_direct_history(tutor_message)
+
+    async def astream_direct_tutor_reply(self):
+        if not self.conversation_memory:
+            return
+
+        async for kind in self._astream_reply(astream_direct_answer(**self._direct_request()), with_sources=False):
+            yield kind
+
+    def _tutoring_request(self, input_kwargs):
         # if this is the first interaction, then we need to use the full prompt
         if len(self.conversation_memory) <= 1:
             input_kwargs['chat_history'] = []
             input_kwargs['question'] = ''
         else:
-            input_kwargs['chat_history'] = self.conversation_memory[:-1]
+            # the recent turns and a summary of older ones, within the memory's token budget
+            input_kwargs['chat_history'] = self.get_chat_memory().chat_history()
             input_kwargs['question'] = self.conversation_memory[-1][0]
 
-        tutor_message = get_tutoring_answer('See provided documents and question for more information.',
-                                     self.tutor_chain,
-                                     assessment_request = self.conversation_memory[-1][0], #this will not be used after the first interaction
-                                     learning_objectives = self.learning_objectives,
-                                     return_dict=True,
-                                     input_kwargs=input_kwargs)
+        return {'context': 'See provided documents and question for more information.',
+                'tutor_mdl': self.tutor_chain,
+                'assessment_request': self.conversation_memory[-1][0], #this will not be used after the first interaction
+                'learning_objectives': self.learning_objectives,
+                'input_kwargs': input_kwargs}
+
+    def get_tutor_reply(self, stream=False, **input_kwargs):
+
+        if not self.conversation_memory:
+            return iter(()) if stream else "Please type something to start the conversation."
+
+        if stream:
+            return self._stream_reply(stream_tutoring_answer(**self._tutoring_request(input_kwargs)), with_sources=True)
+
+        tutor_message = get_tutoring_answer(**self._tutoring_request(input_kwargs), return_dict=True)
 
         # add tutor message to conversation memory
         self._update_chat_history(tutor_message)
-        
+
         #print(self.flattened_conversation, '\n\n')
-    
+
+    async def aget_tutor_reply(self, **input_kwargs):
+        if not self.conversation_memory:
+            return "Please type something to start the conversation."
+
+        tutor_message = await aget_tutoring_answer(**self._tutoring_request(input_kwargs), return_dict=True)
+        self._update_chat_history(tutor_message)
+
+    async def astream_tutor_reply(self, **input_kwargs):
+        if not self.conversation_memory:
+            return
+
+        async for kind in self._astream_reply(astream_tutoring_answer(**self._tutoring_request(input_kwargs)), with_sources=True):
+            yield kind
+
     def get_sources_memory(self):
-        # retrieve last source
-        last_sources = self.sources_memory[-1]
+        # retrieve last source (or those of the reply being streamed)
+        last_sources = self.streaming_sources if self.streaming_sources is not None else self.sources_memory[-1]
 
         # get page_content keyword from last_sources
         doc_contents = ['Source ' + str(ind+1) + '\n"' + doc.page_content + '"\n\n' for ind, doc in enumerate(last_sources)]
@@ -171,7 +295,11 @@ class SlightlyDelusionalTutor:
     def forget_conversation(self):
         self.conversation_memory = []
         self.sources_memory = []
-        self.flattened_conversation = ''
+        self.flattened_parts = []
+        if self.chat_memory is not None:
+            self.chat_memory.clear()
+        self.streaming_reply = None
+        self.streaming_sources = None
 
 # %% ../nbs/base_gradio_selfstudy.ipynb 18
 def embed_key(openai_api_key, chat_tutor):
@@ -185,10 +313,27 @@ def initialize_basic_model(chat_tutor, openai_auth=None, **mdl_chain_kwargs):
     return chat_tutor
 
 # %% ../nbs/base_gradio_selfstudy.ipynb 21
-def create_reference_store(chat_tutor, vs_button, text_cp, upload_files, reference_vs, openai_auth, learning_objs):
+def _initialize_reference_tutor(chat_tutor, vs_db, vs_retriever, openai_auth, learning_objs):
+    # store learning objectives
+    chat_tutor.learning_objectives = learning_objs
+
+    # update tutor with the vector store, caching retrieval results across sessions
+    vs_retriever = CachedRetriever(retriever=vs_retriever, cache=get_retrieval_cache())
+    chat_tutor.vector_store = vs_db
+    chat_tutor.vs_retriever = vs_retriever
+
+    # create the tutor chain
+    return initialize_basic_model(chat_tutor,
+                                  openai_auth=openai_auth,
+                                  kind=chat_tutor.chain_kind,
+                                  mdl=chat_tutor.chat_llm,
+                                  retriever = vs_retriever,
+                                  return_source_documents=True)
 
-    text_segs = []
-    upload_segs = []
+def create_reference_store(chat_tutor, vs_button, text_cp, upload_files, reference_vs, openai_auth, learning_objs, dedup_threshold=None):
+
+    text_sources = {}
+    upload_fnames = []
 
     print('I just got called.')
     
@@ -196,33 +341,73 @@ def create_reference_store(chat_tutor, vs_button, text_cp, upload_files, referen
         raise NotImplementedError("Reference Vector Stores are not yet implemented")
     
     if text_cp.strip():
-        text_segs = get_document_segments(text_cp, 'text', chunk_size=700, chunk_overlap=100)
-        [doc.metadata.update({'source':'text box'}) for doc in text_segs];
+        text_sources = {'text box': text_cp}
     
     if upload_files:
         upload_fnames = [f.name for f in upload_files]
-        upload_segs = get_document_segments(upload_fnames, 'file', chunk_size=700, chunk_overlap=100)
     
-    # get the full list of everything
-    all_segs = text_segs + upload_segs
-
-    # store learning objectives
-    chat_tutor.learning_objectives = learning_objs
+    # keep the tutor's store between calls so that only new, changed, or removed sources are (re)embedded
+    if chat_tutor.reference_store is None:
+        embeddings = OpenAIEmbeddings(openai_api_key=chat_tutor.openai_auth or openai_auth or None)
+        chat_tutor.reference_store = IncrementalReferenceStore(embeddings=embeddings, embedding_cache=get_embedding_cache(), chunk_size=700, chunk_overlap=100,
+                                                               dedup_threshold=dedup_threshold)
+    changes = chat_tutor.reference_store.sync(texts=text_sources, files=upload_fnames)
+    print(f"Sources added: {changes['added']}, updated: {changes['updated']}, removed: {changes['removed']} "
+          f"({changes['n_segments_added']} segments added, {changes['n_segments_removed']} removed, {changes['n_duplicates']} duplicates skipped)")
+    for file_error in changes['errors']:
+        gr.Warning(f"Could not load {os.path.basename(file_error[0])}: {file_error[1]}")
+
+    # update tutor with the vector store, retrieving with both the vector store and a lexical index
+    vs_db = chat_tutor.reference_store.vector_store
+    vs_retriever = chat_tutor.reference_store.as_retriever(search_kwargs={"k": 2})
+    chat_tutor = _initialize_reference_tutor(chat_tutor, vs_db, vs_retriever, openai_auth, learning_objs)
 
-    # create the vector store and update tutor
-    vs_db, vs_retriever = create_local_vector_store(all_segs, search_kwargs={"k": 2})
-    chat_tutor.vector_store = vs_db
-    chat_tutor.vs_retriever = vs_retriever
+    # return the story
+    return chat_tutor, gr.update(interactive=True, value='Tutor Initialized!')
 
-    # create the tutor chain
-    chat_tutor = initialize_basic_model(chat_tutor,
-                                        openai_auth=openai_auth,
-                                        kind="conversational",
-                                        mdl=chat_tutor.chat_llm,
-                                        retriever = vs_retriever,
-                                        return_source_documents=True)
+def _acquire_shared_index(chat_tutor, key, load_fcn):
+    # a read-only store and a lexical index over its segments, shared by every session through the registry
+    registry = get_vector_store_registry()
+    shared_db = registry.acquire(key, load_fcn, owner=chat_tutor)
+    shared_lexical_index = registry.acquire(key + '::bm25', partial(BM25Index.from_texts, shared_db.texts, shared_db.metadatas, shared_db.ids), owner=chat_tutor)
+    return shared_db, shared_lexical_index
+
+def _release_shared_index(chat_tutor, key):
+    registry = get_vector_store_registry()
+    registry.release(key, owner=chat_tutor)
+    registry.release(key + '::bm25', owner=chat_tutor)
+
+def _create_text_store(text, embeddings, chunk_size=700, chunk_overlap=100):
+    segments = rawtext_to_doc_split(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    [doc.metadata.update({'source': 'text box'}) for doc in segments];
+    return NumpyVectorStore.from_documents(segments, embeddings)
+
+def create_reference_store_from_snapshot(chat_tutor, vs_button, text_cp, snapshot_file, openai_auth, learning_objs, corpus_hash=None):
+    snapshot_path = getattr(snapshot_file, 'name', snapshot_file)
+
+    # every session using the same corpus shares one index from the registry
+    fingerprint = read_snapshot_header(snapshot_path)['corpus_hash'] or f'{os.path.abspath(snapshot_path)}:{os.path.getmtime(snapshot_path)}'
+    if chat_tutor.shared_index_key is not None and chat_tutor.shared_index_key != fingerprint:
+        _release_shared_index(chat_tutor, chat_tutor.shared_index_key)
+    shared_db, shared_lexical_index = _acquire_shared_index(chat_tutor, fingerprint, partial(load_vector_snapshot, snapshot_path, None, corpus_hash=corpus_hash))
+    chat_tutor.shared_index_key = fingerprint
+
+    # only the student's questions need embedding; the segments' embeddings come from the snapshot
+    embeddings = CachedEmbeddings(OpenAIEmbeddings(openai_api_key=openai_auth or None), get_embedding_cache())
+    vs_db = shared_db.shared_view(embeddings)
+    vs_retriever = HybridRetriever(vector_store=vs_db, lexical_index=shared_lexical_index, search_kwargs={"k": 2})
+
+    # text from the instructor (e.g., a secret prompt) is the same for every session of an app, so its small index is shared too, by the text's hash
+    text_key = 'text::' + EmbeddingCache.hash_text(text_cp) if text_cp and text_cp.strip() else None
+    if chat_tutor.shared_text_key is not None and chat_tutor.shared_text_key != text_key:
+        _release_shared_index(chat_tutor, chat_tutor.shared_text_key)
+    if text_key is not None:
+        text_db, text_lexical_index = _acquire_shared_index(chat_tutor, text_key, partial(_create_text_store, text_cp, embeddings))
+        text_retriever = HybridRetriever(vector_store=text_db.shared_view(embeddings), lexical_index=text_lexical_index, search_kwargs={"k": 1})
+        vs_retriever = EnsembleRetriever(retrievers=[vs_retriever, text_retriever])
+    chat_tutor.shared_text_key = text_key
+    chat_tutor = _initialize_reference_tutor(chat_tutor, vs_db, vs_retriever, openai_auth, learning_objs)
 
-    # return the story
     return chat_tutor, gr.update(interactive=True, value='Tutor Initialized!')
 
 # %% ../nbs/base_gradio_selfstudy.ipynb 27
@@ -250,9 +435,20 @@ def add_user_message(user_message, chat_tutor):
   chat_tutor.add_user_message(user_message)
   return gr.update(value="", interactive=False), chat_tutor.conversation_memory, chat_tutor
 
-def get_tutor_reply(chat_tutor):
-  chat_tutor.get_tutor_reply()
-  return gr.update(value="", interactive=True), gr.update(visible=True, value=chat_tutor.get_sources_memory()), chat_tutor.conversation_memory, chat_tutor
+async def get_tutor_reply(chat_tutor):
+  # stream the reply into the chatbot, showing the sources as soon as they're retrieved
+  async for event in chat_tutor.astream_tutor_reply():
+    sources_update = gr.update(visible=True, value=chat_tutor.get_sources_memory()) if event == 'sources' else gr.update()
+    yield gr.update(value="", interactive=False), sources_update, chat_tutor.conversation_memory, chat_tutor
+  yield gr.update(value="", interactive=True), gr.update(visible=True, value=chat_tutor.get_sources_memory()), chat_tutor.conversation_memory, chat_tutor
+
+def stop_tutor_reply(chat_tutor):
+  # keep what the tutor has said so far and let the user continue
+  chat_tutor.finish_reply()
+  return gr.update(interactive=True), chat_tutor.conversation_memory, chat_tutor
+
+# the number of events each app's queue runs at once; the chat callbacks are async, so this isn't limited by threads
+QUEUE_CONCURRENCY_COUNT = 200
 
 num_sources = 2
 
@@ -375,6 +571,7 @@ with gr.Blocks(css=css, analytics_enabled=False, theme=gr_study_tutor_theme) as
         with gr.Row():
           user_chat_input = gr.Textbox(label="User input", scale=9)
           user_chat_submit = gr.Button("Ask/answer model", scale=1)
+          user_chat_stop = gr.Button("Stop", scale=1)
 
       # sources
       with gr.Box(elem_id="sources-container", scale=1):
@@ -393,7 +590,7 @@ with gr.Blocks(css=css, analytics_enabled=False, theme=gr_study_tutor_theme) as
 
   # Display input and output in three-ish parts
   # (using asynchronous functions):
-  # First show user input, then show model output when complete
+  # First show user input, then stream the model output as it arrives
   # Then wait until the bot provides response and return the result
   # Finally, allow the user to ask a new question by reenabling input
   async_response = user_chat_submit.click(add_user_message,
@@ -406,6 +603,9 @@ with gr.Blocks(css=css, analytics_enabled=False, theme=gr_study_tutor_theme) as
             [user_chat_input, chatbot, study_tutor], queue=False) \
   .then(get_tutor_reply, [study_tutor], [user_chat_input, sources_output, chatbot, study_tutor], queue=True)
 
+  user_chat_stop.click(stop_tutor_reply, [study_tutor], [user_chat_input, chatbot, study_tutor],
+                       cancels=[async_response, async_response_b], queue=False)
+
   with gr.Box():
     gr.Markdown("""
     ## Export Your Chat History
@@ -424,4 +624,3 @@ with gr.Blocks(css=css, analytics_enabled=False, theme=gr_study_tutor_theme) as
     export_dialogue_button_pdf.click(save_pdf, study_tutor, file_download, show_progress=True)
     export_dialogue_button_txt.click(save_txt, study_tutor, file_download, show_progress=True)
     export_dialogue_button_csv.click(save_csv, study_tutor, file_download, show_progress=True)
-
@@ -0,0 +1,866 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/vector_indexes.ipynb.
+
+# %% auto 0
+__all__ = ['SNAPSHOT_FORMAT_VERSION', 'NumpyVectorStore', 'save_vector_snapshot', 'read_snapshot_header', 'is_snapshot_current',
+           'load_vector_snapshot', 'HNSWVectorStore', 'VectorStoreRegistry', 'get_vector_store_registry', 'BM25Index',
+           'HybridRetriever', 'retriever_fingerprint', 'RetrievalCache', 'CachedRetriever', 'get_retrieval_cache']
+
+# %% ../nbs/vector_indexes.ipynb 3
+import os
+import re
+import json
+import hashlib
+import struct
+import uuid
+import time
+import threading
+import weakref
+from collections import OrderedDict, Counter
+from concurrent.futures import Future
+
+import numpy as np
+
+from langchain.docstore.document import Document
+from langchain.pydantic_v1 import Field
+from langchain.schema import BaseRetriever
+from langchain.retrievers import EnsembleRetriever
+from langchain.vectorstores.base import VectorStore
+from langchain.vectorstores.utils import maximal_marginal_relevance
+
+# %% ../nbs/vector_indexes.ipynb 6
+def _normalize_rows(vectors):
+    vectors = np.ascontiguousarray(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+_CONTENT_HASH_MODULUS = 1 << 256
+
+def _segments_hash(texts, metadatas):
+    # an index's content hash is the sum of its segments' hashes, so it doesn't depend on their order and is updated as they're added and deleted
+    return sum(int.from_bytes(hashlib.sha256(json.dumps([text, meta], sort_keys=True, default=str).encode('utf-8')).digest(), 'big')
+               for text, meta in zip(texts, metadatas))
+
+class NumpyVectorStore(VectorStore):
+    def __init__(self, embedding, initial_capacity=256):
+        self._embedding = embedding
+        self._matrix = None
+        self._initial_capacity = initial_capacity
+        self.n_vectors = 0
+        self.texts = []
+        self.metadatas = []
+        self.ids = []
+        self.read_only = False
+        # identifies the contents for caches: stores with the same segments have the same content hash, and the version changes with every update
+        self.content_hash = 0
+        self.version = 0
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    @property
+    def vectors(self):
+        # view of the filled rows of the matrix
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[:self.n_vectors]
+
+    @property
+    def nbytes(self):
+        return self.vectors.nbytes + sum(len(text) for text in self.texts)
+
+    def _reserve(self, n_new, dim):
+        if self._matrix is None:
+            self._matrix = np.empty((max(self._initial_capacity, n_new), dim), dtype=np.float32)
+        elif self.n_vectors + n_new > self._matrix.shape[0]:
+            # double the capacity so that repeated adds are amortized
+            new_capacity = max(2*self._matrix.shape[0], self.n_vectors + n_new)
+            new_matrix = np.empty((new_capacity, dim), dtype=np.float32)
+            new_matrix[:self.n_vectors] = self._matrix[:self.n_vectors]
+            self._matrix = new_matrix
+
+    def _check_writable(self):
+        if self.read_only:
+            raise ValueError("This vector store is shared and read-only")
+
+    def add_vectors(self, vectors, texts, metadatas=None, ids=None):
+        self._check_writable()
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = _normalize_rows(vectors)
+        metadatas = [dict(meta) for meta in metadatas] if metadatas is not None else [{} for _ in texts]
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in texts]
+
+        self._reserve(len(texts), vectors.shape[1])
+        self._matrix[self.n_vectors:self.n_vectors + len(texts)] = vectors
+        self.n_vectors += len(texts)
+        self.texts.extend(texts)
+        self.metadatas.extend(metadatas)
+        self.ids.extend(ids)
+        self.content_hash = (self.content_hash + _segments_hash(texts, metadatas)) % _CONTENT_HASH_MODULUS
+        self.version += 1
+
+        return ids
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_vectors(self._embedding.embed_documents(texts), texts, metadatas, ids)
+
+    def delete(self, ids=None, **kwargs):
+        if ids is None:
+            return False
+        self._check_writable()
+        ids_to_delete = set(ids)
+        keep = np.array([doc_id not in ids_to_delete for doc_id in self.ids], dtype=bool)
+        deleted_rows = np.flatnonzero(~keep)
+        self.content_hash = (self.content_hash - _segments_hash([self.texts[row] for row in deleted_rows], [self.metadatas[row] for row in deleted_rows])) % _CONTENT_HASH_MODULUS
+
+        # compact the kept rows to the front of the matrix
+        n_keep = int(keep.sum())
+        if self._matrix is not None:
+            if not self._matrix.flags.writeable:
+                # stores loaded from a snapshot are read-only memory maps; copy on first write
+                self._matrix = np.array(self._matrix)
+            self._matrix[:n_keep] = self.vectors[keep]
+        self.n_vectors = n_keep
+        self.texts = [text for text, kept in zip(self.texts, keep) if kept]
+        self.metadatas = [meta for meta, kept in zip(self.metadatas, keep) if kept]
+        self.ids = [doc_id for doc_id, kept in zip(self.ids, keep) if kept]
+        self.version += 1
+
+        return True
+
+    def _make_document(self, row):
+        return Document(page_content=self.texts[row], metadata=dict(self.metadatas[row]))
+
+    def _top_k(self, query_vectors, k):
+        # scores for every query against every stored vector in one matrix product
+        scores = _normalize_rows(query_vectors) @ self.vectors.T
+        k = min(k, self.n_vectors)
+        if k == 0:
+            return np.empty((scores.shape[0], 0), dtype=int), np.empty((scores.shape[0], 0), dtype=np.float32)
+
+        if k < self.n_vectors:
+            top_rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top_rows = np.tile(np.arange(self.n_vectors), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top_rows, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+
+        return np.take_along_axis(top_rows, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def similarity_search_with_score_by_vector_batch(self, query_vectors, k=4):
+        if self.n_vectors == 0:
+            return [[] for _ in range(len(query_vectors))]
+
+        top_rows, top_scores = self._top_k(query_vectors, k)
+        return [[(self._make_document(row), float(score)) for row, score in zip(rows, scores)]
+                for rows, scores in zip(top_rows, top_scores)]
+
+    def similarity_search_batch(self, queries, k=4):
+        query_vectors = [self._embedding.embed_query(query) for query in queries]
+        return [[doc for doc, _ in results] for results in self.similarity_search_with_score_by_vector_batch(query_vectors, k)]
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector_batch([embedding], k)[0]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k)
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        # map cosine similarity in [-1, 1] to a relevance score in [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    def max_marginal_relevance_search_by_vector(self, embedding, k=4, fetch_k=20, lambda_mult=0.5, **kwargs):
+        if self.n_vectors == 0:
+            return []
+        top_rows, _ = self._top_k([embedding], fetch_k)
+        candidate_rows = top_rows[0]
+        selected = maximal_marginal_relevance(np.asarray(embedding, dtype=np.float32), self.vectors[candidate_rows],
+                                              lambda_mult=lambda_mult, k=k)
+        return [self._make_document(candidate_rows[ind]) for ind in selected]
+
+    def max_marginal_relevance_search(self, query, k=4, fetch_k=20, lambda_mult=0.5, **kwargs):
+        return self.max_marginal_relevance_search_by_vector(self._embedding.embed_query(query), k, fetch_k, lambda_mult)
+
+    @classmethod
+    def from_vectors(cls, embedding, vectors, texts, metadatas=None, ids=None, normalized=False, **kwargs):
+        store = cls(embedding, **kwargs)
+        texts = list(texts)
+        if not normalized:
+            store.add_vectors(vectors, texts, metadatas, ids)
+            return store
+
+        # already normalized vectors (e.g. a memory mapped snapshot) are used as-is without a copy
+        store._matrix = vectors
+        store.n_vectors = len(texts)
+        store.texts = texts
+        store.metadatas = [dict(meta) for meta in metadatas] if metadatas is not None else [{} for _ in texts]
+        store.ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        store.content_hash = _segments_hash(store.texts, store.metadatas) % _CONTENT_HASH_MODULUS
+        return store
+
+    def shared_view(self, embedding=None):
+        # a read-only store sharing this one's vectors and segments, with its own query embedding model
+        view = type(self)(embedding if embedding is not None else self._embedding)
+        view._matrix = self._matrix
+        view.n_vectors = self.n_vectors
+        view.texts = self.texts
+        view.metadatas = self.metadatas
+        view.ids = self.ids
+        view.content_hash = self.content_hash
+        view.version = self.version
+        view.read_only = True
+        return view
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, **kwargs):
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+# %% ../nbs/vector_indexes.ipynb 12
+SNAPSHOT_FORMAT_VERSION = 1
+_SNAPSHOT_MAGIC = b'AICSVEC\x00'
+_SNAPSHOT_ALIGNMENT = 64
+
+def _snapshot_data_offset(header_len):
+    prefix_len = len(_SNAPSHOT_MAGIC) + 8 + header_len
+    return -(-prefix_len // _SNAPSHOT_ALIGNMENT) * _SNAPSHOT_ALIGNMENT
+
+def _snapshot_index_path(snapshot_path):
+    return snapshot_path + '.index'
+
+def save_vector_snapshot(vector_store, snapshot_path, corpus_hash=None, embedding_model=None):
+    vectors = np.ascontiguousarray(vector_store.vectors, dtype=np.float32)
+    n_vectors = vector_store.n_vectors
+    header = {'format_version': SNAPSHOT_FORMAT_VERSION,
+              'corpus_hash': corpus_hash,
+              'embedding_model': embedding_model,
+              'n_vectors': n_vectors,
+              'dim': int(vectors.shape[1]) if n_vectors else 0,
+              'segments': [{'id': doc_id, 'text': text, 'metadata': meta}
+                           for doc_id, text, meta in zip(vector_store.ids, vector_store.texts, vector_store.metadatas)]}
+    # stores with their own search structure (e.g. an HNSW graph) save it next to the snapshot
+    index_path = _snapshot_index_path(snapshot_path)
+    if hasattr(vector_store, 'save_index'):
+        header['index'] = vector_store.save_index(index_path + '.tmp')
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_offset = _snapshot_data_offset(len(header_bytes))
+
+    # write to a temporary file first so a crash never leaves a half-written snapshot behind
+    tmp_path = snapshot_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_SNAPSHOT_MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\x00' * (data_offset - f.tell()))
+        f.write(vectors.tobytes())
+    if os.path.exists(index_path + '.tmp'):
+        os.replace(index_path + '.tmp', index_path)
+    os.replace(tmp_path, snapshot_path)
+
+    return snapshot_path
+
+def read_snapshot_header(snapshot_path):
+    with open(snapshot_path, 'rb') as f:
+        if f.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+            raise ValueError(f"{snapshot_path} is not a vector store snapshot")
+        header_len = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    header['data_offset'] = _snapshot_data_offset(header_len)
+
+    return header
+
+def is_snapshot_current(snapshot_path, corpus_hash):
+    try:
+        header = read_snapshot_header(snapshot_path)
+    except (OSError, ValueError):
+        return False
+    return header['format_version'] == SNAPSHOT_FORMAT_VERSION and header['corpus_hash'] == corpus_hash
+
+def load_vector_snapshot(snapshot_path, embedding, corpus_hash=None, mmap=True, **store_kwargs):
+    header = read_snapshot_header(snapshot_path)
+    if header['format_version'] != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Snapshot format version {header['format_version']} is not supported (expected {SNAPSHOT_FORMAT_VERSION})")
+    if corpus_hash is not None and header['corpus_hash'] != corpus_hash:
+        raise ValueError(f"Snapshot {snapshot_path} was built from a different corpus; it needs to be rebuilt")
+
+    shape = (header['n_vectors'], header['dim'])
+    if header['n_vectors'] == 0:
+        vectors = None
+    elif mmap:
+        vectors = np.memmap(snapshot_path, dtype=np.float32, mode='r', offset=header['data_offset'], shape=shape)
+    else:
+        vectors = np.fromfile(snapshot_path, dtype=np.float32, count=shape[0]*shape[1], offset=header['data_offset']).reshape(shape)
+
+    store_cls, index_kwargs = NumpyVectorStore, {}
+    index_header = dict(header.get('index') or {})
+    if index_header.pop('kind', None) == 'hnsw':
+        # load the saved graph, or rebuild it from the vectors if its file is missing
+        index_path = _snapshot_index_path(snapshot_path)
+        store_cls = HNSWVectorStore
+        index_kwargs = dict(index_header, index_path=index_path if os.path.exists(index_path) else None)
+
+    segments = header['segments']
+    return store_cls.from_vectors(embedding, vectors,
+                                  texts=[seg['text'] for seg in segments],
+                                  metadatas=[seg['metadata'] for seg in segments],
+                                  ids=[seg['id'] for seg in segments],
+                                  normalized=True, **{**index_kwargs, **store_kwargs})
+
+# %% ../nbs/vector_indexes.ipynb 18
+def _import_hnswlib():
+    # hnswlib is only needed for HNSW stores, so it isn't a requirement of the package
+    try:
+        import hnswlib
+    except ImportError as e:
+        raise ImportError("HNSWVectorStore requires hnswlib; install it with `pip install hnswlib`") from e
+    return hnswlib
+
+class HNSWVectorStore(NumpyVectorStore):
+    def __init__(self, embedding, M=16, ef_construction=200, ef_search=64, initial_capacity=1024):
+        super().__init__(embedding, initial_capacity)
+        self._hnswlib = _import_hnswlib()
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._index = None
+        # graph label of each row, and row of each label (-1 once deleted)
+        self._labels = np.empty(0, dtype=np.int64)
+        self._label_rows = np.empty(0, dtype=np.int64)
+
+    @property
+    def nbytes(self):
+        # the graph keeps its own copy of the vectors, plus about 2*M links per vector
+        return super().nbytes + self.vectors.nbytes + 8 * self.M * len(self._label_rows)
+
+    def _init_index(self, dim, max_elements):
+        self._index = self._hnswlib.Index(space='ip', dim=dim)
+        self._index.init_index(max_elements=max_elements, M=self.M, ef_construction=self.ef_construction)
+
+    def _index_rows(self, index_path=None, labels=None):
+        # index rows which were set directly, or load a saved graph of them
+        if self.n_vectors == 0:
+            return
+        if index_path is None:
+            self._init_index(self.vectors.shape[1], max(self._initial_capacity, self.n_vectors))
+            labels = np.arange(self.n_vectors)
+            self._index.add_items(self.vectors, labels)
+        else:
+            self._index = self._hnswlib.Index(space='ip', dim=self.vectors.shape[1])
+            self._index.load_index(index_path)
+        self._labels = np.asarray(labels, dtype=np.int64)
+        self._label_rows = np.full(self._index.get_current_count(), -1, dtype=np.int64)
+        self._label_rows[self._labels] = np.arange(self.n_vectors)
+
+    def add_vectors(self, vectors, texts, metadatas=None, ids=None):
+        n_before = self.n_vectors
+        ids = super().add_vectors(vectors, texts, metadatas, ids)
+        if self.n_vectors == n_before:
+            return ids
+
+        new_vectors = self.vectors[n_before:]
+        if self._index is None:
+            self._init_index(new_vectors.shape[1], max(self._initial_capacity, len(new_vectors)))
+        # labels are never reused, since deleted vectors stay in the graph
+        n_labels = self._index.get_current_count()
+        if n_labels + len(new_vectors) > self._index.get_max_elements():
+            self._index.resize_index(max(2*self._index.get_max_elements(), n_labels + len(new_vectors)))
+        labels = np.arange(n_labels, n_labels + len(new_vectors))
+        self._index.add_items(new_vectors, labels)
+        self._labels = np.concatenate([self._labels, labels])
+        self._label_rows = np.concatenate([self._label_rows, np.arange(n_before, self.n_vectors)])
+
+        return ids
+
+    def delete(self, ids=None, **kwargs):
+        if ids is None:
+            return False
+        ids_to_delete = set(ids)
+        keep = np.array([doc_id not in ids_to_delete for doc_id in self.ids], dtype=bool)
+        super().delete(ids)
+
+        # deleted vectors are still used to navigate the graph, but are never returned
+        for label in self._labels[~keep]:
+            self._index.mark_deleted(int(label))
+        self._label_rows[self._labels[~keep]] = -1
+        self._labels = self._labels[keep]
+        self._label_rows[self._labels] = np.arange(self.n_vectors)
+
+        return True
+
+    def _top_k(self, query_vectors, k):
+        query_vectors = _normalize_rows(query_vectors)
+        k = min(k, self.n_vectors)
+        if k == 0:
+            return np.empty((len(query_vectors), 0), dtype=int), np.empty((len(query_vectors), 0), dtype=np.float32)
+
+        # the candidate list has to be at least as long as the number of results
+        self._index.set_ef(max(self.ef_search, k))
+        labels, distances = self._index.knn_query(query_vectors, k=k)
+        return self._label_rows[labels.astype(np.int64)], 1.0 - distances
+
+    def save_index(self, index_path):
+        if self._index is not None:
+            self._index.save_index(index_path)
+        return {'kind': 'hnsw', 'M': self.M, 'ef_construction': self.ef_construction, 'ef_search': self.ef_search,
+                'labels': self._labels.tolist()}
+
+    def shared_view(self, embedding=None):
+        view = super().shared_view(embedding)
+        view.M, view.ef_construction, view.ef_search = self.M, self.ef_construction, self.ef_search
+        view._index, view._labels, view._label_rows = self._index, self._labels, self._label_rows
+        return view
+
+    @classmethod
+    def from_vectors(cls, embedding, vectors, texts, metadatas=None, ids=None, normalized=False, index_path=None, labels=None, **kwargs):
+        store = super().from_vectors(embedding, vectors, texts, metadatas, ids, normalized, **kwargs)
+        if normalized:
+            store._index_rows(index_path, labels)
+        return store
+
+# %% ../nbs/vector_indexes.ipynb 24
+class VectorStoreRegistry:
+    def __init__(self, max_memory_mb=1024):
+        self.max_memory_mb = max_memory_mb
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # fingerprint -> {'store', 'n_refs' (references without an owner), 'owners'}, least recently used first
+        self._entries = OrderedDict()
+        # fingerprint -> future of the store, while it's being loaded
+        self._loading = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _n_references(entry):
+        return entry['n_refs'] + len(entry['owners'])
+
+    @property
+    def memory_mb(self):
+        with self._lock:
+            return sum(entry['store'].nbytes for entry in self._entries.values()) / (1024 * 1024)
+
+    def _add_reference(self, fingerprint, store, owner):
+        # the store is added back if it was evicted before a waiting session got the lock
+        entry = self._entries.setdefault(fingerprint, {'store': store, 'n_refs': 0, 'owners': weakref.WeakSet()})
+        self._entries.move_to_end(fingerprint)
+        if owner is None:
+            entry['n_refs'] += 1
+        else:
+            entry['owners'].add(owner)
+        self._evict()
+
+        return entry['store']
+
+    def acquire(self, fingerprint, load_fcn, owner=None):
+        with self._lock:
+            if fingerprint in self._entries:
+                self.hits += 1
+                return self._add_reference(fingerprint, self._entries[fingerprint]['store'], owner)
+
+            # sessions asking for a corpus which is already being loaded wait for that load
+            loading = self._loading.get(fingerprint)
+            load_here = loading is None
+            if load_here:
+                self.misses += 1
+                loading = self._loading[fingerprint] = Future()
+            else:
+                self.hits += 1
+
+        if load_here:
+            # load outside the lock, so sessions using other corpora aren't held up
+            try:
+                store = load_fcn()
+                store.read_only = True
+            except BaseException as e:
+                with self._lock:
+                    del self._loading[fingerprint]
+                loading.set_exception(e)
+                raise
+            with self._lock:
+                del self._loading[fingerprint]
+                loading.set_result(store)
+                return self._add_reference(fingerprint, store, owner)
+
+        store = loading.result()
+        with self._lock:
+            return self._add_reference(fingerprint, store, owner)
+
+    def release(self, fingerprint, owner=None):
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return
+            if owner is None:
+                entry['n_refs'] = max(entry['n_refs'] - 1, 0)
+            else:
+                entry['owners'].discard(owner)
+            self._evict()
+
+    def _evict(self):
+        # evict unused indexes, least recently used first, until we're under the memory cap
+        while self.memory_mb > self.max_memory_mb:
+            unused = [fingerprint for fingerprint, entry in self._entries.items() if self._n_references(entry) == 0]
+            if not unused:
+                return
+            del self._entries[unused[0]]
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {'indexes': len(self._entries),
+                    'references': {fingerprint: self._n_references(entry) for fingerprint, entry in self._entries.items()},
+                    'memory_mb': self.memory_mb,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+_default_vector_store_registry = None
+
+def get_vector_store_registry(max_memory_mb=None):
+    # lazily create one registry shared by every session in this process
+    global _default_vector_store_registry
+    if _default_vector_store_registry is None:
+        _default_vector_store_registry = VectorStoreRegistry()
+    if max_memory_mb is not None:
+        with _default_vector_store_registry._lock:
+            _default_vector_store_registry.max_memory_mb = max_memory_mb
+            _default_vector_store_registry._evict()
+    return _default_vector_store_registry
+
+# %% ../nbs/vector_indexes.ipynb 28
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+def _tokenize(text):
+    return _TOKEN_PATTERN.findall(text.lower())
+
+class BM25Index:
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.texts = []
+        self.metadatas = []
+        self.ids = []
+        self.read_only = False
+        self.content_hash = 0
+        self.version = 0
+        self._vocab = {}
+        # per segment: unique term ids and their counts
+        self._row_terms = []
+        self._row_counts = []
+        self._compiled = None
+
+    @property
+    def n_docs(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        n_postings = sum(len(terms) for terms in self._row_terms)
+        return 2 * 8 * n_postings + sum(len(text) for text in self.texts)
+
+    def _check_writable(self):
+        if self.read_only:
+            raise ValueError("This index is shared and read-only")
+
+    def add_texts(self, texts, metadatas=None, ids=None):
+        self._check_writable()
+        texts = list(texts)
+        metadatas = [dict(meta) for meta in metadatas] if metadatas is not None else [{} for _ in texts]
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        for text in texts:
+            term_counts = Counter(_tokenize(text))
+            self._row_terms.append(np.fromiter((self._vocab.setdefault(term, len(self._vocab)) for term in term_counts), dtype=np.int32, count=len(term_counts)))
+            self._row_counts.append(np.fromiter(term_counts.values(), dtype=np.float32, count=len(term_counts)))
+        self.texts.extend(texts)
+        self.metadatas.extend(metadatas)
+        self.ids.extend(ids)
+        self.content_hash = (self.content_hash + _segments_hash(texts, metadatas)) % _CONTENT_HASH_MODULUS
+        self.version += 1
+        self._compiled = None
+        return ids
+
+    def add_documents(self, documents, ids=None):
+        return self.add_texts([doc.page_content for doc in documents], [doc.metadata for doc in documents], ids)
+
+    def delete(self, ids):
+        self._check_writable()
+        ids_to_delete = set(ids)
+        keep = [ind for ind, doc_id in enumerate(self.ids) if doc_id not in ids_to_delete]
+        deleted = [ind for ind, doc_id in enumerate(self.ids) if doc_id in ids_to_delete]
+        self.content_hash = (self.content_hash - _segments_hash([self.texts[ind] for ind in deleted], [self.metadatas[ind] for ind in deleted])) % _CONTENT_HASH_MODULUS
+        for attr in ['texts', 'metadatas', 'ids', '_row_terms', '_row_counts']:
+            values = getattr(self, attr)
+            setattr(self, attr, [values[ind] for ind in keep])
+        self.version += 1
+        self._compiled = None
+
+    def _compile(self):
+        # build a compressed inverted index: the postings of term t are rows[offsets[t]:offsets[t+1]]
+        n_postings = np.array([len(terms) for terms in self._row_terms], dtype=np.int64)
+        term_ids = np.concatenate(self._row_terms) if self._row_terms else np.empty(0, dtype=np.int32)
+        counts = np.concatenate(self._row_counts) if self._row_counts else np.empty(0, dtype=np.float32)
+        rows = np.repeat(np.arange(self.n_docs, dtype=np.int32), n_postings)
+        order = np.argsort(term_ids, kind='stable')
+
+        doc_lens = np.array([counts.sum() for counts in self._row_counts], dtype=np.float32)
+        doc_freqs = np.bincount(term_ids, minlength=len(self._vocab))
+        self._compiled = {'offsets': np.concatenate([[0], np.cumsum(doc_freqs)]),
+                          'rows': rows[order],
+                          'counts': counts[order],
+                          'idf': np.log(1 + (self.n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32),
+                          'length_norm': (self.k1 * (1 - self.b + self.b * doc_lens / max(doc_lens.mean(), 1.0))).astype(np.float32) if self.n_docs else doc_lens}
+
+    def scores(self, query):
+        if self._compiled is None:
+            self._compile()
+        index = self._compiled
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term in set(_tokenize(query)):
+            term_id = self._vocab.get(term)
+            if term_id is None or term_id >= len(index['idf']):
+                continue
+            start, end = index['offsets'][term_id], index['offsets'][term_id + 1]
+            rows, counts = index['rows'][start:end], index['counts'][start:end]
+            # each segment appears once in a term's postings, so we can add in place
+            scores[rows] += index['idf'][term_id] * counts * (self.k1 + 1) / (counts + index['length_norm'][rows])
+        return scores
+
+    def search(self, query, k=4):
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(Document(page_content=self.texts[row], metadata=dict(self.metadatas[row])), float(scores[row])) for row in matched]
+
+    @classmethod
+    def from_texts(cls, texts, metadatas=None, ids=None, **kwargs):
+        index = cls(**kwargs)
+        index.add_texts(texts, metadatas, ids)
+        return index
+
+    @classmethod
+    def from_documents(cls, documents, ids=None, **kwargs):
+        index = cls(**kwargs)
+        index.add_documents(documents, ids)
+        return index
+
+class HybridRetriever(BaseRetriever):
+    vector_store: VectorStore
+    lexical_index: BM25Index
+    search_kwargs: dict = Field(default_factory=lambda: {'k': 4})
+    fetch_k: int = 20
+    vector_weight: float = 0.5
+    rrf_k: int = 60
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _fuse(self, vector_docs, lexical_docs, k):
+        fused = {}
+        for weight, docs in [(self.vector_weight, vector_docs), (1 - self.vector_weight, lexical_docs)]:
+            for rank, doc in enumerate(docs, start=1):
+                doc_score = fused.setdefault((doc.page_content, doc.metadata.get('source')), [doc, 0.0])
+                doc_score[1] += weight / (self.rrf_k + rank)
+
+        # sorting is stable, so ties keep the vector store's order
+        ranked = sorted(fused.values(), key=lambda doc_score: -doc_score[1])
+        return [doc for doc, _ in ranked[:k]]
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        k = self.search_kwargs.get('k', 4)
+        fetch_k = max(self.fetch_k, k)
+        vector_docs = self.vector_store.similarity_search(query, k=fetch_k)
+        lexical_docs = [doc for doc, _ in self.lexical_index.search(query, k=fetch_k)]
+        return self._fuse(vector_docs, lexical_docs, k)
+
+# %% ../nbs/vector_indexes.ipynb 36
+def _normalize_query(query):
+    # case, punctuation, and spacing don't change what a question asks for
+    return ' '.join(_tokenize(query))
+
+def _embedding_fingerprint(embedding):
+    # wrappers like CachedEmbeddings don't change the vectors, so only the model they wrap matters
+    while hasattr(embedding, 'embeddings'):
+        embedding = embedding.embeddings
+    return (type(embedding).__name__, getattr(embedding, 'model', None))
+
+def _index_fingerprint(index):
+    # indexes with the same segments, embedding model, and settings return the same results, whichever session built them
+    if index is None or not hasattr(index, 'content_hash'):
+        return None
+    if isinstance(index, BM25Index):
+        settings = (index.k1, index.b)
+    else:
+        settings = (_embedding_fingerprint(index.embeddings),)
+    if isinstance(index, HNSWVectorStore):
+        settings += (index.M, index.ef_construction, index.ef_search)
+    return (type(index).__name__, f'{index.content_hash:064x}', settings)
+
+def retriever_fingerprint(retriever):
+    # identifies the contents of the indexes a retriever searches and its settings
+    if isinstance(retriever, EnsembleRetriever):
+        # fused results only change when the results of one of the retrievers do
+        member_fingerprints = tuple(retriever_fingerprint(member) for member in retriever.retrievers)
+        if None in member_fingerprints:
+            return None
+        return (type(retriever).__name__, member_fingerprints, (tuple(retriever.weights), retriever.c), '{}')
+    if isinstance(retriever, HybridRetriever):
+        # the lexical index has the same segments as the vector store, so it tracks the contents of stores like Chroma
+        lexical_fingerprint = _index_fingerprint(retriever.lexical_index)
+        if lexical_fingerprint is None:
+            return None
+        vector_fingerprint = _index_fingerprint(retriever.vector_store) or \
+                             (type(retriever.vector_store).__name__, _embedding_fingerprint(getattr(retriever.vector_store, 'embeddings', None)))
+        index_fingerprints = (vector_fingerprint, lexical_fingerprint)
+        settings = (retriever.fetch_k, retriever.vector_weight, retriever.rrf_k)
+    else:
+        store_fingerprint = _index_fingerprint(getattr(retriever, 'vectorstore', None))
+        if store_fingerprint is None:
+            return None
+        index_fingerprints = (store_fingerprint,)
+        settings = (getattr(retriever, 'search_type', None),)
+
+    search_kwargs = json.dumps(getattr(retriever, 'search_kwargs', {}), sort_keys=True, default=str)
+    return (type(retriever).__name__, index_fingerprints, settings, search_kwargs)
+
+class RetrievalCache:
+    def __init__(self, max_entries=1024, ttl=3600, embedding=None, similarity_threshold=0.95):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embedding = embedding
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        # (retriever fingerprint, normalized query) -> (time added, query vector, documents), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self):
+        n_lookups = self.hits + self.semantic_hits + self.misses
+        return (self.hits + self.semantic_hits) / n_lookups if n_lookups else 0.0
+
+    def _is_expired(self, entry, now):
+        return self.ttl is not None and now - entry[0] > self.ttl
+
+    def _use_entry(self, key):
+        self._entries.move_to_end(key)
+        return [doc.copy(deep=True) for doc in self._entries[key][2]]
+
+    def _find_similar(self, fingerprint, query_vector, now):
+        best_key, best_score = None, self.similarity_threshold
+        for key, entry in self._entries.items():
+            if key[0] == fingerprint and entry[1] is not None and not self._is_expired(entry, now):
+                score = float(entry[1] @ query_vector)
+                if score >= best_score:
+                    best_key, best_score = key, score
+        return best_key
+
+    def lookup(self, fingerprint, query):
+        # returns the cached documents (or None) and the query's embedding, if one was needed
+        if fingerprint is None:
+            with self._lock:
+                self.bypasses += 1
+            return None, None
+
+        key = (fingerprint, _normalize_query(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry, time.monotonic()):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self.hits += 1
+                return self._use_entry(key), None
+            if self.embedding is None:
+                self.misses += 1
+                return None, None
+
+        # otherwise look for a cached question that means the same thing, embedding outside the lock
+        query_vector = _normalize_rows([self.embedding.embed_query(query)])[0]
+        with self._lock:
+            similar_key = self._find_similar(fingerprint, query_vector, time.monotonic())
+            if similar_key is not None:
+                self.semantic_hits += 1
+                return self._use_entry(similar_key), query_vector
+            self.misses += 1
+            return None, query_vector
+
+    def add(self, fingerprint, query, documents, query_vector=None):
+        if fingerprint is None:
+            return
+        key = (fingerprint, _normalize_query(query))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), query_vector, [doc.copy(deep=True) for doc in documents])
+            self._entries.move_to_end(key)
+            # entries for old contents of an index are never looked up again, so they age out here
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries),
+                    'hits': self.hits,
+                    'semantic_hits': self.semantic_hits,
+                    'misses': self.misses,
+                    'bypasses': self.bypasses,
+                    'evictions': self.evictions,
+                    'hit_rate': self.hit_rate}
+
+class CachedRetriever(BaseRetriever):
+    retriever: BaseRetriever
+    cache: RetrievalCache
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        fingerprint = retriever_fingerprint(self.retriever)
+        documents, query_vector = self.cache.lookup(fingerprint, query)
+        if documents is None:
+            documents = self.retriever.get_relevant_documents(query, callbacks=run_manager.get_child() if run_manager else None)
+            self.cache.add(fingerprint, query, documents, query_vector)
+        return documents
+
+    async def _aget_relevant_documents(self, query, *, run_manager=None):
+        # hits are answered on the event loop; misses use the wrapped retriever's async version
+        fingerprint = retriever_fingerprint(self.retriever)
+        documents, query_vector = self.cache.lookup(fingerprint, query)
+        if documents is None:
+            documents = await self.retriever.aget_relevant_documents(query, callbacks=run_manager.get_child() if run_manager else None)
+            self.cache.add(fingerprint, query, documents, query_vector)
+        return documents
+
+_default_retrieval_cache = None
+
+def get_retrieval_cache(**cache_settings):
+    # lazily create one cache shared by every session in this process
+    global _default_retrieval_cache
+    if _default_retrieval_cache is None:
+        _default_retrieval_cache = RetrievalCache()
+    with _default_retrieval_cache._lock:
+        for setting, value in cache_settings.items():
+            setattr(_default_retrieval_cache, setting, value)
+    return _default_retrieval_cache
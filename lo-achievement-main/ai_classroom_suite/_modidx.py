@@ -11,6 +11,38 @@ d = { 'settings': { 'branch': 'main',
                                                                                                               'ai_classroom_suite/BasicInteraction.py'),
                                                      'ai_classroom_suite.BasicInteraction.initialize_mdl_wrapper': ( 'blocher_basic_interaction.html#initialize_mdl_wrapper',
                                                                                                                      'ai_classroom_suite/BasicInteraction.py')},
+            'ai_classroom_suite.ConversationMemory': { 'ai_classroom_suite.ConversationMemory.ConversationMemory': ( 'conversation_memory.html#conversationmemory',
+                                                                                                                     'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.__init__': ( 'conversation_memory.html#conversationmemory.__init__',
+                                                                                                                              'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory._fold_pending_turns': ( 'conversation_memory.html#conversationmemory._fold_pending_turns',
+                                                                                                                                         'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory._history_turns': ( 'conversation_memory.html#conversationmemory._history_turns',
+                                                                                                                                    'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory._schedule_summary': ( 'conversation_memory.html#conversationmemory._schedule_summary',
+                                                                                                                                       'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory._summarize': ( 'conversation_memory.html#conversationmemory._summarize',
+                                                                                                                                'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.add_turn': ( 'conversation_memory.html#conversationmemory.add_turn',
+                                                                                                                              'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.as_text': ( 'conversation_memory.html#conversationmemory.as_text',
+                                                                                                                             'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.chat_history': ( 'conversation_memory.html#conversationmemory.chat_history',
+                                                                                                                                  'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.clear': ( 'conversation_memory.html#conversationmemory.clear',
+                                                                                                                           'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.n_tokens': ( 'conversation_memory.html#conversationmemory.n_tokens',
+                                                                                                                              'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.stats': ( 'conversation_memory.html#conversationmemory.stats',
+                                                                                                                           'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.ConversationMemory.wait': ( 'conversation_memory.html#conversationmemory.wait',
+                                                                                                                          'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory._get_summary_executor': ( 'conversation_memory.html#_get_summary_executor',
+                                                                                                                        'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory._turn_text': ( 'conversation_memory.html#_turn_text',
+                                                                                                             'ai_classroom_suite/ConversationMemory.py'),
+                                                       'ai_classroom_suite.ConversationMemory.estimate_tokens': ( 'conversation_memory.html#estimate_tokens',
+                                                                                                                  'ai_classroom_suite/ConversationMemory.py')},
             'ai_classroom_suite.GradingUtility': { 'ai_classroom_suite.GradingUtility.InstructorGradingConfig': ( 'gradingutility.html#instructorgradingconfig',
                                                                                                                   'ai_classroom_suite/GradingUtility.py'),
                                                    'ai_classroom_suite.GradingUtility.InstructorGradingConfig.__init__': ( 'gradingutility.html#instructorgradingconfig.__init__',
@@ -21,12 +53,50 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                               'ai_classroom_suite/GradingUtility.py'),
                                                    'ai_classroom_suite.GradingUtility.InstructorGradingConfig.run_ui_container': ( 'gradingutility.html#instructorgradingconfig.run_ui_container',
                                                                                                                                    'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._agrade_transcript': ( 'gradingutility.html#_agrade_transcript',
+                                                                                                             'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._combine_loaded_chunks': ( 'gradingutility.html#_combine_loaded_chunks',
+                                                                                                                 'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._load_grading_checkpoint': ( 'gradingutility.html#_load_grading_checkpoint',
+                                                                                                                   'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._load_json_files': ( 'gradingutility.html#_load_json_files',
+                                                                                                           'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._load_json_files_in_chunks': ( 'gradingutility.html#_load_json_files_in_chunks',
+                                                                                                                     'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._load_zip_in_chunks': ( 'gradingutility.html#_load_zip_in_chunks',
+                                                                                                              'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._merge_duplicate_columns': ( 'gradingutility.html#_merge_duplicate_columns',
+                                                                                                                   'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._read_zip_chunks': ( 'gradingutility.html#_read_zip_chunks',
+                                                                                                           'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._segment_attempts': ( 'gradingutility.html#_segment_attempts',
+                                                                                                            'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._strip_values': ( 'gradingutility.html#_strip_values',
+                                                                                                        'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._to_number': ( 'gradingutility.html#_to_number',
+                                                                                                     'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility._zip_json_members': ( 'gradingutility.html#_zip_json_members',
+                                                                                                            'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility.agrade_transcripts': ( 'gradingutility.html#agrade_transcripts',
+                                                                                                             'ai_classroom_suite/GradingUtility.py'),
                                                    'ai_classroom_suite.GradingUtility.clean_keys': ( 'gradingutility.html#clean_keys',
                                                                                                      'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility.create_grading_prompt': ( 'gradingutility.html#create_grading_prompt',
+                                                                                                                'ai_classroom_suite/GradingUtility.py'),
                                                    'ai_classroom_suite.GradingUtility.file_upload_json_to_df': ( 'gradingutility.html#file_upload_json_to_df',
                                                                                                                  'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility.grade_transcripts': ( 'gradingutility.html#grade_transcripts',
+                                                                                                            'ai_classroom_suite/GradingUtility.py'),
                                                    'ai_classroom_suite.GradingUtility.load_json_as_df': ( 'gradingutility.html#load_json_as_df',
                                                                                                           'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility.load_json_files_as_df': ( 'gradingutility.html#load_json_files_as_df',
+                                                                                                                'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility.load_zip_as_df': ( 'gradingutility.html#load_zip_as_df',
+                                                                                                         'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility.parse_grade_report': ( 'gradingutility.html#parse_grade_report',
+                                                                                                             'ai_classroom_suite/GradingUtility.py'),
+                                                   'ai_classroom_suite.GradingUtility.pregrade_transcripts': ( 'gradingutility.html#pregrade_transcripts',
+                                                                                                               'ai_classroom_suite/GradingUtility.py'),
                                                    'ai_classroom_suite.GradingUtility.pretty_print': ( 'gradingutility.html#pretty_print',
                                                                                                        'ai_classroom_suite/GradingUtility.py'),
                                                    'ai_classroom_suite.GradingUtility.save_as_csv': ( 'gradingutility.html#save_as_csv',
@@ -53,16 +123,168 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                'ai_classroom_suite/IOHelperUtilities.py'),
                                                       'ai_classroom_suite.IOHelperUtilities.setup_drives': ( 'helper_utilities.html#setup_drives',
                                                                                                              'ai_classroom_suite/IOHelperUtilities.py')},
-            'ai_classroom_suite.MediaVectorStores': { 'ai_classroom_suite.MediaVectorStores._file_to_text': ( 'media_stores.html#_file_to_text',
+            'ai_classroom_suite.LocalOpenAIServer': { 'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer': ( 'local_openai_server.html#localopenaiserver',
+                                                                                                                  'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.__enter__': ( 'local_openai_server.html#localopenaiserver.__enter__',
+                                                                                                                            'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.__exit__': ( 'local_openai_server.html#localopenaiserver.__exit__',
+                                                                                                                           'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.__init__': ( 'local_openai_server.html#localopenaiserver.__init__',
+                                                                                                                           'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer._chat_chunks': ( 'local_openai_server.html#localopenaiserver._chat_chunks',
+                                                                                                                               'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer._handle_chat': ( 'local_openai_server.html#localopenaiserver._handle_chat',
+                                                                                                                               'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer._handle_embeddings': ( 'local_openai_server.html#localopenaiserver._handle_embeddings',
+                                                                                                                                     'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.embed': ( 'local_openai_server.html#localopenaiserver.embed',
+                                                                                                                        'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.handle_request': ( 'local_openai_server.html#localopenaiserver.handle_request',
+                                                                                                                                 'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.reply': ( 'local_openai_server.html#localopenaiserver.reply',
+                                                                                                                        'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.start': ( 'local_openai_server.html#localopenaiserver.start',
+                                                                                                                        'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.stop': ( 'local_openai_server.html#localopenaiserver.stop',
+                                                                                                                       'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer.LocalOpenAIServer.url': ( 'local_openai_server.html#localopenaiserver.url',
+                                                                                                                      'ai_classroom_suite/LocalOpenAIServer.py'),
+                                                      'ai_classroom_suite.LocalOpenAIServer._error_response': ( 'local_openai_server.html#_error_response',
+                                                                                                                'ai_classroom_suite/LocalOpenAIServer.py')},
+            'ai_classroom_suite.MediaVectorStores': { 'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings': ( 'media_stores.html#batchedembeddings',
+                                                                                                                  'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings.__init__': ( 'media_stores.html#batchedembeddings.__init__',
+                                                                                                                           'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings._aembed_batch': ( 'media_stores.html#batchedembeddings._aembed_batch',
+                                                                                                                                'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings._shrink': ( 'media_stores.html#batchedembeddings._shrink',
+                                                                                                                          'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings.aembed_documents': ( 'media_stores.html#batchedembeddings.aembed_documents',
+                                                                                                                                   'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings.aembed_query': ( 'media_stores.html#batchedembeddings.aembed_query',
+                                                                                                                               'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings.embed_documents': ( 'media_stores.html#batchedembeddings.embed_documents',
+                                                                                                                                  'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.BatchedEmbeddings.embed_query': ( 'media_stores.html#batchedembeddings.embed_query',
+                                                                                                                              'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.CachedEmbeddings': ( 'media_stores.html#cachedembeddings',
+                                                                                                                 'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.CachedEmbeddings.__init__': ( 'media_stores.html#cachedembeddings.__init__',
+                                                                                                                          'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.CachedEmbeddings._embed_with_cache': ( 'media_stores.html#cachedembeddings._embed_with_cache',
+                                                                                                                                   'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.CachedEmbeddings.embed_documents': ( 'media_stores.html#cachedembeddings.embed_documents',
+                                                                                                                                 'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.CachedEmbeddings.embed_query': ( 'media_stores.html#cachedembeddings.embed_query',
+                                                                                                                             'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache': ( 'media_stores.html#embeddingcache',
+                                                                                                               'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache.__init__': ( 'media_stores.html#embeddingcache.__init__',
+                                                                                                                        'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache._evict': ( 'media_stores.html#embeddingcache._evict',
+                                                                                                                      'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache.clear': ( 'media_stores.html#embeddingcache.clear',
+                                                                                                                     'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache.get_many': ( 'media_stores.html#embeddingcache.get_many',
+                                                                                                                        'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache.hash_text': ( 'media_stores.html#embeddingcache.hash_text',
+                                                                                                                         'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache.set_many': ( 'media_stores.html#embeddingcache.set_many',
+                                                                                                                        'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.EmbeddingCache.stats': ( 'media_stores.html#embeddingcache.stats',
+                                                                                                                     'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore': ( 'media_stores.html#incrementalreferencestore',
+                                                                                                                          'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore.__init__': ( 'media_stores.html#incrementalreferencestore.__init__',
+                                                                                                                                   'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore._deduplicate': ( 'media_stores.html#incrementalreferencestore._deduplicate',
+                                                                                                                                       'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore._documents_to_add': ( 'media_stores.html#incrementalreferencestore._documents_to_add',
+                                                                                                                                            'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore._load_files': ( 'media_stores.html#incrementalreferencestore._load_files',
+                                                                                                                                      'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore._load_texts': ( 'media_stores.html#incrementalreferencestore._load_texts',
+                                                                                                                                      'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore._segment_ids': ( 'media_stores.html#incrementalreferencestore._segment_ids',
+                                                                                                                                       'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore._segment_params': ( 'media_stores.html#incrementalreferencestore._segment_params',
+                                                                                                                                          'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore._text_hash': ( 'media_stores.html#incrementalreferencestore._text_hash',
+                                                                                                                                     'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore.as_retriever': ( 'media_stores.html#incrementalreferencestore.as_retriever',
+                                                                                                                                       'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore.n_segments': ( 'media_stores.html#incrementalreferencestore.n_segments',
+                                                                                                                                     'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.IncrementalReferenceStore.sync': ( 'media_stores.html#incrementalreferencestore.sync',
+                                                                                                                               'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker': ( 'media_stores.html#lineartextchunker',
+                                                                                                                  'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker.__init__': ( 'media_stores.html#lineartextchunker.__init__',
+                                                                                                                           'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker._add_chunk': ( 'media_stores.html#lineartextchunker._add_chunk',
+                                                                                                                             'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker._merge_run': ( 'media_stores.html#lineartextchunker._merge_run',
+                                                                                                                             'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker._split_piece': ( 'media_stores.html#lineartextchunker._split_piece',
+                                                                                                                               'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker._split_with_offsets': ( 'media_stores.html#lineartextchunker._split_with_offsets',
+                                                                                                                                      'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker.create_documents': ( 'media_stores.html#lineartextchunker.create_documents',
+                                                                                                                                   'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.LinearTextChunker.split_text': ( 'media_stores.html#lineartextchunker.split_text',
+                                                                                                                             'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator': ( 'media_stores.html#minhashdeduplicator',
+                                                                                                                    'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator.__init__': ( 'media_stores.html#minhashdeduplicator.__init__',
+                                                                                                                             'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator._band_keys': ( 'media_stores.html#minhashdeduplicator._band_keys',
+                                                                                                                               'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator._best_match': ( 'media_stores.html#minhashdeduplicator._best_match',
+                                                                                                                                'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator.deduplicate': ( 'media_stores.html#minhashdeduplicator.deduplicate',
+                                                                                                                                'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator.filter': ( 'media_stores.html#minhashdeduplicator.filter',
+                                                                                                                           'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator.reset': ( 'media_stores.html#minhashdeduplicator.reset',
+                                                                                                                          'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.MinHashDeduplicator.signature': ( 'media_stores.html#minhashdeduplicator.signature',
+                                                                                                                              'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores._create_empty_vector_store': ( 'media_stores.html#_create_empty_vector_store',
+                                                                                                                           'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores._duplicate_provenance': ( 'media_stores.html#_duplicate_provenance',
+                                                                                                                      'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores._embedding_error_kind': ( 'media_stores.html#_embedding_error_kind',
+                                                                                                                      'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores._file_to_text': ( 'media_stores.html#_file_to_text',
                                                                                                               'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores._get_embeddings': ( 'media_stores.html#_get_embeddings',
+                                                                                                                'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores._safe_file_to_text': ( 'media_stores.html#_safe_file_to_text',
+                                                                                                                   'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.add_segment_batches': ( 'media_stores.html#add_segment_batches',
+                                                                                                                    'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.compute_corpus_hash': ( 'media_stores.html#compute_corpus_hash',
+                                                                                                                    'ai_classroom_suite/MediaVectorStores.py'),
                                                       'ai_classroom_suite.MediaVectorStores.create_local_vector_store': ( 'media_stores.html#create_local_vector_store',
                                                                                                                           'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.create_local_vector_store_from_batches': ( 'media_stores.html#create_local_vector_store_from_batches',
+                                                                                                                                       'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.create_vector_snapshot': ( 'media_stores.html#create_vector_snapshot',
+                                                                                                                       'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.deduplicate_segments': ( 'media_stores.html#deduplicate_segments',
+                                                                                                                     'ai_classroom_suite/MediaVectorStores.py'),
                                                       'ai_classroom_suite.MediaVectorStores.files_to_text': ( 'media_stores.html#files_to_text',
                                                                                                               'ai_classroom_suite/MediaVectorStores.py'),
                                                       'ai_classroom_suite.MediaVectorStores.get_document_segments': ( 'media_stores.html#get_document_segments',
                                                                                                                       'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.get_embedding_cache': ( 'media_stores.html#get_embedding_cache',
+                                                                                                                    'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.get_text_chunker': ( 'media_stores.html#get_text_chunker',
+                                                                                                                 'ai_classroom_suite/MediaVectorStores.py'),
                                                       'ai_classroom_suite.MediaVectorStores.get_youtube_transcript': ( 'media_stores.html#get_youtube_transcript',
                                                                                                                        'ai_classroom_suite/MediaVectorStores.py'),
+                                                      'ai_classroom_suite.MediaVectorStores.iter_document_segments': ( 'media_stores.html#iter_document_segments',
+                                                                                                                       'ai_classroom_suite/MediaVectorStores.py'),
                                                       'ai_classroom_suite.MediaVectorStores.rawtext_to_doc_split': ( 'media_stores.html#rawtext_to_doc_split',
                                                                                                                      'ai_classroom_suite/MediaVectorStores.py'),
                                                       'ai_classroom_suite.MediaVectorStores.save_text': ( 'media_stores.html#save_text',
@@ -73,7 +295,171 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                     'ai_classroom_suite/MediaVectorStores.py'),
                                                       'ai_classroom_suite.MediaVectorStores.youtube_to_text': ( 'media_stores.html#youtube_to_text',
                                                                                                                 'ai_classroom_suite/MediaVectorStores.py')},
-            'ai_classroom_suite.PromptInteractionBase': { 'ai_classroom_suite.PromptInteractionBase.create_base_tutoring_prompt': ( 'prompt_interaction_base.html#create_base_tutoring_prompt',
+            'ai_classroom_suite.ModelClients': { 'ai_classroom_suite.ModelClients.CallLimiter': ( 'model_clients.html#calllimiter',
+                                                                                                  'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.CallLimiter.__init__': ( 'model_clients.html#calllimiter.__init__',
+                                                                                                           'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.CallLimiter._try_acquire': ( 'model_clients.html#calllimiter._try_acquire',
+                                                                                                               'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.CallLimiter.aacquire': ( 'model_clients.html#calllimiter.aacquire',
+                                                                                                           'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.CallLimiter.acquire': ( 'model_clients.html#calllimiter.acquire',
+                                                                                                          'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.CallLimiter.release': ( 'model_clients.html#calllimiter.release',
+                                                                                                          'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.CallLimiter.stats': ( 'model_clients.html#calllimiter.stats',
+                                                                                                        'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.ModelClientPool': ( 'model_clients.html#modelclientpool',
+                                                                                                      'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.ModelClientPool.__init__': ( 'model_clients.html#modelclientpool.__init__',
+                                                                                                               'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.ModelClientPool.aclose': ( 'model_clients.html#modelclientpool.aclose',
+                                                                                                             'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.ModelClientPool.close': ( 'model_clients.html#modelclientpool.close',
+                                                                                                            'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.ModelClientPool.get_client': ( 'model_clients.html#modelclientpool.get_client',
+                                                                                                                 'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.ModelClientPool.get_limiter': ( 'model_clients.html#modelclientpool.get_limiter',
+                                                                                                                  'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.ModelClientPool.stats': ( 'model_clients.html#modelclientpool.stats',
+                                                                                                            'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient': ( 'model_clients.html#pooledchatclient',
+                                                                                                       'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient.__init__': ( 'model_clients.html#pooledchatclient.__init__',
+                                                                                                                'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient._arelease_after': ( 'model_clients.html#pooledchatclient._arelease_after',
+                                                                                                                       'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient._end_call': ( 'model_clients.html#pooledchatclient._end_call',
+                                                                                                                 'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient._get_async_session': ( 'model_clients.html#pooledchatclient._get_async_session',
+                                                                                                                          'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient._release_after': ( 'model_clients.html#pooledchatclient._release_after',
+                                                                                                                      'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient._start_call': ( 'model_clients.html#pooledchatclient._start_call',
+                                                                                                                   'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient._thread_session': ( 'model_clients.html#pooledchatclient._thread_session',
+                                                                                                                       'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient.aclose': ( 'model_clients.html#pooledchatclient.aclose',
+                                                                                                              'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient.acreate': ( 'model_clients.html#pooledchatclient.acreate',
+                                                                                                               'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient.close': ( 'model_clients.html#pooledchatclient.close',
+                                                                                                             'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient.create': ( 'model_clients.html#pooledchatclient.create',
+                                                                                                              'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.PooledChatClient.stats': ( 'model_clients.html#pooledchatclient.stats',
+                                                                                                             'ai_classroom_suite/ModelClients.py'),
+                                                 'ai_classroom_suite.ModelClients.get_client_pool': ( 'model_clients.html#get_client_pool',
+                                                                                                      'ai_classroom_suite/ModelClients.py')},
+            'ai_classroom_suite.PromptInteractionBase': { 'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI': ( 'prompt_interaction_base.html#cachedchatopenai',
+                                                                                                                         'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI._add_response': ( 'prompt_interaction_base.html#cachedchatopenai._add_response',
+                                                                                                                                       'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI._agenerate': ( 'prompt_interaction_base.html#cachedchatopenai._agenerate',
+                                                                                                                                    'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI._astream': ( 'prompt_interaction_base.html#cachedchatopenai._astream',
+                                                                                                                                  'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI._cached_result': ( 'prompt_interaction_base.html#cachedchatopenai._cached_result',
+                                                                                                                                        'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI._generate': ( 'prompt_interaction_base.html#cachedchatopenai._generate',
+                                                                                                                                   'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI._stream': ( 'prompt_interaction_base.html#cachedchatopenai._stream',
+                                                                                                                                 'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.CachedChatOpenAI._use_cache': ( 'prompt_interaction_base.html#cachedchatopenai._use_cache',
+                                                                                                                                    'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache': ( 'prompt_interaction_base.html#responsecache',
+                                                                                                                      'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache.__init__': ( 'prompt_interaction_base.html#responsecache.__init__',
+                                                                                                                               'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache._embed_last': ( 'prompt_interaction_base.html#responsecache._embed_last',
+                                                                                                                                  'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache._evict': ( 'prompt_interaction_base.html#responsecache._evict',
+                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache._prefix_hash': ( 'prompt_interaction_base.html#responsecache._prefix_hash',
+                                                                                                                                   'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache._size_bytes': ( 'prompt_interaction_base.html#responsecache._size_bytes',
+                                                                                                                                  'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache._use_row': ( 'prompt_interaction_base.html#responsecache._use_row',
+                                                                                                                               'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache.add': ( 'prompt_interaction_base.html#responsecache.add',
+                                                                                                                          'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache.clear': ( 'prompt_interaction_base.html#responsecache.clear',
+                                                                                                                            'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache.hash_key': ( 'prompt_interaction_base.html#responsecache.hash_key',
+                                                                                                                               'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache.is_cacheable': ( 'prompt_interaction_base.html#responsecache.is_cacheable',
+                                                                                                                                   'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache.lookup': ( 'prompt_interaction_base.html#responsecache.lookup',
+                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.ResponseCache.stats': ( 'prompt_interaction_base.html#responsecache.stats',
+                                                                                                                            'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.SingleCallConversationalChain': ( 'prompt_interaction_base.html#singlecallconversationalchain',
+                                                                                                                                      'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.SingleCallConversationalChain._acall': ( 'prompt_interaction_base.html#singlecallconversationalchain._acall',
+                                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.SingleCallConversationalChain._call': ( 'prompt_interaction_base.html#singlecallconversationalchain._call',
+                                                                                                                                            'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.SingleCallConversationalChain._prepare_inputs': ( 'prompt_interaction_base.html#singlecallconversationalchain._prepare_inputs',
+                                                                                                                                                      'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.SingleCallConversationalChain._prepare_output': ( 'prompt_interaction_base.html#singlecallconversationalchain._prepare_output',
+                                                                                                                                                      'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.SingleCallConversationalChain.from_llm': ( 'prompt_interaction_base.html#singlecallconversationalchain.from_llm',
+                                                                                                                                               'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._SharedObjects': ( 'prompt_interaction_base.html#_sharedobjects',
+                                                                                                                       'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._SharedObjects.__init__': ( 'prompt_interaction_base.html#_sharedobjects.__init__',
+                                                                                                                                'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._SharedObjects.clear': ( 'prompt_interaction_base.html#_sharedobjects.clear',
+                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._SharedObjects.get_or_create': ( 'prompt_interaction_base.html#_sharedobjects.get_or_create',
+                                                                                                                                     'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._SharedObjects.stats': ( 'prompt_interaction_base.html#_sharedobjects.stats',
+                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._StreamCancelled': ( 'prompt_interaction_base.html#_streamcancelled',
+                                                                                                                         'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._StreamingHandler': ( 'prompt_interaction_base.html#_streaminghandler',
+                                                                                                                          'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._StreamingHandler.__init__': ( 'prompt_interaction_base.html#_streaminghandler.__init__',
+                                                                                                                                   'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._StreamingHandler.on_llm_new_token': ( 'prompt_interaction_base.html#_streaminghandler.on_llm_new_token',
+                                                                                                                                           'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._StreamingHandler.on_retriever_end': ( 'prompt_interaction_base.html#_streaminghandler.on_retriever_end',
+                                                                                                                                           'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._astream_chat_model': ( 'prompt_interaction_base.html#_astream_chat_model',
+                                                                                                                            'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._build_tutor_mdl_chain': ( 'prompt_interaction_base.html#_build_tutor_mdl_chain',
+                                                                                                                               'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._build_tutoring_prompt': ( 'prompt_interaction_base.html#_build_tutoring_prompt',
+                                                                                                                               'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._chain_key': ( 'prompt_interaction_base.html#_chain_key',
+                                                                                                                   'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._get_direct_call': ( 'prompt_interaction_base.html#_get_direct_call',
+                                                                                                                         'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._get_tutoring_call': ( 'prompt_interaction_base.html#_get_tutoring_call',
+                                                                                                                           'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._history_messages': ( 'prompt_interaction_base.html#_history_messages',
+                                                                                                                          'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._messages_key': ( 'prompt_interaction_base.html#_messages_key',
+                                                                                                                      'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._model_key': ( 'prompt_interaction_base.html#_model_key',
+                                                                                                                   'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._prompt_key': ( 'prompt_interaction_base.html#_prompt_key',
+                                                                                                                    'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._stream_chat_model': ( 'prompt_interaction_base.html#_stream_chat_model',
+                                                                                                                           'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase._with_retriever': ( 'prompt_interaction_base.html#_with_retriever',
+                                                                                                                        'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.aget_direct_answer': ( 'prompt_interaction_base.html#aget_direct_answer',
+                                                                                                                           'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.aget_tutoring_answer': ( 'prompt_interaction_base.html#aget_tutoring_answer',
+                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.astream_direct_answer': ( 'prompt_interaction_base.html#astream_direct_answer',
+                                                                                                                              'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.astream_tutoring_answer': ( 'prompt_interaction_base.html#astream_tutoring_answer',
+                                                                                                                                'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.build_retrieval_query': ( 'prompt_interaction_base.html#build_retrieval_query',
+                                                                                                                              'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.create_base_tutoring_prompt': ( 'prompt_interaction_base.html#create_base_tutoring_prompt',
                                                                                                                                     'ai_classroom_suite/PromptInteractionBase.py'),
                                                           'ai_classroom_suite.PromptInteractionBase.create_model': ( 'prompt_interaction_base.html#create_model',
                                                                                                                      'ai_classroom_suite/PromptInteractionBase.py'),
@@ -81,14 +467,36 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                                'ai_classroom_suite/PromptInteractionBase.py'),
                                                           'ai_classroom_suite.PromptInteractionBase.get_direct_answer': ( 'prompt_interaction_base.html#get_direct_answer',
                                                                                                                           'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.get_response_cache': ( 'prompt_interaction_base.html#get_response_cache',
+                                                                                                                           'ai_classroom_suite/PromptInteractionBase.py'),
                                                           'ai_classroom_suite.PromptInteractionBase.get_tutoring_answer': ( 'prompt_interaction_base.html#get_tutoring_answer',
                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
                                                           'ai_classroom_suite.PromptInteractionBase.get_tutoring_prompt': ( 'prompt_interaction_base.html#get_tutoring_prompt',
                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
                                                           'ai_classroom_suite.PromptInteractionBase.set_openai_key': ( 'prompt_interaction_base.html#set_openai_key',
                                                                                                                        'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.stream_direct_answer': ( 'prompt_interaction_base.html#stream_direct_answer',
+                                                                                                                             'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.stream_tutoring_answer': ( 'prompt_interaction_base.html#stream_tutoring_answer',
+                                                                                                                               'ai_classroom_suite/PromptInteractionBase.py'),
                                                           'ai_classroom_suite.PromptInteractionBase.update_conversation_history': ( 'prompt_interaction_base.html#update_conversation_history',
-                                                                                                                                    'ai_classroom_suite/PromptInteractionBase.py')},
+                                                                                                                                    'ai_classroom_suite/PromptInteractionBase.py'),
+                                                          'ai_classroom_suite.PromptInteractionBase.with_response_cache': ( 'prompt_interaction_base.html#with_response_cache',
+                                                                                                                            'ai_classroom_suite/PromptInteractionBase.py')},
+            'ai_classroom_suite.ResultStorage': { 'ai_classroom_suite.ResultStorage._partitioning': ( 'result_storage.html#_partitioning',
+                                                                                                      'ai_classroom_suite/ResultStorage.py'),
+                                                  'ai_classroom_suite.ResultStorage.compact_dtypes': ( 'result_storage.html#compact_dtypes',
+                                                                                                       'ai_classroom_suite/ResultStorage.py'),
+                                                  'ai_classroom_suite.ResultStorage.conversation_to_df': ( 'result_storage.html#conversation_to_df',
+                                                                                                           'ai_classroom_suite/ResultStorage.py'),
+                                                  'ai_classroom_suite.ResultStorage.load_parquet_dataset_as_df': ( 'result_storage.html#load_parquet_dataset_as_df',
+                                                                                                                   'ai_classroom_suite/ResultStorage.py'),
+                                                  'ai_classroom_suite.ResultStorage.save_as_parquet': ( 'result_storage.html#save_as_parquet',
+                                                                                                        'ai_classroom_suite/ResultStorage.py'),
+                                                  'ai_classroom_suite.ResultStorage.save_to_parquet_dataset': ( 'result_storage.html#save_to_parquet_dataset',
+                                                                                                                'ai_classroom_suite/ResultStorage.py'),
+                                                  'ai_classroom_suite.ResultStorage.student_from_filename': ( 'result_storage.html#student_from_filename',
+                                                                                                              'ai_classroom_suite/ResultStorage.py')},
             'ai_classroom_suite.SelfStudyPrompts': { 'ai_classroom_suite.SelfStudyPrompts.list_all_self_study_prompt_keys': ( 'self_study_prompts.html#list_all_self_study_prompt_keys',
                                                                                                                               'ai_classroom_suite/SelfStudyPrompts.py'),
                                                      'ai_classroom_suite.SelfStudyPrompts.list_all_self_study_prompts': ( 'self_study_prompts.html#list_all_self_study_prompts',
@@ -101,14 +509,44 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                       'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.__init__': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.__init__',
                                                                                                                                'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._add_reply_event': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._add_reply_event',
+                                                                                                                                       'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._astream_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._astream_reply',
+                                                                                                                                     'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._direct_request': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._direct_request',
+                                                                                                                                      'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._end_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._end_reply',
+                                                                                                                                 'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._start_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._start_reply',
+                                                                                                                                   'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._stream_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._stream_reply',
+                                                                                                                                    'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._tutoring_request': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._tutoring_request',
+                                                                                                                                        'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._update_chat_history': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._update_chat_history',
                                                                                                                                            'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor._update_direct_history': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor._update_direct_history',
+                                                                                                                                             'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.add_user_message': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.add_user_message',
                                                                                                                                        'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.aget_direct_tutor_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.aget_direct_tutor_reply',
+                                                                                                                                              'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.aget_tutor_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.aget_tutor_reply',
+                                                                                                                                       'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.astream_direct_tutor_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.astream_direct_tutor_reply',
+                                                                                                                                                 'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.astream_tutor_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.astream_tutor_reply',
+                                                                                                                                          'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.embed_key': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.embed_key',
                                                                                                                                 'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.finish_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.finish_reply',
+                                                                                                                                   'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.flattened_conversation': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.flattened_conversation',
+                                                                                                                                             'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.forget_conversation': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.forget_conversation',
                                                                                                                                           'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.get_chat_memory': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.get_chat_memory',
+                                                                                                                                      'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.get_direct_tutor_reply': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.get_direct_tutor_reply',
                                                                                                                                              'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.get_sources_memory': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.get_sources_memory',
@@ -121,10 +559,20 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                                      'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.SlightlyDelusionalTutor.set_system_message': ( 'base_gradio_selfstudy.html#slightlydelusionaltutor.set_system_message',
                                                                                                                                          'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents._acquire_shared_index': ( 'base_gradio_selfstudy.html#_acquire_shared_index',
+                                                                                                                    'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents._create_text_store': ( 'base_gradio_selfstudy.html#_create_text_store',
+                                                                                                                 'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents._initialize_reference_tutor': ( 'base_gradio_selfstudy.html#_initialize_reference_tutor',
+                                                                                                                          'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents._release_shared_index': ( 'base_gradio_selfstudy.html#_release_shared_index',
+                                                                                                                    'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.add_user_message': ( 'base_gradio_selfstudy.html#add_user_message',
                                                                                                                'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.create_reference_store': ( 'base_gradio_selfstudy.html#create_reference_store',
                                                                                                                      'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.create_reference_store_from_snapshot': ( 'base_gradio_selfstudy.html#create_reference_store_from_snapshot',
+                                                                                                                                   'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.disable_until_done': ( 'base_gradio_selfstudy.html#disable_until_done',
                                                                                                                  'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.embed_key': ( 'base_gradio_selfstudy.html#embed_key',
@@ -136,4 +584,188 @@ d = { 'settings': { 'branch': 'main',
                                                      'ai_classroom_suite.UIBaseComponents.prompt_select': ( 'base_gradio_selfstudy.html#prompt_select',
                                                                                                             'ai_classroom_suite/UIBaseComponents.py'),
                                                      'ai_classroom_suite.UIBaseComponents.save_chatbot_dialogue': ( 'base_gradio_selfstudy.html#save_chatbot_dialogue',
-                                                                                                                    'ai_classroom_suite/UIBaseComponents.py')}}}
+                                                                                                                    'ai_classroom_suite/UIBaseComponents.py'),
+                                                     'ai_classroom_suite.UIBaseComponents.stop_tutor_reply': ( 'base_gradio_selfstudy.html#stop_tutor_reply',
+                                                                                                               'ai_classroom_suite/UIBaseComponents.py')},
+            'ai_classroom_suite.VectorIndexes': { 'ai_classroom_suite.VectorIndexes.BM25Index': ( 'vector_indexes.html#bm25index',
+                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.__init__': ( 'vector_indexes.html#bm25index.__init__',
+                                                                                                           'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index._check_writable': ( 'vector_indexes.html#bm25index._check_writable',
+                                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index._compile': ( 'vector_indexes.html#bm25index._compile',
+                                                                                                           'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.add_documents': ( 'vector_indexes.html#bm25index.add_documents',
+                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.add_texts': ( 'vector_indexes.html#bm25index.add_texts',
+                                                                                                            'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.delete': ( 'vector_indexes.html#bm25index.delete',
+                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.from_documents': ( 'vector_indexes.html#bm25index.from_documents',
+                                                                                                                 'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.from_texts': ( 'vector_indexes.html#bm25index.from_texts',
+                                                                                                             'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.n_docs': ( 'vector_indexes.html#bm25index.n_docs',
+                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.nbytes': ( 'vector_indexes.html#bm25index.nbytes',
+                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.scores': ( 'vector_indexes.html#bm25index.scores',
+                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.BM25Index.search': ( 'vector_indexes.html#bm25index.search',
+                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.CachedRetriever': ( 'vector_indexes.html#cachedretriever',
+                                                                                                        'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.CachedRetriever.Config': ( 'vector_indexes.html#cachedretriever.config',
+                                                                                                               'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.CachedRetriever._aget_relevant_documents': ( 'vector_indexes.html#cachedretriever._aget_relevant_documents',
+                                                                                                                                 'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.CachedRetriever._get_relevant_documents': ( 'vector_indexes.html#cachedretriever._get_relevant_documents',
+                                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore': ( 'vector_indexes.html#hnswvectorstore',
+                                                                                                        'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore.__init__': ( 'vector_indexes.html#hnswvectorstore.__init__',
+                                                                                                                 'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore._index_rows': ( 'vector_indexes.html#hnswvectorstore._index_rows',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore._init_index': ( 'vector_indexes.html#hnswvectorstore._init_index',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore._top_k': ( 'vector_indexes.html#hnswvectorstore._top_k',
+                                                                                                               'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore.add_vectors': ( 'vector_indexes.html#hnswvectorstore.add_vectors',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore.delete': ( 'vector_indexes.html#hnswvectorstore.delete',
+                                                                                                               'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore.from_vectors': ( 'vector_indexes.html#hnswvectorstore.from_vectors',
+                                                                                                                     'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore.nbytes': ( 'vector_indexes.html#hnswvectorstore.nbytes',
+                                                                                                               'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore.save_index': ( 'vector_indexes.html#hnswvectorstore.save_index',
+                                                                                                                   'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HNSWVectorStore.shared_view': ( 'vector_indexes.html#hnswvectorstore.shared_view',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HybridRetriever': ( 'vector_indexes.html#hybridretriever',
+                                                                                                        'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HybridRetriever.Config': ( 'vector_indexes.html#hybridretriever.config',
+                                                                                                               'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HybridRetriever._fuse': ( 'vector_indexes.html#hybridretriever._fuse',
+                                                                                                              'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.HybridRetriever._get_relevant_documents': ( 'vector_indexes.html#hybridretriever._get_relevant_documents',
+                                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore': ( 'vector_indexes.html#numpyvectorstore',
+                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.__init__': ( 'vector_indexes.html#numpyvectorstore.__init__',
+                                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore._check_writable': ( 'vector_indexes.html#numpyvectorstore._check_writable',
+                                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore._make_document': ( 'vector_indexes.html#numpyvectorstore._make_document',
+                                                                                                                        'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore._reserve': ( 'vector_indexes.html#numpyvectorstore._reserve',
+                                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore._select_relevance_score_fn': ( 'vector_indexes.html#numpyvectorstore._select_relevance_score_fn',
+                                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore._top_k': ( 'vector_indexes.html#numpyvectorstore._top_k',
+                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.add_texts': ( 'vector_indexes.html#numpyvectorstore.add_texts',
+                                                                                                                   'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.add_vectors': ( 'vector_indexes.html#numpyvectorstore.add_vectors',
+                                                                                                                     'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.delete': ( 'vector_indexes.html#numpyvectorstore.delete',
+                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.embeddings': ( 'vector_indexes.html#numpyvectorstore.embeddings',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.from_texts': ( 'vector_indexes.html#numpyvectorstore.from_texts',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.from_vectors': ( 'vector_indexes.html#numpyvectorstore.from_vectors',
+                                                                                                                      'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.max_marginal_relevance_search': ( 'vector_indexes.html#numpyvectorstore.max_marginal_relevance_search',
+                                                                                                                                       'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.max_marginal_relevance_search_by_vector': ( 'vector_indexes.html#numpyvectorstore.max_marginal_relevance_search_by_vector',
+                                                                                                                                                 'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.nbytes': ( 'vector_indexes.html#numpyvectorstore.nbytes',
+                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.shared_view': ( 'vector_indexes.html#numpyvectorstore.shared_view',
+                                                                                                                     'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.similarity_search': ( 'vector_indexes.html#numpyvectorstore.similarity_search',
+                                                                                                                           'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.similarity_search_batch': ( 'vector_indexes.html#numpyvectorstore.similarity_search_batch',
+                                                                                                                                 'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.similarity_search_by_vector': ( 'vector_indexes.html#numpyvectorstore.similarity_search_by_vector',
+                                                                                                                                     'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.similarity_search_with_score': ( 'vector_indexes.html#numpyvectorstore.similarity_search_with_score',
+                                                                                                                                      'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.similarity_search_with_score_by_vector': ( 'vector_indexes.html#numpyvectorstore.similarity_search_with_score_by_vector',
+                                                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.similarity_search_with_score_by_vector_batch': ( 'vector_indexes.html#numpyvectorstore.similarity_search_with_score_by_vector_batch',
+                                                                                                                                                      'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.NumpyVectorStore.vectors': ( 'vector_indexes.html#numpyvectorstore.vectors',
+                                                                                                                 'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache': ( 'vector_indexes.html#retrievalcache',
+                                                                                                       'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache.__init__': ( 'vector_indexes.html#retrievalcache.__init__',
+                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache._find_similar': ( 'vector_indexes.html#retrievalcache._find_similar',
+                                                                                                                     'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache._is_expired': ( 'vector_indexes.html#retrievalcache._is_expired',
+                                                                                                                   'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache._use_entry': ( 'vector_indexes.html#retrievalcache._use_entry',
+                                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache.add': ( 'vector_indexes.html#retrievalcache.add',
+                                                                                                           'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache.clear': ( 'vector_indexes.html#retrievalcache.clear',
+                                                                                                             'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache.hit_rate': ( 'vector_indexes.html#retrievalcache.hit_rate',
+                                                                                                                'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache.lookup': ( 'vector_indexes.html#retrievalcache.lookup',
+                                                                                                              'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.RetrievalCache.stats': ( 'vector_indexes.html#retrievalcache.stats',
+                                                                                                             'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry': ( 'vector_indexes.html#vectorstoreregistry',
+                                                                                                            'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry.__init__': ( 'vector_indexes.html#vectorstoreregistry.__init__',
+                                                                                                                     'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry._add_reference': ( 'vector_indexes.html#vectorstoreregistry._add_reference',
+                                                                                                                           'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry._evict': ( 'vector_indexes.html#vectorstoreregistry._evict',
+                                                                                                                   'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry._n_references': ( 'vector_indexes.html#vectorstoreregistry._n_references',
+                                                                                                                          'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry.acquire': ( 'vector_indexes.html#vectorstoreregistry.acquire',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry.memory_mb': ( 'vector_indexes.html#vectorstoreregistry.memory_mb',
+                                                                                                                      'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry.release': ( 'vector_indexes.html#vectorstoreregistry.release',
+                                                                                                                    'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.VectorStoreRegistry.stats': ( 'vector_indexes.html#vectorstoreregistry.stats',
+                                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._embedding_fingerprint': ( 'vector_indexes.html#_embedding_fingerprint',
+                                                                                                               'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._import_hnswlib': ( 'vector_indexes.html#_import_hnswlib',
+                                                                                                        'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._index_fingerprint': ( 'vector_indexes.html#_index_fingerprint',
+                                                                                                           'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._normalize_query': ( 'vector_indexes.html#_normalize_query',
+                                                                                                         'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._normalize_rows': ( 'vector_indexes.html#_normalize_rows',
+                                                                                                        'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._segments_hash': ( 'vector_indexes.html#_segments_hash',
+                                                                                                       'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._snapshot_data_offset': ( 'vector_indexes.html#_snapshot_data_offset',
+                                                                                                              'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._snapshot_index_path': ( 'vector_indexes.html#_snapshot_index_path',
+                                                                                                             'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes._tokenize': ( 'vector_indexes.html#_tokenize',
+                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.get_retrieval_cache': ( 'vector_indexes.html#get_retrieval_cache',
+                                                                                                            'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.get_vector_store_registry': ( 'vector_indexes.html#get_vector_store_registry',
+                                                                                                                  'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.is_snapshot_current': ( 'vector_indexes.html#is_snapshot_current',
+                                                                                                            'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.load_vector_snapshot': ( 'vector_indexes.html#load_vector_snapshot',
+                                                                                                             'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.read_snapshot_header': ( 'vector_indexes.html#read_snapshot_header',
+                                                                                                             'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.retriever_fingerprint': ( 'vector_indexes.html#retriever_fingerprint',
+                                                                                                              'ai_classroom_suite/VectorIndexes.py'),
+                                                  'ai_classroom_suite.VectorIndexes.save_vector_snapshot': ( 'vector_indexes.html#save_vector_snapshot',
+                                                                                                             'ai_classroom_suite/VectorIndexes.py')}}}